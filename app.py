@@ -6,12 +6,17 @@ from backend.routes.polynomial_routes import polynomial_bp
 from backend.routes.nonlinear_systems_routes import nonlinear_systems_bp
 from backend.routes.interpolation_routes import interpolation_bp
 from backend.routes.horner_routes import horner_bp
+from backend.routes.trace_routes import trace_bp
+from backend.utils.serialization import init_serialization
 
 # Khởi tạo ứng dụng Flask
 app = Flask(__name__,
             template_folder='frontend/templates',
             static_folder='frontend/static')
 
+# Bộ mã hóa JSON hiểu mảng NumPy, chọn dạng mảng (danh sách / base64) theo header Accept
+init_serialization(app)
+
 # Đăng ký các Blueprints (các nhóm route)
 app.register_blueprint(linear_algebra_bp)
 app.register_blueprint(root_finding_bp)
@@ -19,6 +24,7 @@ app.register_blueprint(polynomial_bp)
 app.register_blueprint(nonlinear_systems_bp)
 app.register_blueprint(interpolation_bp)
 app.register_blueprint(horner_bp)
+app.register_blueprint(trace_bp)
 @app.route('/')
 def index():
     """
@@ -1,5 +1,6 @@
 # backend/api_formatters/linear_algebra.py
 import numpy as np
+from backend.utils.serialization import encode_array
 
 def format_gauss_elimination_result(result):
     num_vars = result.get('num_vars', -1)
@@ -11,16 +12,16 @@ def format_gauss_elimination_result(result):
             message = f"<b>Bước {step_counter}:</b> Hoán vị hàng {step_data['to_row'] + 1} và {step_data['from_row'] + 1}."
         elif step_data['type'] == 'elimination':
             message = f"<b>Bước {step_counter}:</b> Dùng hàng {step_data['pivot_row']+1} để khử các phần tử trong cột {step_data['pivot_col']+1}."
-        steps_formatted.append({"message": message, "matrix": step_data['matrix'].tolist(), "num_vars": num_vars})
+        steps_formatted.append({"message": message, "matrix": encode_array(step_data['matrix']), "num_vars": num_vars})
         step_counter += 1
 
     if result['status'] == 'no_solution':
         return {"method": "Khử Gauss", "status": "no_solution", "message": "Hệ phương trình vô nghiệm.", "steps": steps_formatted}
     elif result['status'] == 'infinite_solutions':
-        return {"method": "Khử Gauss", "status": "infinite_solutions", "message": f"Hệ có vô số nghiệm (Hạng = {result['rank']} < Số ẩn = {result['num_vars']}).", "steps": steps_formatted, "general_solution": {"particular_solution": result['particular_solution'].tolist(), "null_space_vectors": result['null_space_vectors'].tolist()}}
+        return {"method": "Khử Gauss", "status": "infinite_solutions", "message": f"Hệ có vô số nghiệm (Hạng = {result['rank']} < Số ẩn = {result['num_vars']}).", "steps": steps_formatted, "general_solution": {"particular_solution": encode_array(result['particular_solution']), "null_space_vectors": encode_array(result['null_space_vectors'])}}
     elif result['status'] == 'unique_solution':
-        backward_steps_formatted = [{"message": f"Tính toán cho biến x<sub>{bs_step['row']+1}</sub>.", "solution_so_far": bs_step['solution_so_far'].tolist()} for bs_step in result.get('backward_steps', [])]
-        return {"method": "Khử Gauss", "status": "unique_solution", "message": "Hệ phương trình có nghiệm duy nhất.", "solution": result['solution'].tolist(), "steps": steps_formatted, "backward_steps": backward_steps_formatted}
+        backward_steps_formatted = [{"message": f"Tính toán cho biến x<sub>{bs_step['row']+1}</sub>.", "solution_so_far": encode_array(bs_step['solution_so_far'])} for bs_step in result.get('backward_steps', [])]
+        return {"method": "Khử Gauss", "status": "unique_solution", "message": "Hệ phương trình có nghiệm duy nhất.", "solution": encode_array(result['solution']), "steps": steps_formatted, "backward_steps": backward_steps_formatted}
     return {"error": "Lỗi không xác định."}
 
 def format_gauss_jordan_result(result):
@@ -35,82 +36,136 @@ def format_gauss_jordan_result(result):
         elif step_data['type'] == 'elimination':
             pc = step_data['pivot_col'] + 1
             message = f"<b>Bước {step_counter}:</b> Chuẩn hóa hàng pivot và khử các phần tử trong cột {pc}."
-        steps_formatted.append({"message": message, "matrix": step_data['matrix'].tolist(), "num_vars": num_vars})
+        steps_formatted.append({"message": message, "matrix": encode_array(step_data['matrix']), "num_vars": num_vars})
         step_counter += 1
 
     if result['status'] == 'no_solution':
         return {"method": "Gauss-Jordan", "status": "no_solution", "message": "Hệ phương trình vô nghiệm.", "steps": steps_formatted}
     elif result['status'] == 'infinite_solutions':
-        return {"method": "Gauss-Jordan", "status": "infinite_solutions", "message": f"Hệ có vô số nghiệm (Hạng = {result['rank']} < Số ẩn = {result['num_vars']}).", "steps": steps_formatted, "general_solution": {"particular_solution": result['particular_solution'].tolist(), "null_space_vectors": result['null_space_vectors'].tolist()}}
+        return {"method": "Gauss-Jordan", "status": "infinite_solutions", "message": f"Hệ có vô số nghiệm (Hạng = {result['rank']} < Số ẩn = {result['num_vars']}).", "steps": steps_formatted, "general_solution": {"particular_solution": encode_array(result['particular_solution']), "null_space_vectors": encode_array(result['null_space_vectors'])}}
     elif result['status'] == 'unique_solution':
-        return {"method": "Gauss-Jordan", "status": "unique_solution", "message": "Hệ phương trình có nghiệm duy nhất.", "solution": result['solution'].tolist(), "steps": steps_formatted}
+        return {"method": "Gauss-Jordan", "status": "unique_solution", "message": "Hệ phương trình có nghiệm duy nhất.", "solution": encode_array(result['solution']), "steps": steps_formatted}
     return {"error": "Lỗi không xác định."}
 
 
-def format_lu_result(result):
+# Với ma trận tối đa cỡ này, L và U đầy đủ được dựng lại cho mọi bước (như trước đây);
+# với ma trận lớn hơn chỉ trả về vết gọn, trừ các bước được yêu cầu qua expand_steps.
+LU_STEP_EXPAND_MAX_N = 20
+
+def _format_lu_steps(steps, n, expand_steps=None):
+    expand_all = n <= LU_STEP_EXPAND_MAX_N and expand_steps is None
+    wanted = set(expand_steps or ())
+    # L, U được dựng dần từ vết gọn (chỉ khi định dạng kết quả), mỗi bước chỉ ghi một hàng/cột mới
+    L = np.zeros((n, n))
+    U = np.zeros((n, n))
+    steps_formatted = []
+    for k, step in enumerate(steps):
+        i = step['row']
+        formatted_step = {"message": f"<b>Bước {k+1}:</b> Tính hàng {i+1} của U và cột {i+1} của L.", "row": i}
+        if step.get('u_row') is None:
+            formatted_step.update({"L": None, "U": None})
+            steps_formatted.append(formatted_step)
+            continue
+        U[i, i:] = step['u_row']
+        L[i, i] = 1
+        L[i + 1:, i] = step['l_col']
+        if not expand_all:
+            formatted_step.update({"u_row": encode_array(step['u_row']), "l_col": encode_array(step['l_col'])})
+        if expand_all or k + 1 in wanted:
+            formatted_step.update({"L": encode_array(L.copy()), "U": encode_array(U.copy())})
+        steps_formatted.append(formatted_step)
+    return steps_formatted
+
+def format_lu_result(result, expand_steps=None):
+    """
+    expand_steps: danh sách số thứ tự bước (từ 1) cần dựng lại L, U đầy đủ khi ma trận lớn.
+    """
     formatted = {"method": "Phân rã LU"}
     
     # Định dạng các bước trung gian
-    steps_formatted = []
-    for i, step in enumerate(result.get('lu_steps', [])):
-        steps_formatted.append({
-            "message": f"<b>Bước {i+1}:</b> Tính hàng {i+1} của U và cột {i+1} của L.",
-            "L": step['L'].tolist(), # Dữ liệu đã được làm sạch
-            "U": step['U'].tolist()  # Dữ liệu đã được làm sạch
-        })
-    formatted['steps'] = steps_formatted
+    formatted['steps'] = _format_lu_steps(result.get('lu_steps', []), result['num_vars'], expand_steps)
 
     # Xử lý các trạng thái
     status = result['status']
     formatted['status'] = status
+    formatted['factorization_id'] = result.get('factorization_id')
+    formatted['factorization_cached'] = result.get('factorization_cached', False)
     
     if status == "no_solution":
         formatted['message'] = f"Hệ vô nghiệm (hạng(A)={result['rank']} < hạng([A|B]))."
     elif status == "infinite_solutions":
         formatted['message'] = f"Hệ có vô số nghiệm (hạng(A)={result['rank']} < số ẩn={result['num_vars']})."
         formatted['general_solution'] = {
-            "particular_solution": result['particular_solution'].tolist(),
-            "null_space_vectors": result['null_space_vectors'].tolist()
+            "particular_solution": encode_array(result['particular_solution']),
+            "null_space_vectors": encode_array(result['null_space_vectors'])
         }
     elif status == "unique_solution":
         formatted['message'] = f"Hệ có nghiệm duy nhất (hoặc nghiệm xấp xỉ tốt nhất)."
-        formatted['solution'] = result['solution'].tolist()
+        formatted['solution'] = encode_array(result['solution'])
         if 'intermediate_y' in result and result['intermediate_y'] is not None:
-            formatted['intermediate_y'] = result['intermediate_y'].tolist()
+            formatted['intermediate_y'] = encode_array(result['intermediate_y'])
 
     # Thêm ma trận P, L, U nếu có
-    if 'decomposition' in result:
+    if result.get('decomposition') is not None:
         decomp = result['decomposition']
         formatted['decomposition'] = {
-            "P": decomp['P'].tolist(),
-            "L": decomp['L'].tolist(),
-            "U": decomp['U'].tolist()
+            "P": encode_array(decomp['P']),
+            "L": encode_array(decomp['L']),
+            "U": encode_array(decomp['U'])
         }
     return formatted
 
+def _cholesky_method_name(result, prefix=""):
+    name = "LDLᵀ" if result.get('variant') == 'ldlt' else "Cholesky"
+    if result.get('packed'):
+        name += ", lưu trữ dạng gói"
+    return f"{prefix}({name})" if prefix else name
+
 def format_cholesky_result(result):
+    is_ldlt = result.get('variant') == 'ldlt'
     formatted = {
-        "method": "Cholesky",
+        "method": _cholesky_method_name(result),
         "status": result['status'],
-        "message": "Hệ có nghiệm duy nhất tìm bằng phân tách Cholesky.",
+        "message": f"Hệ có nghiệm duy nhất tìm bằng phân tách {'LDLᵀ' if is_ldlt else 'Cholesky'}.",
         "transformation_message": result['transformation_message'],
-        "solution": result['solution'].tolist(),
-        "intermediate_y": result['intermediate_y'].tolist()
+        "solution": encode_array(result['solution']),
+        "intermediate_y": encode_array(result.get('intermediate_y')),
+        "factorization_id": result.get('factorization_id'),
+        "factorization_cached": result.get('factorization_cached', False)
     }
-
-    decomp = result['decomposition']
+    if is_ldlt:
+        formatted['inertia'] = result['inertia']
+        formatted['intermediate_z'] = encode_array(result.get('intermediate_z'))
+
+    decomp = result.get('decomposition')
+    if decomp is None:
+        return formatted
+    if result.get('packed'):
+        formatted['decomposition'] = {"U_packed": encode_array(decomp['U_packed'])}
+        return formatted
+    if is_ldlt:
+        formatted['decomposition'] = {
+            "L": encode_array(decomp['L']),
+            "D": encode_array(decomp['D']),
+            "perm": [int(i) for i in decomp['perm']]
+        }
+        return formatted
     formatted_decomp = {
-        "U": decomp['U'].tolist(),
-        "Ut": decomp['Ut'].tolist()
+        "U": encode_array(decomp['U']),
+        "Ut": encode_array(decomp['Ut'])
     }
     if decomp.get('M') is not None:
-        formatted_decomp['M'] = decomp['M'].tolist()
+        formatted_decomp['M'] = encode_array(decomp['M'])
     if decomp.get('d') is not None:
-        formatted_decomp['d'] = decomp['d'].tolist()
+        formatted_decomp['d'] = encode_array(decomp['d'])
     
     formatted['decomposition'] = formatted_decomp
     return formatted
 
+def _inverse_id(result):
+    # Chỉ đưa inverse_id vào kết quả khi ma trận nghịch đảo thực sự được lưu (dùng được cho cập nhật Woodbury)
+    return {"inverse_id": result['inverse_id']} if result.get('inverse_id') else {}
+
 def format_inverse_gauss_jordan_result(result):
     """
     Định dạng kết quả tính ma trận nghịch đảo bằng phương pháp Gauss-Jordan.
@@ -119,7 +174,8 @@ def format_inverse_gauss_jordan_result(result):
         "method": "Ma trận nghịch đảo (Gauss-Jordan)",
         "status": "success",
         "message": f"Tính ma trận nghịch đảo thành công cho ma trận {result['num_vars']}x{result['num_vars']}.",
-        "inverse": result['inverse'].tolist()
+        "inverse": encode_array(result['inverse']),
+        **_inverse_id(result)
     }
 
     # Định dạng các bước tính toán
@@ -134,7 +190,7 @@ def format_inverse_gauss_jordan_result(result):
         elif step_data['type'] == 'elimination':
             pc = step_data['pivot_col'] + 1
             message = f"<b>Bước {step_counter}:</b> Chuẩn hóa hàng pivot và khử các phần tử trong cột {pc}."
-        steps_formatted.append({"message": message, "matrix": step_data['matrix'].tolist(), "num_vars": num_vars})
+        steps_formatted.append({"message": message, "matrix": encode_array(step_data['matrix']), "num_vars": num_vars})
         step_counter += 1
 
     formatted['steps'] = steps_formatted
@@ -148,13 +204,22 @@ def format_lu_inverse_result(result):
         return {"error": result.get('error', 'Lỗi không xác định')}
 
     decomp = result['decomposition']
-    
+    if decomp is None:
+        return {
+            "method": "Ma trận nghịch đảo (Phân rã LU)",
+            "status": "success",
+            "message": f"Tính ma trận nghịch đảo bằng phân rã LU thành công.",
+            "inverse": encode_array(result['inverse']),
+            **_inverse_id(result),
+            "steps": []
+        }
+
     # Bước 1: Phân rã
     steps = [{
         "message": "<b>Bước 1:</b> Phân rã A = PLU",
-        "P": decomp['P'].tolist(),
-        "L": decomp['L'].tolist(),
-        "U": decomp['U'].tolist(),
+        "P": encode_array(decomp['P']),
+        "L": encode_array(decomp['L']),
+        "U": encode_array(decomp['U']),
     }]
     
     # Các bước giải hệ phương trình
@@ -167,8 +232,8 @@ def format_lu_inverse_result(result):
         steps.append({
             "message": f"<b>Bước 2.{i}:</b> Tìm cột {i} của A⁻¹",
             "solve_process": f"Giải LY=Pᵀeᵢ, sau đó UX=Y",
-            "Y_col": np.array(step_solve['y_col']).reshape(-1, 1).tolist(),
-            "X_col": np.array(step_solve['x_col']).reshape(-1, 1).tolist(),
+            "Y_col": encode_array(np.reshape(step_solve['y_col'], (-1, 1))) if step_solve['y_col'] is not None else None,
+            "X_col": encode_array(np.reshape(step_solve['x_col'], (-1, 1))) if step_solve['x_col'] is not None else None,
         })
 
     # Bước cuối: Ma trận nghịch đảo hoàn chỉnh
@@ -180,7 +245,49 @@ def format_lu_inverse_result(result):
         "method": "Ma trận nghịch đảo (Phân rã LU)",
         "status": "success",
         "message": f"Tính ma trận nghịch đảo bằng phân rã LU thành công.",
-        "inverse": result['inverse'].tolist(),
+        "inverse": encode_array(result['inverse']),
+        **_inverse_id(result),
+        "steps": steps
+    }
+
+def format_woodbury_result(result):
+    """
+    Định dạng kết quả cập nhật hạng thấp (A + UVᵀ)⁻¹ theo công thức Sherman–Morrison–Woodbury.
+    """
+    if result['update_method'] == 'woodbury':
+        message = f"Cập nhật ma trận nghịch đảo với thay đổi hạng {result['rank']} bằng công thức Woodbury."
+    else:
+        message = f"Công thức Woodbury không ổn định ({result['fallback_reason']}) Đã tính lại (A + UVᵀ)⁻¹ bằng phân rã LU."
+
+    steps = []
+    if result['capacitance'] is not None:
+        steps.append({
+            "message": "<b>Bước 1:</b> Lập ma trận C = I + VᵀA⁻¹U",
+            "matrix": encode_array(result['capacitance'])
+        })
+        steps.append({
+            "message": "<b>Bước 2:</b> (A + UVᵀ)⁻¹ = A⁻¹ - A⁻¹U·C⁻¹·VᵀA⁻¹" if result['update_method'] == 'woodbury'
+                       else "<b>Bước 2:</b> Tính lại (A + UVᵀ)⁻¹ bằng phân rã LU"
+        })
+    if result['check_matrix'] is not None:
+        steps.append({
+            "message": "<b>Kiểm tra:</b> (A + UVᵀ)·(A + UVᵀ)⁻¹ ≈ I",
+            "matrix": encode_array(result['check_matrix'])
+        })
+
+    return {
+        "method": "Ma trận nghịch đảo (Cập nhật hạng thấp Woodbury)",
+        "status": "success",
+        "message": message,
+        "inverse": encode_array(result['inverse']),
+        **_inverse_id(result),
+        "previous_inverse_id": result['previous_inverse_id'],
+        "update_info": {
+            "rank": result['rank'],
+            "update_method": result['update_method'],
+            "capacitance_condition": result['capacitance_condition'],
+            "probe_residual": result['probe_residual']
+        },
         "steps": steps
     }
 
@@ -188,32 +295,66 @@ def format_cholesky_inverse_result(result):
     """
     Định dạng kết quả tính ma trận nghịch đảo bằng Cholesky.
     """
+    method = _cholesky_method_name(result, "Ma trận nghịch đảo ")
     inter = result['intermediates']
+    if inter is None:
+        formatted = {
+            "method": method,
+            "status": "success",
+            "message": result['final_message'],
+            "inverse": encode_array(result['inverse']),
+            "steps": []
+        }
+        if result.get('inertia') is not None:
+            formatted['inertia'] = result['inertia']
+        return formatted
+    if result.get('variant') == 'ldlt':
+        steps = [
+            {"message": f"<b>Bước 1:</b> {result['transformation_message']}"},
+            {
+                "message": "<b>Bước 2:</b> Phân rã A = LDLᵀ (D gồm các khối 1×1 và 2×2).",
+                "L": encode_array(inter['L']),
+                "D": encode_array(inter['D'])
+            },
+            {
+                "message": "<b>Bước 3:</b> Giải LDLᵀX = I theo từng cột để được A⁻¹.",
+                "matrix": encode_array(result['inverse']),
+                "num_vars": result['num_vars']
+            }
+        ]
+        return {
+            "method": method,
+            "status": "success",
+            "message": result['final_message'],
+            "inverse": encode_array(result['inverse']),
+            "inertia": result['inertia'],
+            "steps": steps
+        }
     steps = []
 
     # Bước 1: Thông báo về tính đối xứng và ma trận M
     steps.append({"message": f"<b>Bước 1:</b> {result['transformation_message']}"})
     if result['intermediates']['M'] is not None:
-        steps[-1]['M'] = inter['M'].tolist()
+        steps[-1]['M'] = encode_array(inter['M'])
 
     # Bước 2: Phân rã Cholesky
     steps.append({
         "message": "<b>Bước 2:</b> Phân rã Cholesky M = UᵀU.",
-        "Ut": inter['Ut'].tolist(),
-        "U": inter['U'].tolist()
+        "Ut": encode_array(inter['Ut']),
+        "U": encode_array(inter['U'])
     })
 
     # Bước 3: Tính U⁻¹
     steps.append({
         "message": "<b>Bước 3:</b> Tính U⁻¹ bằng cách giải hệ UX = I.",
-        "matrix": inter['U_inv'].tolist(),
+        "matrix": encode_array(inter['U_inv']),
         "num_vars": result['num_vars']
     })
 
     # Bước 4: Tính M⁻¹
     steps.append({
         "message": "<b>Bước 4:</b> Tính M⁻¹ = U⁻¹(U⁻¹)ᵀ.",
-        "matrix": inter['M_inv'].tolist(),
+        "matrix": encode_array(inter['M_inv']),
         "num_vars": result['num_vars']
     })
 
@@ -221,15 +362,15 @@ def format_cholesky_inverse_result(result):
     if not result['is_symmetric']:
         steps.append({
             "message": "<b>Bước 5:</b> Tính A⁺ = M⁻¹Aᵀ.",
-            "matrix": result['inverse'].tolist(),
+            "matrix": encode_array(result['inverse']),
             "num_vars": result['num_vars']
         })
 
     return {
-        "method": "Ma trận nghịch đảo (Cholesky)",
+        "method": method,
         "status": "success",
         "message": result['final_message'],
-        "inverse": result['inverse'].tolist(),
+        "inverse": encode_array(result['inverse']),
         "steps": steps
     }
 
@@ -247,23 +388,45 @@ def format_bordering_inverse_result(result):
         
         steps_formatted.append({
             "message": message,
-            "matrix": step['inv_A_k'].tolist()
+            "matrix": encode_array(step['inv_A_k'])
         })
     
     # Thêm bước kiểm tra cuối cùng
-    steps_formatted.append({
-        "message": "<b>Kiểm tra:</b> A * A⁻¹ ≈ I",
-        "matrix": result['check'].tolist()
-    })
+    if result['check'] is not None:
+        steps_formatted.append({
+            "message": "<b>Kiểm tra:</b> A * A⁻¹ ≈ I",
+            "matrix": encode_array(result['check'])
+        })
 
     return {
         "method": "Ma trận nghịch đảo (Viền quanh)",
         "status": "success",
         "message": "Tính ma trận nghịch đảo thành công bằng phương pháp viền quanh.",
-        "inverse": result['inverse'].tolist(),
+        "inverse": encode_array(result['inverse']),
         "steps": steps_formatted
     }
 
+def format_bordering_session_result(result):
+    """
+    Định dạng kết quả của phiên viền quanh tăng dần (tạo phiên, thêm hàng/cột, xem phiên).
+    """
+    if result['appended'] == 0 and result['thetas']:
+        message = f"Đã tạo phiên viền quanh cho ma trận cấp {result['n']}."
+    elif result['thetas']:
+        message = f"Đã thêm {len(result['thetas'])} hàng/cột, ma trận hiện có cấp {result['n']}."
+    else:
+        message = f"Ma trận của phiên hiện có cấp {result['n']}."
+    return {
+        "method": "Ma trận nghịch đảo (Viền quanh tăng dần)",
+        "status": "success",
+        "message": message,
+        "session_id": result['session_id'],
+        "n": result['n'],
+        "thetas": result['thetas'],
+        "expires_in": result['ttl'],
+        "inverse": encode_array(result['inverse'])
+    }
+
 def format_jacobi_result(result):
     """
     Định dạng kết quả từ phương pháp lặp Jacobi.
@@ -278,7 +441,7 @@ def format_jacobi_result(result):
     for row in result['iterations_data']:
         table.append({
             "k": row['k'],
-            "x_k": row['x_k'].tolist(),
+            "x_k": encode_array(row['x_k']),
             "error": row['error'],
             "diff_norm": row['diff_norm']
         })
@@ -287,15 +450,15 @@ def format_jacobi_result(result):
         "method": "Lặp Jacobi",
         "status": "success",
         "message": f"Hội tụ sau {result['iterations']} lần lặp.",
-        "solution": result['solution'].tolist(),
+        "solution": encode_array(result['solution']),
         "convergence_info": {
             "dominance_type": f"Ma trận chéo trội {dominance_msg}",
             "norm_used": f"Sử dụng chuẩn {norm_symbol}",
             "contraction_coefficient": result['contraction_coefficient']
         },
         "iteration_matrix": {
-            "B": result['matrix_B'].tolist(),
-            "d": result['vector_d'].tolist()
+            "B": encode_array(result['matrix_B']),
+            "d": encode_array(result['vector_d'])
         },
         "steps": [{"table": table}]
     }
@@ -308,13 +471,13 @@ def format_gauss_seidel_result(result):
     dominance_msg = "hàng" if result['is_row_dominant'] else "cột"
     norm_symbol = "∞" if result['norm_used'] == "infinity" else "1"
     
-    table = [{"k": row['k'], "x_k": row['x_k'].tolist(), "error": row['error'], "diff_norm": row['diff_norm']} for row in result['iterations_data']]
+    table = [{"k": row['k'], "x_k": encode_array(row['x_k']), "error": row['error'], "diff_norm": row['diff_norm']} for row in result['iterations_data']]
 
     return {
         "method": "Lặp Gauss-Seidel",
         "status": "success",
         "message": f"Hội tụ sau {result['iterations']} lần lặp.",
-        "solution": result['solution'].tolist(),
+        "solution": encode_array(result['solution']),
         "convergence_info": {
             "dominance_type": f"Ma trận chéo trội {dominance_msg}",
             "norm_used": f"Sử dụng chuẩn {norm_symbol}",
@@ -331,13 +494,13 @@ def format_simple_iteration_result(result):
 
     norm_symbol = "∞" if result['norm_used'] == 'inf' else "1"
     
-    table = [{"k": row['k'], "x_k": row['x_k'].tolist(), "error": row['error']} for row in result['iterations_data']]
+    table = [{"k": row['k'], "x_k": encode_array(row['x_k']), "error": row['error']} for row in result['iterations_data']]
 
     return {
         "method": "Lặp Đơn",
         "status": "success",
         "message": f"Hội tụ sau {result['iterations']} lần lặp.",
-        "solution": result['solution'].tolist(),
+        "solution": encode_array(result['solution']),
         "convergence_info": {
             "norm_used": f"Sử dụng chuẩn {norm_symbol}",
             "contraction_coefficient": result['norm_B'],
@@ -347,6 +510,47 @@ def format_simple_iteration_result(result):
         "steps": [{"table": table}]
     }
 
+KRYLOV_METHOD_NAMES = {
+    "cg": "Gradient liên hợp (CG)",
+    "gmres": "GMRES",
+    "bicgstab": "BiCGSTAB"
+}
+PRECONDITIONER_NAMES = {
+    "none": "Không dùng tiền điều kiện",
+    "jacobi": "Jacobi (đường chéo)",
+    "ilu0": "ILU(0)"
+}
+
+def format_krylov_result(result):
+    # Định dạng kết quả từ các phương pháp Krylov (CG, GMRES, BiCGSTAB), cùng dạng bảng lặp với Jacobi.
+    if result.get('status') != 'success':
+        return {"error": result.get('error', 'Lỗi không xác định')}
+
+    method_name = KRYLOV_METHOD_NAMES[result['method']]
+    if result['restart'] is not None:
+        method_name = f"{method_name}({result['restart']})"
+
+    table = [{"k": row['k'], "x_k": encode_array(row['x_k']), "error": row['error'], "diff_norm": row['diff_norm']} for row in result['iterations_data']]
+
+    return {
+        "method": method_name,
+        "status": "success",
+        "message": f"Hội tụ sau {result['iterations']} lần lặp.",
+        "solution": encode_array(result['solution']),
+        "convergence_info": {
+            "preconditioner": PRECONDITIONER_NAMES[result['preconditioner']],
+            "stopping_criterion": "Sai số dư tương đối ||b - Ax_k|| / ||b||",
+            "relative_residual": result['relative_residual'],
+            "restart": result['restart']
+        },
+        "steps": [{"table": table}]
+    }
+
+ENGINE_LABELS = {
+    "standard": "Lặp trên toàn bộ ma trận",
+    "block": "Lặp theo khối, cố định các cột đã hội tụ"
+}
+
 def format_inverse_jacobi_result(result):
     if result.get('status') != 'success':
         return {"error": result.get('error', 'Lỗi không xác định')}
@@ -359,52 +563,65 @@ def format_inverse_jacobi_result(result):
     for row in result['iterations_data']:
         table.append({
             "k": row['k'],
-            "x_k": row['x_k'].tolist(),
+            "x_k": encode_array(row['x_k']),
             "error": row['diff_norm'], 
-            "estimated_error": row['error']
+            "estimated_error": row['error'],
+            "active_columns": row.get('active_columns')
         })
 
     return {
         "method": "Lặp Jacobi - Nghịch Đảo",
         "status": "success",
         "message": f"Hội tụ sau {result['iterations']} lần lặp.",
-        "inverse": result['inverse'].tolist(),
-        "check_matrix": result['check_matrix'].tolist(),
+        "inverse": encode_array(result['inverse']),
+        "check_matrix": encode_array(result['check_matrix']),
         "convergence_info": {
             "dominance_type": f"Ma trận chéo trội {dominance_msg}",
             "norm_used": f"Sử dụng chuẩn {norm_symbol}",
             "contraction_coefficient": result['contraction_coefficient'],
-            "x0_label": f"X₀ = {x0_label}"
+            "x0_label": f"X₀ = {x0_label}",
+            "engine": ENGINE_LABELS.get(result.get('engine', 'standard'))
         },
-        "initial_matrix": result['initial_matrix'].tolist(),
+        "initial_matrix": encode_array(result['initial_matrix']),
         "steps": [{"table": table}]
     }
 
+NEWTON_MODE_NAMES = {
+    "classic": "Lặp tựa Newton - Nghịch Đảo",
+    "hyperpower": "Lặp hyperpower bậc {order} - Nghịch Đảo",
+    "scaled": "Lặp Newton-Schulz co giãn - Nghịch Đảo"
+}
+
 def format_inverse_newton_result(result):
     if result.get('status') != 'success':
         return {"error": result.get('error', 'Lỗi không xác định')}
 
+    mode = result.get('mode', 'classic')
     table = []
     for row in result['iterations_data']:
         table.append({
             "k": row['k'],
-            "x_k": row['x_k'].tolist(),
+            "x_k": encode_array(row['x_k']),
             "error": row['diff_norm'], 
-            "estimated_error": row['estimated_error']
+            "estimated_error": row['estimated_error'],
+            "residual_norm": row.get('residual_norm')
         })
 
     return {
-        "method": "Lặp tựa Newton - Nghịch Đảo",
+        "method": NEWTON_MODE_NAMES[mode].format(order=result.get('order', 2)),
         "status": "success",
         "message": f"Hội tụ sau {result['iterations']} lần lặp.",
-        "inverse": result['inverse'].tolist(),
-        "check_matrix": result['check_matrix'].tolist(),
+        "inverse": encode_array(result['inverse']),
+        "check_matrix": encode_array(result['check_matrix']),
         "convergence_info": {
-            "norm_used": "Sử dụng chuẩn 2", # Newton luôn dùng chuẩn 2
+            # Chế độ classic dùng chuẩn 2, các chế độ nhanh dùng chuẩn Frobenius (không cần SVD)
+            "norm_used": "Sử dụng chuẩn 2" if mode == 'classic' else "Sử dụng chuẩn Frobenius",
             "contraction_coefficient": result['contraction_coefficient'],
-            "x0_label": result['x0_label']
+            "x0_label": result['x0_label'],
+            "scaling_factors": result.get('scaling_factors'),
+            "flops": result.get('flops')
         },
-        "initial_matrix": result['initial_matrix'].tolist(),
+        "initial_matrix": encode_array(result['initial_matrix']),
         "steps": [{"table": table}]
     }
 
@@ -420,25 +637,27 @@ def format_inverse_gauss_seidel_result(result):
     for row in result['iterations_data']:
         table.append({
             "k": row['k'],
-            "x_k": row['x_k'].tolist(),
+            "x_k": encode_array(row['x_k']),
             "error": row['diff_norm'], 
-            "estimated_error": row['error']
+            "estimated_error": row['error'],
+            "active_columns": row.get('active_columns')
         })
 
     return {
         "method": "Lặp Gauss-Seidel - Nghịch Đảo",
         "status": "success",
         "message": f"Hội tụ sau {result['iterations']} lần lặp.",
-        "inverse": result['inverse'].tolist(),
-        "check_matrix": result['check_matrix'].tolist(),
+        "inverse": encode_array(result['inverse']),
+        "check_matrix": encode_array(result['check_matrix']),
         "convergence_info": {
             "dominance_type": f"Ma trận chéo trội {dominance_msg}",
             "norm_used": f"Sử dụng chuẩn {norm_symbol}",
             "coeff_q": result['coeff_q'],
             "coeff_s": result['coeff_s'],
-            "x0_label": f"X₀ = {x0_label}"
+            "x0_label": f"X₀ = {x0_label}",
+            "engine": ENGINE_LABELS.get(result.get('engine', 'standard'))
         },
-        "initial_matrix": result['initial_matrix'].tolist(),
+        "initial_matrix": encode_array(result['initial_matrix']),
         "steps": [{"table": table}]
     }
 
@@ -457,75 +676,100 @@ def format_svd_result(result, original_shape):
     intermediate_steps = result.get('intermediate_steps')
     if intermediate_steps and 'steps' in intermediate_steps:
         for step in intermediate_steps['steps']:
-            step['matrix_before_deflation'] = step['matrix_before_deflation'].tolist()
-            step['matrix_after_deflation'] = step['matrix_after_deflation'].tolist()
-            step['eigenvector'] = step['eigenvector'].tolist()
-            step['y_steps'] = [y.tolist() for y in step['y_steps']]
-        intermediate_steps['original_matrix'] = intermediate_steps['original_matrix'].tolist()
+            step['matrix_before_deflation'] = encode_array(step['matrix_before_deflation'])
+            step['matrix_after_deflation'] = encode_array(step['matrix_after_deflation'])
+            step['eigenvector'] = encode_array(step['eigenvector'])
+            if step['y_steps'] is not None:
+                step['y_steps'] = [encode_array(y) for y in step['y_steps']]
+        intermediate_steps['original_matrix'] = encode_array(intermediate_steps['original_matrix'])
 
     return {
         "method": result['method'],
         "status": "success",
-        "U": U.tolist(),
-        "Sigma": Sigma.tolist(),
-        "Vt": Vt.tolist(),
-        "Sigma_diag": s.tolist(),
+        "U": encode_array(U),
+        "Sigma": encode_array(Sigma),
+        "Vt": encode_array(Vt),
+        "Sigma_diag": encode_array(s),
         "intermediate_steps": intermediate_steps
     }
 
+def _format_complex(c):
+    # Số phức có phần ảo không đáng kể được trả về như số thực
+    if abs(np.imag(c)) < 1e-9:
+        return np.real(c)
+    return {'real': np.real(c), 'imag': np.imag(c)}
+
+def _format_eigenvector(v):
+    # Chuẩn hóa vector theo thành phần có trị tuyệt đối lớn nhất
+    max_abs_idx = np.argmax(np.abs(v))
+    if np.abs(v[max_abs_idx, 0]) > 1e-9:
+        v = v / v[max_abs_idx, 0]
+    return [[_format_complex(c)] for c in v.flatten()]
+
+def _format_eigen_pairs(A, eigenvalues, eigenvectors):
+    # Kèm phép kiểm tra Av = λv cho từng cặp trị riêng - vector riêng
+    eigen_pairs = []
+    A_complex = A.astype(complex)
+    for lambda_val, v in zip(eigenvalues, eigenvectors):
+        eigen_pairs.append({
+            'lambda': _format_complex(lambda_val),
+            'v': _format_eigenvector(v),
+            'Av_check': _format_eigenvector(A_complex @ v),
+            'lambda_v_check': _format_eigenvector(lambda_val * v)
+        })
+    return eigen_pairs
+
 def format_danilevsky_result(result, A):
     if result.get('status') != 'success':
         return result
 
-    # Hàm nội bộ để định dạng số phức
-    def format_complex(c):
-        if abs(np.imag(c)) < 1e-9:
-            return np.real(c)
-        return {'real': np.real(c), 'imag': np.imag(c)}
-
-    # Hàm nội bộ để định dạng và chuẩn hóa vector
-    def format_vector_for_json(v):
-        max_abs_idx = np.argmax(np.abs(v))
-        if np.abs(v[max_abs_idx, 0]) > 1e-9:
-            v = v / v[max_abs_idx, 0]
-        return [[format_complex(c)] for c in v.flatten()]
-
     # Định dạng các bước biến đổi
     for step in result['steps']:
-        step['matrix'] = [[format_complex(c) for c in row] for row in step['matrix'].tolist()]
+        if step['matrix'] is not None:
+            step['matrix'] = [[_format_complex(c) for c in row] for row in step['matrix'].tolist()]
         if 'M' in step:
-            step['M'] = [[format_complex(c) for c in row] for row in step['M'].tolist()]
+            step['M'] = [[_format_complex(c) for c in row] for row in step['M'].tolist()]
         if 'M_inv' in step:
-            step['M_inv'] = [[format_complex(c) for c in row] for row in step['M_inv'].tolist()]
+            step['M_inv'] = [[_format_complex(c) for c in row] for row in step['M_inv'].tolist()]
     
     # Tính toán kiểm tra và tạo cấu trúc dữ liệu mới
-    eigen_pairs = []
-    raw_eigenvalues = result['eigenvalues']
-    raw_eigenvectors = result['eigenvectors']
-
-    for i in range(len(raw_eigenvalues)):
-        lambda_val = raw_eigenvalues[i]
-        v = raw_eigenvectors[i]
-
-        # Thực hiện phép kiểm tra
-        Av = A.astype(complex) @ v
-        lambda_v = lambda_val * v
-
-        eigen_pairs.append({
-            'lambda': format_complex(lambda_val),
-            'v': format_vector_for_json(v),
-            'Av_check': format_vector_for_json(Av),
-            'lambda_v_check': format_vector_for_json(lambda_v)
-        })
+    eigen_pairs = _format_eigen_pairs(A, result['eigenvalues'], result['eigenvectors'])
 
     return {
         "method": "Danilevsky",
         "status": "success",
-        "char_poly": [format_complex(c) for c in result['char_poly']],
+        "char_poly": [_format_complex(c) for c in result['char_poly']],
         "eigen_pairs": eigen_pairs, # Dữ liệu được cấu trúc lại
         "steps": result['steps']
     }
 
+def format_hessenberg_qr_result(result, A):
+    """
+    Định dạng kết quả tìm trị riêng bằng Hessenberg + QR dịch chuyển kép Francis.
+    """
+    steps = [{
+        "desc": step['desc'],
+        "matrix": encode_array(step.get('matrix'))
+    } for step in result['steps']]
+    formatted = {
+        "method": "Hessenberg-QR (dịch chuyển kép Francis)",
+        "status": "success",
+        "engine": result['engine'],
+        "sweeps": result['sweeps'],
+        "eigenvalues": [_format_complex(c) for c in result['eigenvalues']],
+        "steps": steps
+    }
+    if result['eigenvectors'] is not None:
+        formatted['eigen_pairs'] = _format_eigen_pairs(A, result['eigenvalues'], result['eigenvectors'])
+    return formatted
+
+POWER_ACCELERATION_NAMES = {
+    "rayleigh": "lặp thương Rayleigh",
+    "shift_invert": "nghịch đảo dịch chuyển",
+    "aitken": "ngoại suy Aitken Δ²",
+    "wynn": "ngoại suy ε của Wynn",
+}
+
 def format_power_method_result(result, A):
     if result.get('status') == 'success_zero':
         return {
@@ -558,7 +802,13 @@ def format_power_method_result(result, A):
                 'lambda_v_check': format_vector_for_json(lambda_v)
             })
     else: # Single case
-        method = "Power Method (GTR Trội)"
+        acceleration = result.get('acceleration', 'none')
+        if acceleration == 'shift_invert':
+            method = f"Power Method - {POWER_ACCELERATION_NAMES[acceleration]} (GTR gần σ = {result['shift']:g})"
+        elif acceleration in POWER_ACCELERATION_NAMES:
+            method = f"Power Method - {POWER_ACCELERATION_NAMES[acceleration]} (GTR Trội)"
+        else:
+            method = "Power Method (GTR Trội)"
         lambda_val = result['eigenvalue']
         v = result['eigenvector']
         Av = A @ v
@@ -576,26 +826,53 @@ def format_power_method_result(result, A):
             if 'iteration_details' in step: # Deflation
                 step['desc'] = f"<b>Tìm trị riêng thứ {step['eigenvalue_index']}:</b> Ma trận trước khi xuống thang"
                 # Chuyển đổi ma trận sang list
-                step['matrix'] = step['matrix_before_deflation'].tolist()
+                step['matrix'] = encode_array(step['matrix_before_deflation'])
                 del step['matrix_before_deflation']
                 
                 # Chuyển đổi các ndarray bên trong chi tiết lặp
                 for detail in step['iteration_details']:
-                    detail['x_k'] = detail['x_k'].tolist()
-                    detail['Ax_k'] = detail['Ax_k'].tolist()
+                    detail['x_k'] = encode_array(detail['x_k'])
+                    detail['Ax_k'] = encode_array(detail['Ax_k'])
             else: # Single
                 step['desc'] = f"<b>Bước {step['k']}:</b> Lặp lần thứ {step['k']}"
                 # Chuyển đổi các vector sang list
-                step['x_k'] = step['x_k'].tolist()
-                step['Ax_k'] = step['Ax_k'].tolist()
+                step['x_k'] = encode_array(step['x_k'])
+                step['Ax_k'] = encode_array(step['Ax_k'])
                 # lambda_k đã là float, không cần chuyển đổi
 
-    return {
+    formatted = {
         "method": method,
         "status": "success",
         "eigen_pairs": eigen_pairs,
         "steps": result.get('steps')
     }
+    if 'iterations' in result:
+        formatted['iterations'] = result['iterations']
+    return formatted
+
+def format_subspace_iteration_result(result, A):
+    """
+    Định dạng kết quả lặp không gian con (nhiều trị riêng trội cùng lúc).
+    """
+    eigenvalues = [pair['eigenvalue'] for pair in result['eigen_pairs']]
+    eigenvectors = [pair['eigenvector'] for pair in result['eigen_pairs']]
+    steps = [{
+        "k": step['k'],
+        "desc": f"<b>Lần lặp {step['k']}:</b> {step['converged']}/{len(eigenvalues)} cặp trị riêng đạt sai số.",
+        "ritz_values": [_format_complex(c) for c in step['ritz_values']],
+        "residuals": encode_array(step['residuals']),
+        # Cơ sở Ritz phức (ma trận không đối xứng) không được đưa vào vết
+        "basis": None if np.iscomplexobj(step['basis']) else encode_array(step['basis'])
+    } for step in result['steps']]
+    return {
+        "method": f"Lặp không gian con ({len(eigenvalues)} GTR, khối {result['block_size']} vector)",
+        "status": "success",
+        "symmetric": result['symmetric'],
+        "iterations": result['iterations'],
+        "residuals": encode_array(result['residuals']),
+        "eigen_pairs": _format_eigen_pairs(A, eigenvalues, eigenvectors),
+        "steps": steps
+    }
 
 def format_svd_approximation_result(result):
     """
@@ -1,14 +1,10 @@
 # backend/api_formatters/root_finding.py
 import numpy as np
 
-def format_root_finding_result(method_name, result, mode=None, stop_condition=None):
+def _error_column_name(method_name, mode, stop_condition):
     """
-    Định dạng kết quả từ các phương pháp tìm nghiệm.
+    Xác định tên cột sai số dựa trên phương pháp và điều kiện dừng.
     """
-    if not result:
-        return {"error": "Không có kết quả để định dạng."}
-
-    # Xác định tên cột sai số dựa trên phương pháp và điều kiện dừng
     error_col_name = "error" # Mặc định
     if "Chia đôi" in method_name:
         error_col_name = "|c_n - c_{n-1}|"
@@ -24,6 +20,16 @@ def format_root_finding_result(method_name, result, mode=None, stop_condition=No
             error_col_name = "|f(x_{n+1})|/(m_1|x_{n+1}|)" if stop_condition == 'f_xn' else "(M_2/2m_1)|x_{n+1}-x_n|^2/|x_{n+1}|"
     elif "Lặp đơn" in method_name:
         error_col_name = "(q/(1-q))|x_{k+1}-x_k|"
+    return error_col_name
+
+def format_root_finding_result(method_name, result, mode=None, stop_condition=None):
+    """
+    Định dạng kết quả từ các phương pháp tìm nghiệm.
+    """
+    if not result:
+        return {"error": "Không có kết quả để định dạng."}
+
+    error_col_name = _error_column_name(method_name, mode, stop_condition)
 
     # Chuyển đổi các giá trị numpy thành kiểu dữ liệu Python gốc
     for step in result['steps']:
@@ -44,4 +50,41 @@ def format_root_finding_result(method_name, result, mode=None, stop_condition=No
             "d": result.get("d"),
             "x0": result.get("x0")
         }
-    }
\ No newline at end of file
+    }
+
+def _to_json_list(values):
+    """
+    Chuyển mảng NumPy thành list, thay NaN/inf bằng None để JSON hợp lệ.
+    """
+    return [float(v) if np.isfinite(v) else None for v in np.asarray(values, dtype=float)]
+
+def format_batch_root_finding_result(method_name, result, mode=None, stop_condition=None):
+    """
+    Định dạng kết quả tìm nghiệm theo lô: mỗi trường là một mảng theo thứ tự các làn.
+    """
+    if not result:
+        return {"error": "Không có kết quả để định dạng."}
+
+    converged = np.asarray(result['converged'], dtype=bool)
+    num_lanes = int(converged.size)
+    num_converged = int(np.count_nonzero(converged))
+
+    extra_info = {}
+    for key in ("m1", "M1", "M2", "d", "x0"):
+        if key in result:
+            extra_info[key] = _to_json_list(result[key])
+
+    return {
+        "method": method_name,
+        "status": "success",
+        "message": f"Tìm thấy nghiệm cho {num_converged}/{num_lanes} bài toán.",
+        "num_lanes": num_lanes,
+        "num_converged": num_converged,
+        "roots": _to_json_list(result['solutions']),
+        "iterations": [int(k) for k in result['iterations']],
+        "converged": converged.tolist(),
+        "errors": _to_json_list(result['errors']),
+        "messages": result['messages'],
+        "error_col_name": _error_column_name(method_name, mode, stop_condition),
+        "extra_info": extra_info
+    }
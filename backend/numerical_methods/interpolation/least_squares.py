@@ -1,8 +1,9 @@
 # backend/numerical_methods/interpolation/least_squares.py
 import numpy as np
 from typing import List, Dict, Any
-from sympy import symbols, sympify, lambdify, SympifyError
+from sympy import SympifyError
 from backend.utils.helpers import zero_small
+from backend.utils.expression_parser import compile_expression
 
 def least_squares_approximation(
     x_nodes: List[float], 
@@ -45,13 +46,11 @@ def least_squares_approximation(
         raise ValueError(f"Số lượng điểm dữ liệu ({n}) phải lớn hơn hoặc bằng số lượng hàm cơ sở ({m}).")
 
     # 1. Phân tích các hàm cơ sở từ chuỗi
-    x = symbols('x')
     basis_funcs = []
     for j, func_str in enumerate(basis_func_strings):
         try:
-            expr = sympify(func_str)
-            basis_funcs.append(lambdify(x, expr, 'numpy'))
-        except (SympifyError, TypeError) as e:
+            basis_funcs.append(compile_expression(func_str)["f"])
+        except (SympifyError, TypeError, SyntaxError) as e:
             raise ValueError(f"Hàm cơ sở '{func_str}' (hàm số {j+1}) không hợp lệ: {e}")
 
     # 2. Xây dựng ma trận Phi (n x m)
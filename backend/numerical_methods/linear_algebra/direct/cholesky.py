@@ -1,55 +1,52 @@
 import numpy as np
 from backend.utils.helpers import zero_small
+from backend.numerical_methods.linear_algebra.direct.factorization import (
+    get_cholesky_factorization, cholesky_solve_factored,
+    get_packed_cholesky_factorization, get_ldlt_factorization, ldlt_solve_factored
+)
 
-def solve_cholesky(A, b, tol):
+CHOLESKY_VARIANTS = ('cholesky', 'ldlt')
+
+def solve_cholesky(A, b, tol, trace='full', variant='cholesky', packed=False):
     """
     Giải hệ phương trình AX=B bằng phương pháp Cholesky.
     Tự động xử lý ma trận không đối xứng bằng cách giải AᵀAx = Aᵀb.
+    trace: với 'none' chỉ trả về nghiệm, không kèm các ma trận phân rã.
+    variant='ldlt': phân rã A = LDLᵀ cho ma trận đối xứng không xác định dương.
+    packed=True: A là tam giác trên dạng gói (xem matrix_io.parse_packed_matrix), U cũng trả về dạng gói.
     """
+    if variant not in CHOLESKY_VARIANTS:
+        raise ValueError(f"Biến thể '{variant}' không hợp lệ. Chỉ hỗ trợ: {', '.join(CHOLESKY_VARIANTS)}.")
     if b.ndim == 1:
         b = b.reshape(-1, 1)
+    if packed:
+        if variant != 'cholesky':
+            raise ValueError("Lưu trữ dạng gói chỉ hỗ trợ phân rã Cholesky.")
+        return _solve_cholesky_packed(A, b, tol, trace)
+    if variant == 'ldlt':
+        return _solve_ldlt(A, b, tol, trace)
 
-    # --- 1. Kiểm tra đối xứng và chuyển đổi nếu cần ---
-    is_symmetric = np.allclose(A, A.T, atol=tol)
-    if is_symmetric:
-        M = A
-        d = b
-        transformation_message = "Ma trận A đối xứng, tiến hành phân tách Cholesky trực tiếp."
-    else:
-        transformation_message = "Ma trận A không đối xứng. Chuyển hệ về dạng AᵀAx = Aᵀb."
-        M = A.T @ A
-        d = A.T @ b
-
-    # --- 2. Kiểm tra xác định dương ---
-    try:
-        eigenvalues = np.linalg.eigvalsh(M)
-        if np.min(eigenvalues) <= tol:
-            raise ValueError("Ma trận (hoặc AᵀA) không xác định dương, không thể phân tích Cholesky.")
-    except np.linalg.LinAlgError:
-        raise ValueError("Lỗi tính toán giá trị riêng. Ma trận có vấn đề về số học.")
-
-    # --- 3. Phân rã Cholesky (M = UᵀU) ---
-    n = M.shape[0]
-    U = np.zeros((n, n), dtype=float)
-    for i in range(n):
-        sum_k = np.dot(U[:i, i], U[:i, i])
-        val_inside_sqrt = M[i, i] - sum_k
-        if val_inside_sqrt <= tol:
-            raise ValueError(f"Phần tử trên đường chéo U[{i},{i}] không dương. Ma trận không xác định dương.")
-        
-        U[i, i] = np.sqrt(val_inside_sqrt)
-        
-        for j in range(i + 1, n):
-            sum_k = np.dot(U[:i, i], U[:i, j])
-            U[i, j] = (M[i, j] - sum_k) / U[i, i]
-    
+    # --- 1-3. Kiểm tra đối xứng và phân rã M = UᵀU (pivot không dương => M không xác định dương) ---
+    # (M = A nếu A đối xứng, ngược lại M = AᵀA). Phân rã được lưu theo nội dung của A.
+    fact_id, factorization, cached = get_cholesky_factorization(A, tol)
+    is_symmetric = factorization["is_symmetric"]
+    transformation_message = factorization["transformation_message"]
+    M = factorization["M"]
+    U = factorization["U"]
     Ut = U.T
 
     # --- 4. Giải hệ phương trình ---
-    # Giải Uᵀy = d
-    y = np.linalg.solve(Ut, d)
-    # Giải Ux = y
-    x = np.linalg.solve(U, y)
+    # Giải Uᵀy = d, sau đó Ux = y (thế tam giác)
+    x, y, d = cholesky_solve_factored(factorization, b)
+
+    if trace == 'none':
+        return {
+            "status": "unique_solution",
+            "transformation_message": transformation_message,
+            "solution": zero_small(x, tol=tol),
+            "factorization_id": fact_id,
+            "factorization_cached": cached
+        }
 
     return {
         "status": "unique_solution",
@@ -62,4 +59,48 @@ def solve_cholesky(A, b, tol):
             "Ut": zero_small(Ut, tol=tol)
         },
         "intermediate_y": zero_small(y, tol=tol),
-    }
\ No newline at end of file
+        "factorization_id": fact_id,
+        "factorization_cached": cached
+    }
+
+def _solve_cholesky_packed(packed, b, tol, trace):
+    packed = np.asarray(packed, dtype=float)
+    n = b.shape[0]
+    if packed.size != n * (n + 1) // 2:
+        raise ValueError(f"Lỗi kích thước: ma trận A dạng gói có {packed.size} phần tử, với {n} phương trình cần đúng {n * (n + 1) // 2} phần tử.")
+    fact_id, factorization, cached = get_packed_cholesky_factorization(packed, n, tol)
+    x, _, _ = cholesky_solve_factored(factorization, b)
+    return {
+        "status": "unique_solution",
+        "variant": "cholesky",
+        "packed": True,
+        "transformation_message": factorization["transformation_message"],
+        "solution": zero_small(x, tol=tol),
+        "decomposition": {"U_packed": factorization["U_packed"]} if trace != 'none' else None,
+        "factorization_id": fact_id,
+        "factorization_cached": cached
+    }
+
+def _solve_ldlt(A, b, tol, trace):
+    fact_id, factorization, cached = get_ldlt_factorization(A, tol)
+    x, y, z = ldlt_solve_factored(factorization, b)
+    result = {
+        "status": "unique_solution",
+        "variant": "ldlt",
+        "transformation_message": factorization["transformation_message"],
+        "solution": zero_small(x, tol=tol),
+        "inertia": factorization["inertia"],
+        "factorization_id": fact_id,
+        "factorization_cached": cached
+    }
+    if trace != 'none':
+        L = np.empty_like(factorization["L_perm"])
+        L[factorization["perm"]] = factorization["L_perm"]
+        result["decomposition"] = {
+            "L": zero_small(L, tol=tol),
+            "D": zero_small(factorization["D"], tol=tol),
+            "perm": factorization["perm"]
+        }
+        result["intermediate_y"] = zero_small(y, tol=tol)
+        result["intermediate_z"] = zero_small(z, tol=tol)
+    return result
@@ -0,0 +1,336 @@
+# backend/numerical_methods/linear_algebra/direct/factorization.py
+import hashlib
+import numpy as np
+import scipy.linalg
+from scipy.linalg import lapack
+from backend.utils.cache import LRUCache
+from backend.utils.matrix_io import packed_diagonal_indices
+
+# Bộ nhớ đệm các phân rã (LU, Cholesky, LDLᵀ) dùng chung giữa các request.
+# Khóa là mã băm nội dung của ma trận A (kèm loại phân rã, kích thước và tol),
+# nên các lần giải lại với cùng A chỉ tốn các phép thế tam giác O(n²).
+FACTORIZATION_CACHE_SIZE = 64
+FACTORIZATION_CACHE_BYTES = 256 * 1024 * 1024
+
+def _entry_nbytes(entry):
+    return sum(v.nbytes for v in entry.values() if isinstance(v, np.ndarray))
+
+_factorization_cache = LRUCache(
+    maxsize=FACTORIZATION_CACHE_SIZE,
+    max_bytes=FACTORIZATION_CACHE_BYTES,
+    sizeof=_entry_nbytes
+)
+
+# Ma trận nghịch đảo (cho cập nhật Woodbury) được lưu riêng: mỗi mục là hai ma trận đặc n×n,
+# không được đẩy các phân rã đã lưu ra khỏi bộ nhớ đệm phân rã
+INVERSE_CACHE_SIZE = 16
+INVERSE_CACHE_BYTES = 256 * 1024 * 1024
+
+_inverse_cache = LRUCache(
+    maxsize=INVERSE_CACHE_SIZE,
+    max_bytes=INVERSE_CACHE_BYTES,
+    sizeof=_entry_nbytes
+)
+
+def factorization_id(A, kind, tol):
+    """
+    Mã định danh của phân rã: băm nội dung ma trận A cùng loại phân rã, kích thước và tol.
+    """
+    A = np.ascontiguousarray(A, dtype=float)
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{kind}|{A.shape}|{float(tol)!r}|".encode())
+    h.update(A.tobytes())
+    return f"{kind}-{h.hexdigest()}"
+
+def get_factorization(fact_id):
+    """
+    Lấy phân rã đã lưu theo mã định danh, trả về None nếu không có (hoặc đã bị loại khỏi bộ nhớ đệm).
+    """
+    return _factorization_cache.get(fact_id)
+
+def get_factorization_cache_stats():
+    return _factorization_cache.stats()
+
+def get_inverse_cache_stats():
+    return _inverse_cache.stats()
+
+def _build_lu(A, tol):
+    m, n = A.shape
+    entry = {"kind": "lu", "shape": (m, n), "rank": int(np.linalg.matrix_rank(A, tol=tol))}
+    if m == n:
+        try:
+            P, L, U = scipy.linalg.lu(A)
+        except ValueError:
+            P = None
+        if P is not None:
+            # A = PLU  =>  LUx = Pᵀb, với (Pᵀb)[i] = b[perm[i]]
+            entry.update({"P": P, "L": L, "U": U, "perm": np.argmax(P, axis=0)})
+    return entry
+
+def get_lu_factorization(A, tol):
+    """
+    Lấy (hoặc tính và lưu) phân rã A = PLU cùng hạng của A.
+    Trả về (mã định danh, phân rã, có_sẵn_trong_bộ_nhớ_đệm).
+    Với ma trận không vuông chỉ lưu hạng.
+    """
+    A = np.asarray(A, dtype=float)
+    fact_id = factorization_id(A, "lu", tol)
+    cached = fact_id in _factorization_cache
+    entry = _factorization_cache.get_or_create(fact_id, lambda: _build_lu(A, tol))
+    return fact_id, entry, cached
+
+def lu_solve_factored(factorization, b):
+    """
+    Giải LUX = PᵀB bằng hai phép thế tam giác. Trả về (X, Y) với LY = PᵀB.
+    """
+    Y = scipy.linalg.solve_triangular(factorization["L"], b[factorization["perm"]], lower=True, unit_diagonal=True)
+    X = scipy.linalg.solve_triangular(factorization["U"], Y)
+    return X, Y
+
+def _build_square_lu(A, tol):
+    lu, piv, info = lapack.dgetrf(A)
+    pivots = np.abs(np.diag(lu))
+    return {
+        "kind": "lu-square",
+        "shape": A.shape,
+        "lu": lu,
+        "piv": piv,
+        # Suy biến khi có phần tử trụ bằng 0 hoặc quá nhỏ so với phần tử trụ lớn nhất của U
+        "singular": bool(info > 0 or pivots.min() <= tol * pivots.max())
+    }
+
+def get_square_lu_factorization(A, tol):
+    """
+    Lấy (hoặc tính và lưu) phân rã PA = LU (LAPACK getrf) của ma trận vuông A, không tính hạng:
+    tính suy biến được xét qua đường chéo của U. Trả về (mã định danh, phân rã, có_sẵn_trong_bộ_nhớ_đệm).
+    """
+    A = np.asarray(A, dtype=float)
+    if A.ndim != 2 or A.shape[0] != A.shape[1]:
+        raise ValueError("Ma trận phải là ma trận vuông.")
+    fact_id = factorization_id(A, "lu-square", tol)
+    cached = fact_id in _factorization_cache
+    entry = _factorization_cache.get_or_create(fact_id, lambda: _build_square_lu(A, tol))
+    return fact_id, entry, cached
+
+def square_lu_solve_factored(factorization, b):
+    """Giải AX = B với phân rã từ get_square_lu_factorization (hai phép thế tam giác)."""
+    X, info = lapack.dgetrs(factorization["lu"], factorization["piv"], b)
+    if info != 0:
+        raise ValueError("Giải hệ với phân rã LU thất bại.")
+    return X
+
+def _check_cholesky_pivots(info, diag, tol):
+    # info > 0: LAPACK dừng tại pivot thứ info (không dương); ngoài ra pivot u_ii² ≤ tol cũng bị coi là không dương
+    if info < 0:
+        raise ValueError(f"Lỗi tham số thứ {-info} khi gọi LAPACK để phân tích Cholesky.")
+    if info > 0:
+        i = info - 1
+    else:
+        small = np.flatnonzero(diag ** 2 <= tol)
+        if small.size == 0:
+            return
+        i = int(small[0])
+    raise ValueError(f"Phần tử trên đường chéo U[{i},{i}] không dương. Ma trận (hoặc AᵀA) không xác định dương, không thể phân tích Cholesky.")
+
+def cholesky_upper(M, tol):
+    """
+    Phân rã Cholesky M = UᵀU trong một lượt (LAPACK dpotrf), trả về ma trận tam giác trên U.
+    Tính xác định dương được kiểm tra ngay trong quá trình phân rã (pivot không dương thì dừng),
+    không cần tính trước các giá trị riêng. Ném ra ValueError nếu M không xác định dương.
+    """
+    U, info = lapack.dpotrf(np.asarray(M, dtype=float), lower=0, clean=1)
+    _check_cholesky_pivots(info, np.diag(U) if info == 0 else None, tol)
+    return U
+
+def cholesky_packed(packed, n, tol):
+    """
+    Phân rã Cholesky cho ma trận đối xứng lưu dạng gói (xem matrix_io.parse_packed_matrix) bằng LAPACK dpptrf.
+    Trả về U dạng gói (tam giác trên theo hàng), chỉ dùng n(n+1)/2 phần tử.
+    """
+    U_packed, info = lapack.dpptrf(n, np.asarray(packed, dtype=float), lower=1)
+    _check_cholesky_pivots(info, U_packed[packed_diagonal_indices(n)] if info == 0 else None, tol)
+    return U_packed
+
+def _build_cholesky(A, tol):
+    is_symmetric = bool(np.allclose(A, A.T, atol=tol))
+    if is_symmetric:
+        M = A
+        transformation_message = "Ma trận A đối xứng, tiến hành phân tách Cholesky trực tiếp."
+    else:
+        transformation_message = "Ma trận A không đối xứng. Chuyển hệ về dạng AᵀAx = Aᵀb."
+        M = A.T @ A
+    return {
+        "kind": "cholesky",
+        "shape": A.shape,
+        "is_symmetric": is_symmetric,
+        "transformation_message": transformation_message,
+        "U": cholesky_upper(M, tol),
+        # Với A không đối xứng cần giữ A (để tính Aᵀb) và M (để hiển thị)
+        "A": A.copy() if not is_symmetric else None,
+        "M": M if not is_symmetric else None
+    }
+
+def get_cholesky_factorization(A, tol):
+    """
+    Lấy (hoặc tính và lưu) phân rã Cholesky của A (hoặc của AᵀA nếu A không đối xứng).
+    Trả về (mã định danh, phân rã, có_sẵn_trong_bộ_nhớ_đệm).
+    """
+    A = np.asarray(A, dtype=float)
+    if A.ndim != 2 or A.shape[0] != A.shape[1]:
+        raise ValueError("Phương pháp Cholesky yêu cầu ma trận A vuông.")
+    fact_id = factorization_id(A, "cholesky", tol)
+    cached = fact_id in _factorization_cache
+    entry = _factorization_cache.get_or_create(fact_id, lambda: _build_cholesky(A, tol))
+    return fact_id, entry, cached
+
+def get_packed_cholesky_factorization(packed, n, tol):
+    """
+    Lấy (hoặc tính và lưu) phân rã Cholesky của ma trận đối xứng lưu dạng gói.
+    Trả về (mã định danh, phân rã, có_sẵn_trong_bộ_nhớ_đệm).
+    """
+    packed = np.asarray(packed, dtype=float)
+    fact_id = factorization_id(packed, "cholesky-packed", tol)
+    cached = fact_id in _factorization_cache
+    entry = _factorization_cache.get_or_create(fact_id, lambda: {
+        "kind": "cholesky",
+        "storage": "packed",
+        "shape": (n, n),
+        "is_symmetric": True,
+        "transformation_message": "Ma trận A đối xứng (lưu dạng gói), tiến hành phân tách Cholesky trực tiếp.",
+        "U_packed": cholesky_packed(packed, n, tol),
+        "A": None,
+        "M": None
+    })
+    return fact_id, entry, cached
+
+def cholesky_solve_factored(factorization, b):
+    """
+    Giải UᵀUx = d (d = b, hoặc d = Aᵀb nếu A không đối xứng). Trả về (x, y, d) với Uᵀy = d.
+    Với phân rã dạng gói, LAPACK dpptrs giải cả hai hệ tam giác nên y = None.
+    """
+    if factorization.get("storage") == "packed":
+        n = factorization["shape"][0]
+        x, info = lapack.dpptrs(n, factorization["U_packed"], np.asarray(b, dtype=float).reshape(n, -1), lower=1)
+        return x, None, b
+    d = b if factorization["is_symmetric"] else factorization["A"].T @ b
+    U = factorization["U"]
+    y = scipy.linalg.solve_triangular(U, d, trans='T')
+    x = scipy.linalg.solve_triangular(U, y)
+    return x, y, d
+
+def _ldlt_inertia(d, tol):
+    # Số giá trị riêng dương / âm của A (định luật quán tính Sylvester) từ các khối 1×1, 2×2 của D.
+    # Ném ra ValueError nếu có khối suy biến.
+    n = d.shape[0]
+    positive = negative = 0
+    i = 0
+    while i < n:
+        if i + 1 < n and d[i + 1, i] != 0:
+            block = d[i:i + 2, i:i + 2]
+            if abs(np.linalg.det(block)) <= tol:
+                raise ValueError(f"Khối 2×2 của D tại vị trí {i} suy biến, ma trận A suy biến.")
+            eig = np.linalg.eigvalsh(block)
+            positive += int(np.sum(eig > 0))
+            negative += int(np.sum(eig < 0))
+            i += 2
+        else:
+            if abs(d[i, i]) <= tol:
+                raise ValueError(f"Phần tử D[{i},{i}] bằng 0, ma trận A suy biến.")
+            positive += int(d[i, i] > 0)
+            negative += int(d[i, i] < 0)
+            i += 1
+    return {"positive": positive, "negative": negative}
+
+def _build_ldlt(A, tol):
+    if not np.allclose(A, A.T, atol=tol):
+        raise ValueError("Phân rã LDLᵀ yêu cầu ma trận A đối xứng.")
+    lu, d, perm = scipy.linalg.ldl(A, lower=True, check_finite=False)
+    return {
+        "kind": "ldlt",
+        "shape": A.shape,
+        "transformation_message": "Ma trận A đối xứng, tiến hành phân rã LDLᵀ (chọn pivot Bunch-Kaufman, không cần xác định dương).",
+        # Lưu L[perm] (tam giác dưới) để mỗi lần giải không phải hoán vị lại L
+        "L_perm": lu[perm],
+        "D": d,
+        "perm": perm,
+        "inertia": _ldlt_inertia(d, tol)
+    }
+
+def get_ldlt_factorization(A, tol):
+    """
+    Lấy (hoặc tính và lưu) phân rã A = LDLᵀ của ma trận đối xứng (có thể không xác định dương).
+    D là ma trận khối chéo 1×1 / 2×2, L_perm = L[perm] là ma trận tam giác dưới với đường chéo đơn vị.
+    Trả về (mã định danh, phân rã, có_sẵn_trong_bộ_nhớ_đệm).
+    """
+    A = np.asarray(A, dtype=float)
+    if A.ndim != 2 or A.shape[0] != A.shape[1]:
+        raise ValueError("Phân rã LDLᵀ yêu cầu ma trận A vuông.")
+    fact_id = factorization_id(A, "ldlt", tol)
+    cached = fact_id in _factorization_cache
+    entry = _factorization_cache.get_or_create(fact_id, lambda: _build_ldlt(A, tol))
+    return fact_id, entry, cached
+
+def ldlt_solve_factored(factorization, b):
+    """
+    Giải LDLᵀx = b: Ly = b, Dz = y (D ba đường chéo), Lᵀx = z. Trả về (x, y, z).
+    """
+    L_perm, d, perm = factorization["L_perm"], factorization["D"], factorization["perm"]
+    y = scipy.linalg.solve_triangular(L_perm, b[perm], lower=True, unit_diagonal=True)
+    n = d.shape[0]
+    banded = np.zeros((3, n))
+    banded[0, 1:] = np.diagonal(d, 1)
+    banded[1] = np.diagonal(d)
+    banded[2, :-1] = np.diagonal(d, -1)
+    z = scipy.linalg.solve_banded((1, 1), banded, y)
+    x = np.empty_like(z)
+    x[perm] = scipy.linalg.solve_triangular(L_perm, z, lower=True, trans='T', unit_diagonal=True)
+    return x, y, z
+
+def store_inverse(A, inverse, tol):
+    """
+    Lưu A⁻¹ (kèm A) vào bộ nhớ đệm ma trận nghịch đảo để các cập nhật hạng thấp sau đó (Woodbury) dùng lại.
+    Trả về mã định danh (inverse_id), hoặc None nếu ma trận quá lớn so với dung lượng bộ nhớ đệm nên không được lưu.
+    """
+    A = np.asarray(A, dtype=float)
+    inverse_id = factorization_id(A, "inverse", tol)
+    stored = _inverse_cache.put(inverse_id, {
+        "kind": "inverse",
+        "shape": A.shape,
+        "A": A.copy(),
+        "inverse": np.array(inverse, dtype=float)
+    })
+    return inverse_id if stored else None
+
+def get_inverse(inverse_id):
+    """
+    Lấy (A, A⁻¹) đã lưu theo mã định danh. Ném ra ValueError nếu không có hoặc mã không phải của một ma trận nghịch đảo.
+    """
+    entry = _inverse_cache.get(inverse_id)
+    if entry is None:
+        raise ValueError(f"Không tìm thấy ma trận nghịch đảo '{inverse_id}' (có thể đã bị xóa khỏi bộ nhớ đệm). Hãy tính lại A⁻¹.")
+    if entry["kind"] != "inverse":
+        raise ValueError(f"Mã '{inverse_id}' là của phân rã '{entry['kind']}', không phải ma trận nghịch đảo.")
+    return entry["A"], entry["inverse"]
+
+def check_multi_rhs_factorization(factorization, kind):
+    """
+    Kiểm tra phân rã có dùng được để giải AX = B với nhiều vế phải (A vuông, khả nghịch).
+    """
+    if factorization["kind"] != kind:
+        raise ValueError(f"Phân rã đã lưu là '{factorization['kind']}', không dùng được cho phương pháp '{kind}'.")
+    if kind == "lu":
+        n = factorization["shape"][1]
+        if factorization.get("P") is None or factorization["rank"] < n:
+            raise ValueError("Ma trận A không vuông hoặc suy biến, không thể giải nhiều vế phải bằng phân rã LU.")
+
+def solve_factored_rows(factorization, B_rows):
+    """
+    Giải AX = B với các vế phải là các hàng của B_rows (k x n); nghiệm trả về cũng theo hàng (k x n).
+    """
+    if factorization["kind"] == "lu":
+        X, _ = lu_solve_factored(factorization, B_rows.T)
+    elif factorization["kind"] == "ldlt":
+        X, _, _ = ldlt_solve_factored(factorization, B_rows.T)
+    else:
+        X, _, _ = cholesky_solve_factored(factorization, B_rows.T)
+    return X.T
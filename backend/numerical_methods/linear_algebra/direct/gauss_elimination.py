@@ -1,11 +1,12 @@
 # backend/numerical_methods/linear_algebra/direct/gauss_elimination.py
 import numpy as np
-from backend.utils.helpers import zero_small
+from backend.utils.helpers import zero_small, trace_snapshot
 
-def gauss_elimination(A, b, tol):
+def gauss_elimination(A, b, tol, trace='full'):
     """
     Giải hệ phương trình tuyến tính Ax = b bằng phương pháp khử Gauss.
     Hàm này đã được sửa để xử lý đúng các ma trận không vuông.
+    trace: mức lưu vết các bước ('none', 'summary', 'full').
     """
     # --- 1. Chuẩn bị (Không đổi) ---
     A_float = A.copy().astype(float)
@@ -18,22 +19,23 @@ def gauss_elimination(A, b, tol):
     num_vars = A.shape[1]
     
     steps, pivot_columns, pivot_row, col_index = [], [], 0, 0
+    # Toàn bộ ma trận được làm tròn về 0 ở lần khử đầu tiên; từ đó về sau
+    # chỉ khối con phía dưới - bên phải hàng pivot thay đổi nên chỉ cần làm tròn khối đó.
+    clamped = False
 
-    # --- 2. Quá trình khử xuôi (Không đổi) ---
+    # --- 2. Quá trình khử xuôi ---
     while pivot_row < num_rows and col_index < num_vars:
         if abs(augmented_matrix[pivot_row, col_index]) < tol:
-            swap_with_row = -1
-            for k in range(pivot_row + 1, num_rows):
-                if abs(augmented_matrix[k, col_index]) > tol:
-                    swap_with_row = k
-                    break
+            candidates = np.flatnonzero(np.abs(augmented_matrix[pivot_row + 1:, col_index]) > tol)
             
-            if swap_with_row != -1:
+            if candidates.size > 0:
+                swap_with_row = pivot_row + 1 + int(candidates[0])
                 augmented_matrix[[pivot_row, swap_with_row]] = augmented_matrix[[swap_with_row, pivot_row]]
-                steps.append({
-                    "type": "pivot", "from_row": swap_with_row, "to_row": pivot_row,
-                    "matrix": augmented_matrix.copy()
-                })
+                if trace != 'none':
+                    steps.append({
+                        "type": "pivot", "from_row": swap_with_row, "to_row": pivot_row,
+                        "matrix": trace_snapshot(augmented_matrix, trace)
+                    })
 
         pivot_element = augmented_matrix[pivot_row, col_index]
 
@@ -43,16 +45,26 @@ def gauss_elimination(A, b, tol):
 
         pivot_columns.append(col_index)
         
-        for i in range(pivot_row + 1, num_rows):
-            factor = augmented_matrix[i, col_index] / pivot_element
-            if abs(factor) > tol:
-                augmented_matrix[i, :] -= factor * augmented_matrix[pivot_row, :]
-        
-        augmented_matrix = zero_small(augmented_matrix, tol=tol)
-        steps.append({
-            "type": "elimination", "pivot_row": pivot_row, "pivot_col": col_index,
-            "matrix": augmented_matrix.copy()
-        })
+        # Cập nhật hạng 1 tại chỗ: A[i, :] -= factor_i * A[pivot, :] cho mọi hàng i phía dưới.
+        # Các hàng có |factor| <= tol được bỏ qua như khi khử từng hàng.
+        # Nếu hàng pivot bằng 0 ở các cột bên trái thì chỉ cần cập nhật từ cột pivot trở đi.
+        start_col = col_index if not np.any(augmented_matrix[pivot_row, :col_index]) else 0
+        factors = augmented_matrix[pivot_row + 1:, col_index] / pivot_element
+        factors[np.abs(factors) <= tol] = 0.0
+        trailing = augmented_matrix[pivot_row + 1:, start_col:]
+        trailing -= np.outer(factors, augmented_matrix[pivot_row, start_col:])
+
+        if clamped:
+            trailing[np.abs(trailing) < tol] = 0.0
+        else:
+            augmented_matrix[np.abs(augmented_matrix) < tol] = 0.0
+            clamped = True
+
+        if trace != 'none':
+            steps.append({
+                "type": "elimination", "pivot_row": pivot_row, "pivot_col": col_index,
+                "matrix": trace_snapshot(augmented_matrix, trace)
+            })
         
         pivot_row += 1
         col_index += 1
@@ -121,7 +133,8 @@ def gauss_elimination(A, b, tol):
             # Gán vào đúng vị trí trong ma trận nghiệm
             solution[pivot_col, :] = x_i_row
             
-            backward_steps.append({"row": pivot_col, "solution_so_far": solution.copy()})
+            if trace != 'none':
+                backward_steps.append({"row": pivot_col, "solution_so_far": trace_snapshot(solution, trace)})
             
         return {
             "status": "unique_solution",
@@ -1,11 +1,12 @@
 #backend/numerical_methods/linear_algebra/direct/gauss_jordan.py
 import numpy as np
-from backend.utils.helpers import zero_small
+from backend.utils.helpers import zero_small, trace_snapshot
 
-def gauss_jordan(A, b, tol):
+def gauss_jordan(A, b, tol, trace='full'):
     """
     Giải hệ phương trình AX = B bằng phương pháp khử Gauss-Jordan,
     tuân thủ quy tắc chọn pivot đặc biệt và xử lý đầy đủ các trường hợp nghiệm.
+    trace: mức lưu vết các bước ('none', 'summary', 'full').
     """
     # --- 1. Chuẩn bị ---
     A_float = A.copy().astype(float)
@@ -24,30 +25,22 @@ def gauss_jordan(A, b, tol):
     max_pivots = min(num_rows, num_vars)
     for step in range(max_pivots):
         pivot_r, pivot_c = -1, -1
+        free_rows = np.setdiff1d(np.arange(num_rows), pivoted_rows)
+        free_cols = np.setdiff1d(np.arange(num_vars), pivoted_cols)
+        candidates = augmented_matrix[np.ix_(free_rows, free_cols)]
         
         # --- 2. Chọn Pivot theo quy tắc đặc biệt ---
-        # Ưu tiên tìm pivot là +-1.0
-        found_one = False
-        for r in range(num_rows):
-            if r in pivoted_rows: continue
-            for c in range(num_vars):
-                if c in pivoted_cols: continue
-                if (float(augmented_matrix[r, c]) == 1.0) or (float(augmented_matrix[r, c]) == -1.0):
-                    pivot_r, pivot_c = r, c
-                    found_one = True
-                    break
-            if found_one: break
-            
-        # Nếu không có +-1.0, tìm pivot có giá trị tuyệt đối lớn nhất
-        if not found_one:
-            max_val = tol
-            for r in range(num_rows):
-                if r in pivoted_rows: continue
-                for c in range(num_vars):
-                    if c in pivoted_cols: continue
-                    if abs(augmented_matrix[r, c]) > max_val:
-                        max_val = abs(augmented_matrix[r, c])
-                        pivot_r, pivot_c = r, c
+        # Ưu tiên tìm pivot là +-1.0 (phần tử đầu tiên theo thứ tự hàng)
+        is_unit = (candidates == 1.0) | (candidates == -1.0)
+        if is_unit.any():
+            r, c = np.unravel_index(np.argmax(is_unit), is_unit.shape)
+            pivot_r, pivot_c = int(free_rows[r]), int(free_cols[c])
+        # Nếu không có +-1.0, tìm pivot có giá trị tuyệt đối lớn nhất (phải lớn hơn tol)
+        elif candidates.size > 0:
+            abs_candidates = np.abs(candidates)
+            r, c = np.unravel_index(np.argmax(abs_candidates), abs_candidates.shape)
+            if abs_candidates[r, c] > tol:
+                pivot_r, pivot_c = int(free_rows[r]), int(free_cols[c])
                         
         # Nếu không tìm thấy pivot nào nữa, dừng lại
         if pivot_r == -1:
@@ -56,21 +49,24 @@ def gauss_jordan(A, b, tol):
         pivot_element = augmented_matrix[pivot_r, pivot_c]
         pivoted_rows.append(pivot_r)
         pivoted_cols.append(pivot_c)
-        steps.append({"type": "pivot_selection", "pivot_row": pivot_r, "pivot_col": pivot_c, "pivot_value": pivot_element, "matrix": augmented_matrix.copy()})
+        if trace != 'none':
+            steps.append({"type": "pivot_selection", "pivot_row": pivot_r, "pivot_col": pivot_c, "pivot_value": pivot_element, "matrix": trace_snapshot(augmented_matrix, trace)})
         
         # --- 3. Quá trình khử ---
         # Chuẩn hóa hàng pivot
         augmented_matrix[pivot_r, :] /= pivot_element
         
-        # Khử các phần tử khác trong cột pivot (cả trên và dưới)
-        for i in range(num_rows):
-            if i != pivot_r:
-                factor = augmented_matrix[i, pivot_c]
-                if abs(factor) > tol:
-                    augmented_matrix[i, :] -= factor * augmented_matrix[pivot_r, :]
+        # Khử các phần tử khác trong cột pivot (cả trên và dưới) bằng một cập nhật hạng 1 tại chỗ.
+        # Hàng pivot và các hàng có |factor| <= tol có hệ số 0 nên không thay đổi.
+        factors = augmented_matrix[:, pivot_c].copy()
+        factors[pivot_r] = 0.0
+        factors[np.abs(factors) <= tol] = 0.0
+        augmented_matrix -= np.outer(factors, augmented_matrix[pivot_r, :])
         
-        augmented_matrix = zero_small(augmented_matrix, tol=tol)
-        steps.append({"type": "elimination", "pivot_row": pivot_r, "pivot_col": pivot_c, "matrix": augmented_matrix.copy()})
+        # Mọi hàng đều có thể bị thay đổi nên làm tròn tại chỗ cả ma trận (không tạo bản sao mới)
+        augmented_matrix[np.abs(augmented_matrix) < tol] = 0.0
+        if trace != 'none':
+            steps.append({"type": "elimination", "pivot_row": pivot_r, "pivot_col": pivot_c, "matrix": trace_snapshot(augmented_matrix, trace)})
 
     # --- 4. Kết luận nghiệm ---
     rank = len(pivoted_rows)
@@ -1,60 +1,81 @@
 # backend/numerical_methods/linear_algebra/direct/lu_decomposition.py
 import numpy as np
 import scipy.linalg
-from backend.utils.helpers import zero_small # <<< THÊM DÒNG IMPORT BỊ THIẾU
+from backend.utils.helpers import zero_small
+from backend.numerical_methods.linear_algebra.direct.factorization import get_lu_factorization, lu_solve_factored
 
-def _lu_decomposition_steps(A, tol):
+# Kích thước khối của phân rã LU theo khối (right-looking) dùng để lưu vết các bước
+LU_TRACE_BLOCK = 64
+
+def _lu_decomposition_steps(A, tol, trace='full'):
     """
     Phân tích LU không pivoting (Doolittle) để lấy các bước trung gian.
+    Dùng phân rã theo khối (right-looking): mỗi khối cột được phân rã, sau đó cập nhật phần còn lại
+    bằng một phép nhân ma trận. Mỗi bước i chỉ lưu phần mới tính được (vết gọn, tổng O(n²) bộ nhớ):
+        {"row": i, "u_row": U[i, i:], "l_col": L[i+1:, i]}
+    Ma trận L, U đầy đủ sau mỗi bước chỉ được dựng lại khi định dạng kết quả (format_lu_result).
+    Với trace='summary' chỉ lưu chỉ số hàng của mỗi bước.
     """
     n = A.shape[0]
     if A.shape[0] != A.shape[1]:
         return [] # Không thực hiện với ma trận không vuông
-    L = np.zeros((n, n))
-    U = np.zeros((n, n))
+    W = np.array(A, dtype=float)
     steps = []
-    
-    for i in range(n):
-        for k in range(i, n):
-            sum_val = np.dot(L[i, :i], U[:i, k])
-            U[i, k] = A[i, k] - sum_val
-            
-        if abs(U[i, i]) < tol:
-            return steps
 
-        L[i, i] = 1
-        for k in range(i + 1, n):
-            sum_val = np.dot(L[k, :i], U[:i, i])
-            L[k, i] = (A[k, i] - sum_val) / U[i, i]
-            
-        steps.append({'L': L.copy(), 'U': U.copy()})
-        
+    def record(rows):
+        for i in rows:
+            if trace == 'full':
+                steps.append({"row": i, "u_row": W[i, i:].copy(), "l_col": W[i + 1:, i].copy()})
+            else:
+                steps.append({"row": i})
+
+    for k0 in range(0, n, LU_TRACE_BLOCK):
+        k1 = min(k0 + LU_TRACE_BLOCK, n)
+        # Phân rã khối cột W[k0:, k0:k1]
+        for j in range(k0, k1):
+            if abs(W[j, j]) < tol:
+                # Hàng U của các bước đã xong trong khối vẫn cần phần bên phải khối
+                if k1 < n and j > k0:
+                    W[k0:j, k1:] = scipy.linalg.solve_triangular(
+                        W[k0:j, k0:j], W[k0:j, k1:], lower=True, unit_diagonal=True)
+                record(range(k0, j))
+                return steps
+            W[j + 1:, j] /= W[j, j]
+            W[j + 1:, j + 1:k1] -= np.outer(W[j + 1:, j], W[j, j + 1:k1])
+        if k1 < n:
+            # U12 = L11⁻¹A12, sau đó cập nhật khối còn lại A22 -= L21·U12
+            W[k0:k1, k1:] = scipy.linalg.solve_triangular(
+                W[k0:k1, k0:k1], W[k0:k1, k1:], lower=True, unit_diagonal=True)
+            W[k1:, k1:] -= W[k1:, k0:k1] @ W[k0:k1, k1:]
+        record(range(k0, k1))
+
     return steps
 
-def solve_lu(A, b, tol):
+def solve_lu(A, b, tol, trace='full'):
     """
     Giải hệ phương trình AX=B bằng phân rã LU.
+    trace: mức lưu vết các bước ('none', 'summary', 'full').
     """
     if b.ndim == 1:
         b = b.reshape(-1, 1)
     
     m, n = A.shape
     
-    lu_steps = _lu_decomposition_steps(A, tol)
+    lu_steps = _lu_decomposition_steps(A, tol, trace) if trace != 'none' else []
     
-    P, L, U = None, None, None
-    is_square = m == n
-    if is_square:
-        try:
-            P, L, U = scipy.linalg.lu(A)
-        except ValueError:
-            is_square = False # Coi như không vuông nếu không phân rã được
+    # Phân rã PLU và hạng của A được lưu theo nội dung của A, giải lại với cùng A không phải phân rã lại
+    fact_id, factorization, cached = get_lu_factorization(A, tol)
+    P, L, U = factorization.get("P"), factorization.get("L"), factorization.get("U")
+    is_square = P is not None
 
-    rank_A = np.linalg.matrix_rank(A, tol=tol)
-    AB = np.hstack((A, b))
-    rank_AB = np.linalg.matrix_rank(AB, tol=tol)
+    rank_A = factorization["rank"]
+    # Nếu hạng(A) = số hàng thì hạng([A|B]) = hạng(A), không cần tính SVD lần nữa
+    if rank_A == m:
+        rank_AB = rank_A
+    else:
+        rank_AB = np.linalg.matrix_rank(np.hstack((A, b)), tol=tol)
 
-    result = { "lu_steps": lu_steps, "num_vars": n, "rank": rank_A }
+    result = { "lu_steps": lu_steps, "num_vars": n, "rank": rank_A, "factorization_id": fact_id, "factorization_cached": cached }
 
     if rank_A < rank_AB:
         result.update({"status": "no_solution"})
@@ -69,8 +90,7 @@ def solve_lu(A, b, tol):
         })
     else: # Nghiệm duy nhất (hoặc xấp xỉ cho hệ không vuông)
         if is_square:
-            Y = scipy.linalg.solve_triangular(L, P @ b, lower=True)
-            X = scipy.linalg.solve_triangular(U, Y)
+            X, Y = lu_solve_factored(factorization, b)
         else: # Dùng least squares cho hệ không vuông có rank = số ẩn
             X, _, _, _ = np.linalg.lstsq(A, b, rcond=None)
             Y = None
@@ -81,7 +101,7 @@ def solve_lu(A, b, tol):
             "intermediate_y": zero_small(Y, tol=tol) if Y is not None else None
         })
 
-    if P is not None:
+    if P is not None and trace != 'none':
         result.update({"decomposition": {
             "P": zero_small(P, tol=tol), 
             "L": zero_small(L, tol=tol), 
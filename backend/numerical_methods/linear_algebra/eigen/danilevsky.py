@@ -1,10 +1,17 @@
 # backend/numerical_methods/linear_algebra/eigen/danilevsky.py
 import numpy as np
-from backend.utils.helpers import get_char_polynomial
+from backend.utils.helpers import get_char_polynomial, trace_snapshot
 
-def danilevsky_algorithm(A):
+def _elementary_matrix(n, row, values):
+    # Ma trận đơn vị với hàng `row` được thay bằng values (chỉ dựng khi lưu vết đầy đủ)
+    M = np.eye(n, dtype=complex)
+    M[row, :] = values
+    return M
+
+def danilevsky_algorithm(A, trace='full'):
     """
     Thuật toán Danilevsky để tìm trị riêng và vector riêng.
+    trace: mức lưu vết các bước ('none', 'summary', 'full').
     """
     if A.shape[0] != A.shape[1]:
         raise ValueError('Ma trận đầu vào phải là ma trận vuông.')
@@ -12,32 +19,47 @@ def danilevsky_algorithm(A):
     n = A.shape[0]
     similar = A.copy().astype(complex)
     back = np.eye(n, dtype=complex)
-    steps_log = [{'desc': 'Ma trận ban đầu', 'matrix': similar.copy()}]
+    steps_log = []
+    if trace != 'none':
+        steps_log.append({'desc': 'Ma trận ban đầu', 'matrix': trace_snapshot(similar, trace)})
 
     # Giai đoạn 1: Biến đổi ma trận
     for k in range(n - 1, 0, -1):
         if abs(similar[k, k - 1]) < 1e-9:
-            steps_log.append({'desc': f'Hàng {k+1} không cần biến đổi (tạo thành khối riêng).', 'matrix': similar.copy()})
+            if trace != 'none':
+                steps_log.append({'desc': f'Hàng {k+1} không cần biến đổi (tạo thành khối riêng).', 'matrix': trace_snapshot(similar, trace)})
             continue
 
-        M = np.eye(n, dtype=complex)
-        M[k - 1, :] = similar[k, :]
-        
-        if np.linalg.cond(M) > 1/np.finfo(M.dtype).eps:
+        # M chỉ khác I ở hàng k-1 (= hàng k của ma trận hiện tại), M⁻¹ cũng vậy:
+        # M⁻¹[k-1, :] = -similar[k, :] / p, M⁻¹[k-1, k-1] = 1 / p với p = similar[k, k-1].
+        pivot = similar[k, k - 1]
+        m_row = similar[k, :].copy()
+        m_inv_row = -m_row / pivot
+        m_inv_row[k - 1] = 1 / pivot
+        # Số điều kiện chuẩn vô cùng của M tính trực tiếp từ hai hàng trên, O(n) thay vì np.linalg.cond(M)
+        cond_M = max(1.0, np.sum(np.abs(m_row))) * max(1.0, np.sum(np.abs(m_inv_row)))
+        if not np.isfinite(cond_M) or cond_M > 1 / np.finfo(float).eps:
             raise ValueError(f'Ma trận biến đổi M ở bước k={k} bị suy biến, không thể tiếp tục.')
 
-        M_inv = np.linalg.inv(M)
-
-        similar = M @ similar @ M_inv
-        back = back @ M_inv
-        steps_log.append({
-            'desc': f'Sau khi biến đổi hàng {k+1}.',
-            'matrix': similar.copy(),
-            'M': M,
-            'M_inv': M_inv
-        })
+        # similar ← M·similar·M⁻¹ và back ← back·M⁻¹ dưới dạng cập nhật hạng 1, O(n²) mỗi bước:
+        # nhân phải với M⁻¹ chỉ cộng bội của cột k-1 vào các cột, nhân trái với M chỉ đổi hàng k-1.
+        m_inv_delta = m_inv_row.copy()
+        m_inv_delta[k - 1] -= 1
+        similar += np.outer(similar[:, k - 1], m_inv_delta)
+        similar[k - 1, :] = m_row @ similar
+        back += np.outer(back[:, k - 1], m_inv_delta)
+        if trace == 'full':
+            steps_log.append({
+                'desc': f'Sau khi biến đổi hàng {k+1}.',
+                'matrix': similar.copy(),
+                'M': _elementary_matrix(n, k - 1, m_row),
+                'M_inv': _elementary_matrix(n, k - 1, m_inv_row)
+            })
+        elif trace == 'summary':
+            steps_log.append({'desc': f'Sau khi biến đổi hàng {k+1}.', 'matrix': None})
         
-    steps_log.append({'desc': 'Ma trận cuối (dạng tam giác trên theo khối Frobenius)', 'matrix': similar.copy()})
+    if trace != 'none':
+        steps_log.append({'desc': 'Ma trận cuối (dạng tam giác trên theo khối Frobenius)', 'matrix': trace_snapshot(similar, trace)})
     
     # Giai đoạn 2: Trích xuất kết quả
     final_eigenvalues = []
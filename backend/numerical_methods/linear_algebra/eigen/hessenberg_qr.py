@@ -0,0 +1,301 @@
+# backend/numerical_methods/linear_algebra/eigen/hessenberg_qr.py
+import math
+import numpy as np
+import scipy.linalg
+from backend.utils.helpers import trace_snapshot
+
+QR_ENGINES = ('auto', 'explicit', 'lapack')
+# Với engine='auto', ma trận cấp lớn hơn ngưỡng này dùng LAPACK (dgeev: cũng là rút gọn Householder
+# về dạng Hessenberg + QR dịch chuyển kép Francis, nhưng được biên dịch). Cài đặt tường minh bên dưới
+# đẩy "chỗ phồng" bằng vòng lặp Python, O(n³) phép tính nhưng O(n²) bước Python.
+QR_EXPLICIT_MAX_N = 100
+# Số lần quét QR tối đa trung bình cho mỗi trị riêng
+QR_MAX_SWEEPS_PER_EIGENVALUE = 30
+# Sau ngần này lần quét mà chưa tách được trị riêng thì dùng dịch chuyển ngoại lệ để phá chu trình
+QR_EXCEPTIONAL_SHIFT_EVERY = 10
+
+def _householder(x):
+    """Trả về (v, beta) sao cho (I - beta·vvᵀ)x = -sign(x₀)·||x||·e₁; beta = 0 nếu x = 0."""
+    v = np.array(x, dtype=float)
+    norm_x = math.sqrt(v @ v)
+    if norm_x == 0.0:
+        return v, 0.0
+    v[0] += math.copysign(norm_x, v[0])
+    return v, 2.0 / (v @ v)
+
+def _power_of_two_scale(A):
+    # Lũy thừa của 2 gần max|aᵢⱼ| nhất; 1 với ma trận 0
+    max_abs = np.abs(A).max() if A.size else 0.0
+    if max_abs == 0.0:
+        return 1.0
+    return math.ldexp(1.0, math.frexp(max_abs)[1])
+
+def hessenberg_reduction(A, calc_q=True):
+    """
+    Đưa A về dạng Hessenberg trên H = QᵀAQ bằng n-2 phép phản xạ Householder, O(n³).
+    Trả về (H, Q); Q = None nếu calc_q=False.
+    """
+    H = np.array(A, dtype=float)
+    n = H.shape[0]
+    Q = np.eye(n) if calc_q else None
+    for k in range(n - 2):
+        v, beta = _householder(H[k + 1:, k])
+        if beta == 0.0:
+            continue
+        # H ← P H P với P = I - beta·vvᵀ tác động lên các hàng/cột k+1..n-1
+        H[k + 1:, k:] -= beta * np.outer(v, v @ H[k + 1:, k:])
+        H[:, k + 1:] -= beta * np.outer(H[:, k + 1:] @ v, v)
+        if Q is not None:
+            Q[:, k + 1:] -= beta * np.outer(Q[:, k + 1:] @ v, v)
+        H[k + 2:, k] = 0.0
+    return H, Q
+
+def _apply_reflector(H, Z, v, beta, k, row_start, col_end):
+    # H ← P H P, Z ← Z P với P tác động lên các chỉ số k..k+len(v)-1
+    m = len(v)
+    w = beta * v
+    rows = H[k:k + m, row_start:]
+    rows -= w[:, None] * (v @ rows)
+    cols = H[:col_end, k:k + m]
+    cols -= (cols @ v)[:, None] * w
+    if Z is not None:
+        zcols = Z[:, k:k + m]
+        zcols -= (zcols @ v)[:, None] * w
+
+def _francis_sweep(H, Z, lo, hi, shift_sum, shift_prod):
+    """
+    Một bước QR dịch chuyển kép Francis (ẩn) trên khối H[lo:hi+1, lo:hi+1]: tạo "chỗ phồng" từ
+    cột đầu của (H - σ₁I)(H - σ₂I) rồi đẩy dần nó xuống cuối khối bằng các phản xạ Householder 3×3.
+    shift_sum = σ₁ + σ₂, shift_prod = σ₁σ₂ (luôn là số thực).
+    """
+    x = H[lo, lo] * H[lo, lo] + H[lo, lo + 1] * H[lo + 1, lo] - shift_sum * H[lo, lo] + shift_prod
+    y = H[lo + 1, lo] * (H[lo, lo] + H[lo + 1, lo + 1] - shift_sum)
+    z = H[lo + 1, lo] * H[lo + 2, lo + 1]
+    for k in range(lo, hi - 1):
+        v, beta = _householder([x, y, z])
+        if beta != 0.0:
+            _apply_reflector(H, Z, v, beta, k, max(lo, k - 1), min(k + 4, hi + 1))
+        x = H[k + 1, k]
+        y = H[k + 2, k]
+        if k < hi - 2:
+            z = H[k + 3, k]
+    v, beta = _householder([x, y])
+    if beta != 0.0:
+        _apply_reflector(H, Z, v, beta, hi - 1, hi - 2, hi + 1)
+
+def _split_2x2(H, Z, k):
+    """
+    Khối 2×2 H[k:k+2, k:k+2] có trị riêng thực: dùng phép quay để đưa về tam giác trên.
+    Trả về True nếu khối có trị riêng thực (đã tách), False nếu là cặp trị riêng phức.
+    """
+    a, b, c, d = H[k, k], H[k, k + 1], H[k + 1, k], H[k + 1, k + 1]
+    p = 0.5 * (a - d)
+    disc = p * p + b * c
+    if disc < 0:
+        return False
+    # Trị riêng gần d hơn (tránh triệt tiêu), vector riêng tương ứng (λ - d, c)
+    lam = d + (p + np.copysign(np.sqrt(disc), p) if p != 0 else np.sqrt(disc))
+    u = np.array([lam - d, c])
+    if np.linalg.norm(u) == 0.0:
+        u = np.array([b, lam - a])
+    norm_u = np.linalg.norm(u)
+    if norm_u == 0.0:
+        H[k + 1, k] = 0.0
+        return True
+    cs, sn = u / norm_u
+    G = np.array([[cs, -sn], [sn, cs]])
+    # H ← GᵀHG, Z ← ZG; cột đầu của G là vector riêng nên H[k+1, k] = 0
+    H[k:k + 2, k:] = G.T @ H[k:k + 2, k:]
+    H[:k + 2, k:k + 2] = H[:k + 2, k:k + 2] @ G
+    if Z is not None:
+        Z[:, k:k + 2] = Z[:, k:k + 2] @ G
+    H[k + 1, k] = 0.0
+    return True
+
+def real_schur(H, Z, max_iter=None, steps=None, scale=1.0):
+    """
+    Đưa ma trận Hessenberg H về dạng Schur thực T = ZᵀAZ (tựa tam giác trên: các khối 1×1 và 2×2)
+    bằng lặp QR dịch chuyển kép Francis, tách (deflation) các trị riêng ở góc dưới khi phần tử dưới
+    đường chéo đủ nhỏ. H và Z được cập nhật tại chỗ (Z = None nếu không cần vector Schur).
+    scale: H là ma trận đã chia cho scale, chỉ dùng để ghi trị riêng theo đơn vị ban đầu vào steps.
+    Trả về tổng số lần quét.
+    """
+    n = H.shape[0]
+    eps = np.finfo(float).eps
+    if max_iter is None:
+        max_iter = QR_MAX_SWEEPS_PER_EIGENVALUE * max(n, 1)
+    total_sweeps = 0
+    sweeps = 0
+    hi = n - 1
+    while hi >= 0:
+        # Tìm lo: khối không tách được nhỏ nhất kết thúc ở hi
+        lo = hi
+        while lo > 0:
+            scale = abs(H[lo - 1, lo - 1]) + abs(H[lo, lo])
+            if scale == 0.0:
+                scale = np.abs(H[lo - 1:hi + 1, lo - 1:hi + 1]).sum()
+            if abs(H[lo, lo - 1]) <= eps * scale:
+                H[lo, lo - 1] = 0.0
+                break
+            lo -= 1
+
+        if lo == hi:
+            if steps is not None:
+                steps.append({'desc': f'Tách được trị riêng λ = {H[hi, hi] * scale:.6g} ở vị trí {hi + 1} sau {sweeps} lần quét.',
+                              'position': hi, 'sweeps': sweeps})
+            hi -= 1
+            sweeps = 0
+            continue
+        if lo == hi - 1:
+            is_real = _split_2x2(H, Z, hi - 1)
+            if steps is not None:
+                kind = 'hai trị riêng thực' if is_real else 'cặp trị riêng phức liên hợp'
+                steps.append({'desc': f'Tách được khối 2×2 ở vị trí {hi}-{hi + 1} ({kind}) sau {sweeps} lần quét.',
+                              'position': hi - 1, 'sweeps': sweeps})
+            hi -= 2
+            sweeps = 0
+            continue
+
+        if total_sweeps >= max_iter:
+            raise ValueError(f"Lặp QR không hội tụ sau {max_iter} lần quét.")
+        sweeps += 1
+        total_sweeps += 1
+        if sweeps % QR_EXCEPTIONAL_SHIFT_EVERY == 0:
+            # Dịch chuyển ngoại lệ (như EISPACK hqr) khi lặp bị mắc kẹt
+            s = abs(H[hi, hi - 1]) + abs(H[hi - 1, hi - 2])
+            shift_sum, shift_prod = 1.5 * s, s * s
+        else:
+            # Hai trị riêng của khối 2×2 góc dưới: tổng = vết, tích = định thức
+            shift_sum = H[hi - 1, hi - 1] + H[hi, hi]
+            shift_prod = H[hi - 1, hi - 1] * H[hi, hi] - H[hi - 1, hi] * H[hi, hi - 1]
+        _francis_sweep(H, Z, lo, hi, shift_sum, shift_prod)
+    return total_sweeps
+
+def _schur_eigenvalues(T):
+    """Trị riêng đọc từ các khối 1×1 và 2×2 trên đường chéo của dạng Schur thực."""
+    n = T.shape[0]
+    eigenvalues = np.empty(n, dtype=complex)
+    i = 0
+    while i < n:
+        if i < n - 1 and T[i + 1, i] != 0.0:
+            a, b, c, d = T[i, i], T[i, i + 1], T[i + 1, i], T[i + 1, i + 1]
+            p = 0.5 * (a - d)
+            im = np.sqrt(max(-(p * p + b * c), 0.0))
+            eigenvalues[i], eigenvalues[i + 1] = complex(d + p, im), complex(d + p, -im)
+            i += 2
+        else:
+            eigenvalues[i] = T[i, i]
+            i += 1
+    return eigenvalues
+
+def _schur_eigenvectors(T, Z):
+    """
+    Vector riêng từ dạng Schur: chuyển sang dạng Schur phức (tam giác trên), giải ngược
+    (T[:k,:k] - λₖI)y = -T[:k,k] cho mỗi trị riêng (tổng O(n³)), rồi x = Zy.
+    """
+    Tc, Zc = scipy.linalg.rsf2csf(T, Z)
+    n = Tc.shape[0]
+    eigenvalues = np.diag(Tc).copy()
+    # Ngưỡng tỉ lệ với ||T|| nhưng không nhỏ hơn số chuẩn hóa nhỏ nhất (T bằng 0 hoặc gần 0 thì eps·||T|| là số dưới chuẩn)
+    small = max(np.finfo(float).eps * np.abs(Tc).max(), np.finfo(float).tiny)
+    Y = np.zeros((n, n), dtype=complex)
+    for k in range(n):
+        Y[k, k] = 1.0
+        if k == 0:
+            continue
+        M = Tc[:k, :k] - eigenvalues[k] * np.eye(k)
+        # Trị riêng lặp: tránh chia cho 0 như LAPACK trevc
+        diag = np.diagonal(M).copy()
+        diag[np.abs(diag) < small] = small
+        M[np.diag_indices(k)] = diag
+        Y[:k, k] = scipy.linalg.solve_triangular(M, -Tc[:k, k], check_finite=False)
+    X = Zc @ Y
+    norms = np.linalg.norm(X, axis=0)
+    # Cột suy biến (chuẩn 0 hoặc không hữu hạn): dùng vector Schur tương ứng (vector đơn vị)
+    bad = ~np.isfinite(norms) | (norms == 0)
+    X[:, bad] = Zc[:, bad]
+    norms[bad] = 1.0
+    X /= norms
+    return eigenvalues, X
+
+def hessenberg_qr_eigen(A, compute_vectors=True, trace='full', engine='auto'):
+    """
+    Tìm tất cả trị riêng (và vector riêng) của A: rút gọn Householder về dạng Hessenberg, sau đó lặp QR
+    dịch chuyển kép Francis đến dạng Schur thực. Ổn định số và O(n³), không cần đa thức đặc trưng.
+    trace: mức lưu vết các bước ('none', 'summary', 'full').
+    engine: 'explicit' (cài đặt tường minh, có lưu vết từng lần tách trị riêng), 'lapack',
+    hoặc 'auto' (tường minh khi n ≤ QR_EXPLICIT_MAX_N).
+    """
+    if engine not in QR_ENGINES:
+        raise ValueError(f"Engine '{engine}' không hợp lệ. Chỉ hỗ trợ: {', '.join(QR_ENGINES)}.")
+    A = np.asarray(A)
+    if A.ndim != 2 or A.shape[0] != A.shape[1]:
+        raise ValueError('Ma trận đầu vào phải là ma trận vuông.')
+    if np.iscomplexobj(A):
+        raise ValueError('Phương pháp Hessenberg-QR chỉ hỗ trợ ma trận thực.')
+    A = A.astype(float)
+    if not np.all(np.isfinite(A)):
+        raise ValueError('Ma trận chứa giá trị không hữu hạn (NaN hoặc vô cùng).')
+    n = A.shape[0]
+    if engine == 'auto':
+        engine = 'explicit' if n <= QR_EXPLICIT_MAX_N else 'lapack'
+
+    steps = [] if trace != 'none' else None
+    if steps is not None:
+        steps.append({'desc': 'Ma trận ban đầu', 'matrix': trace_snapshot(A, trace)})
+
+    if engine == 'lapack':
+        return _hessenberg_qr_lapack(A, compute_vectors, trace, steps)
+
+    # Chia A cho lũy thừa của 2 gần max|aᵢⱼ| (phép chia chính xác, không sai số làm tròn) để các bình phương
+    # trong phản xạ Householder và dịch chuyển không tràn số / dưới tràn với ma trận rất lớn hoặc rất nhỏ
+    scale = _power_of_two_scale(A)
+    H, Z = hessenberg_reduction(A / scale, calc_q=compute_vectors)
+    if steps is not None:
+        steps.append({'desc': 'Ma trận Hessenberg H = QᵀAQ (phản xạ Householder)', 'matrix': trace_snapshot(H * scale, trace)})
+
+    total_sweeps = real_schur(H, Z, steps=steps, scale=scale)
+    T = np.triu(H, -1)
+
+    if compute_vectors:
+        eigenvalues, X = _schur_eigenvectors(T, Z)
+        eigenvectors = [X[:, [k]] for k in range(n)]
+    else:
+        eigenvalues = _schur_eigenvalues(T)
+        eigenvectors = None
+    T *= scale
+    eigenvalues *= scale
+    if steps is not None:
+        steps.append({'desc': f'Dạng Schur thực T = ZᵀAZ sau {total_sweeps} lần quét QR', 'matrix': trace_snapshot(T, trace)})
+
+    return {
+        'status': 'success',
+        'engine': 'explicit',
+        'eigenvalues': eigenvalues,
+        'eigenvectors': eigenvectors,
+        'schur_matrix': T,
+        'sweeps': total_sweeps,
+        'steps': steps if steps is not None else []
+    }
+
+def _hessenberg_qr_lapack(A, compute_vectors, trace, steps):
+    if steps is not None:
+        H = scipy.linalg.hessenberg(A) if trace == 'full' else None
+        steps.append({'desc': 'Ma trận Hessenberg H = QᵀAQ (phản xạ Householder, LAPACK dgehrd)', 'matrix': H})
+    if compute_vectors:
+        eigenvalues, X = scipy.linalg.eig(A, check_finite=False)
+        eigenvectors = [X[:, [k]] for k in range(X.shape[1])]
+    else:
+        eigenvalues = scipy.linalg.eigvals(A, check_finite=False)
+        eigenvectors = None
+    if steps is not None:
+        steps.append({'desc': 'Lặp QR dịch chuyển kép Francis đến dạng Schur thực (LAPACK dhseqr).', 'matrix': None})
+    return {
+        'status': 'success',
+        'engine': 'lapack',
+        'eigenvalues': np.asarray(eigenvalues, dtype=complex),
+        'eigenvectors': eigenvectors,
+        'schur_matrix': None,
+        'sweeps': None,
+        'steps': steps if steps is not None else []
+    }
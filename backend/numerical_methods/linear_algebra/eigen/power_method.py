@@ -1,13 +1,65 @@
 # backend/numerical_methods/linear_algebra/eigen/power_method.py
+import warnings
 import numpy as np
+import scipy.linalg
+from backend.utils.helpers import trace_snapshot
+from backend.numerical_methods.linear_algebra.direct.factorization import get_square_lu_factorization, square_lu_solve_factored
 
-def power_method_single(A, x0=None, tol=1e-9, max_iter=100):
+POWER_ACCELERATIONS = ('none', 'rayleigh', 'shift_invert', 'aitken', 'wynn')
+# Với 'rayleigh', lặp lũy thừa cho đến khi phần dư ||Ax - λx|| ≤ RAYLEIGH_SWITCH_TOL·|λ| rồi mới chuyển sang
+# lặp thương Rayleigh, để lặp Rayleigh (hội tụ về trị riêng gần thương Rayleigh hiện tại) vẫn tìm trị riêng trội.
+RAYLEIGH_SWITCH_TOL = 1e-2
+# Số giá trị λ gần nhất dùng cho bảng ε của Wynn
+WYNN_WINDOW = 7
+# Ngưỡng ma trận A - σI coi như suy biến khi phân rã LU: phần tử trụ nhỏ nhất của U ≤ ngưỡng · phần tử trụ lớn nhất
+# (σ trùng trị riêng)
+SHIFT_INVERT_RANK_TOL = 1e-12
+
+def _aitken(seq):
+    # Ngoại suy Aitken Δ² từ ba giá trị cuối: λ - (Δλ)²/Δ²λ
+    if len(seq) < 3:
+        return seq[-1]
+    l0, l1, l2 = seq[-3:]
+    denom = l2 - 2 * l1 + l0
+    if denom == 0:
+        return l2
+    return l2 - (l2 - l1) ** 2 / denom
+
+def _wynn(seq):
+    # Thuật toán ε của Wynn trên các giá trị cuối; ước lượng là phần tử ở cột chẵn cao nhất của bảng
+    window = seq[-WYNN_WINDOW:]
+    prev = [0.0] * (len(window) + 1)
+    curr = list(window)
+    best = window[-1]
+    for col in range(1, len(window)):
+        nxt = []
+        for i in range(len(curr) - 1):
+            diff = curr[i + 1] - curr[i]
+            if diff == 0:
+                return best
+            nxt.append(prev[i + 1] + 1.0 / diff)
+        prev, curr = curr, nxt
+        if col % 2 == 0:
+            best = curr[-1]
+    return best
+
+def power_method_single(A, x0=None, tol=1e-9, max_iter=100, trace='full', acceleration='none', shift=None):
     """
     Tìm giá trị riêng trội và vector riêng tương ứng của ma trận A.
+    trace: mức lưu vết các bước lặp ('none', 'summary', 'full').
+    acceleration:
+    - 'none': lặp lũy thừa, λ là thương Rayleigh xᵀ(Ax) dùng lại tích Ax của bước lặp (tốc độ |λ₂/λ₁|).
+    - 'rayleigh': lặp thương Rayleigh (giải (A - λI)y = x mỗi bước, hội tụ bậc ba với A đối xứng).
+    - 'shift_invert': lặp trên (A - σI)⁻¹ với phân rã LU được lưu trong bộ nhớ đệm phân rã; tìm trị riêng
+      gần σ = shift nhất (mặc định σ = 0: trị riêng có trị tuyệt đối nhỏ nhất).
+    - 'aitken' / 'wynn': lặp lũy thừa, kiểm tra hội tụ trên dãy λ đã ngoại suy (Aitken Δ² / ε của Wynn),
+      đồng thời yêu cầu phần dư ||Ax - λx|| ≤ tol·max(|λ|, 1) để vector riêng trả về cũng đã hội tụ.
     """
     n = A.shape[0]
     if A.shape[0] != A.shape[1]:
         raise ValueError("Ma trận phải là ma trận vuông.")
+    if acceleration not in POWER_ACCELERATIONS:
+        raise ValueError(f"Kiểu tăng tốc '{acceleration}' không hợp lệ. Chỉ hỗ trợ: {', '.join(POWER_ACCELERATIONS)}.")
 
     if x0 is not None:
         x = np.array(x0, dtype=float).reshape((n, 1))
@@ -17,8 +69,13 @@ def power_method_single(A, x0=None, tol=1e-9, max_iter=100):
         x = np.ones((n, 1), dtype=float)
     x = x / np.linalg.norm(x)
 
+    if acceleration == 'shift_invert':
+        return _shift_invert(A, x, 0.0 if shift is None else float(shift), tol, max_iter, trace)
+
     steps = []
-    lambda_old = 0.0
+    lambdas = []
+    estimate_old = None
+    use_rqi = False
 
     for i in range(max_iter):
         Ax = A @ x
@@ -29,35 +86,127 @@ def power_method_single(A, x0=None, tol=1e-9, max_iter=100):
                 "status": "success_zero",
                 "eigenvalue": 0.0,
                 "eigenvector": x,
-                "steps": steps
+                "steps": steps,
+                "acceleration": acceleration
+            }
+
+        # Thương Rayleigh của x (||x|| = 1), dùng lại Ax thay vì tính thêm A·x_new
+        lambda_new = float(x.T @ Ax)
+        lambdas.append(lambda_new)
+        if acceleration == 'aitken':
+            estimate = _aitken(lambdas)
+        elif acceleration == 'wynn':
+            estimate = _wynn(lambdas)
+        else:
+            estimate = lambda_new
+
+        residual = None
+        if acceleration in ('rayleigh', 'aitken', 'wynn'):
+            # Phần dư ||Ax - λx|| (dùng lại Ax): với 'rayleigh' là tiêu chí chuyển sang lặp Rayleigh và tiêu chí dừng,
+            # với 'aitken'/'wynn' là tiêu chí hội tụ của vector (λ ngoại suy hội tụ sớm hơn vector)
+            residual = float(np.linalg.norm(Ax - lambda_new * x))
+        if acceleration == 'rayleigh':
+            if not use_rqi:
+                use_rqi = residual <= RAYLEIGH_SWITCH_TOL * abs(lambda_new)
+
+        if use_rqi:
+            if residual <= tol * max(abs(lambda_new), 1.0):
+                # λ đã là trị riêng (A - λI gần suy biến), không giải thêm
+                x_new = x
+            else:
+                with warnings.catch_warnings():
+                    # A - λI càng gần suy biến khi λ hội tụ, nhưng hướng của nghiệm vẫn chính xác
+                    warnings.simplefilter('ignore', scipy.linalg.LinAlgWarning)
+                    try:
+                        y = scipy.linalg.solve(A - lambda_new * np.eye(n), x, check_finite=False)
+                    except np.linalg.LinAlgError:
+                        y = x
+                x_new = y / np.linalg.norm(y)
+                if not np.all(np.isfinite(x_new)):
+                    x_new = x
+        else:
+            x_new = Ax / norm_Ax
+
+        if trace != 'none':
+            step = {
+                'k': i + 1,
+                'x_k': trace_snapshot(x, trace),
+                'Ax_k': trace_snapshot(Ax, trace),
+                'lambda_k': lambda_new
+            }
+            if acceleration in ('aitken', 'wynn'):
+                step['lambda_extrapolated'] = estimate
+                step['residual'] = residual
+            if acceleration == 'rayleigh':
+                step['rayleigh'] = use_rqi
+                step['residual'] = residual
+            steps.append(step)
+
+        vector_converged = acceleration not in ('aitken', 'wynn') or residual <= tol * max(abs(lambda_new), 1.0)
+        if (use_rqi and x_new is x) or (estimate_old is not None and np.abs(estimate - estimate_old) < tol and vector_converged):
+            # Với lặp lũy thừa, x_new = Ax/||Ax|| là vector tốt nhất hiện có
+            eigenvector = x if use_rqi else x_new
+            return {
+                "status": "success",
+                "eigenvalue": estimate,
+                "eigenvector": eigenvector,
+                "steps": steps,
+                "iterations": i + 1,
+                "acceleration": acceleration
             }
-            
-        x_new = Ax / norm_Ax
-        lambda_new = float(x_new.T @ A @ x_new)
-
-        steps.append({
-            'k': i + 1,
-            'x_k': x,
-            'Ax_k': Ax,
-            'lambda_k': lambda_new
-        })
-
-        if np.abs(lambda_new - lambda_old) < tol:
+
+        estimate_old = estimate
+        x = x_new
+
+    raise ValueError(f"Phương pháp không hội tụ sau {max_iter} lần lặp.")
+
+def _shift_invert(A, x, sigma, tol, max_iter, trace):
+    # Lặp lũy thừa trên (A - σI)⁻¹: mỗi bước chỉ hai phép thế tam giác với phân rã LU đã lưu
+    n = A.shape[0]
+    _, factorization, cached = get_square_lu_factorization(A - sigma * np.eye(n), SHIFT_INVERT_RANK_TOL)
+    if factorization["singular"]:
+        raise ValueError(f"Ma trận A - σI suy biến (σ = {sigma:g} là trị riêng của A). Hãy chọn độ dịch σ khác.")
+
+    steps = []
+    lambda_old = None
+    for i in range(max_iter):
+        y = square_lu_solve_factored(factorization, x)
+        # Thương Rayleigh của (A - σI)⁻¹: μ = xᵀy, trị riêng tương ứng của A là σ + 1/μ
+        mu = float(x.T @ y)
+        norm_y = np.linalg.norm(y)
+        if norm_y == 0:
+            raise ValueError("Phương pháp lũy thừa nghịch đảo dịch chuyển thất bại ((A - σI)⁻¹x = 0).")
+        # (A - σI)⁻¹ không xác định dấu thì μ có thể bằng 0 ở một bước trung gian: bỏ qua việc cập nhật λ ở bước này
+        lambda_new = sigma + 1.0 / mu if mu != 0 else None
+        x_new = y / norm_y
+
+        if trace != 'none':
+            steps.append({
+                'k': i + 1,
+                'x_k': trace_snapshot(x, trace),
+                'Ax_k': trace_snapshot(y, trace),
+                'lambda_k': lambda_new
+            })
+
+        if lambda_new is not None and lambda_old is not None and np.abs(lambda_new - lambda_old) < tol:
             return {
                 "status": "success",
                 "eigenvalue": lambda_new,
                 "eigenvector": x_new,
                 "steps": steps,
-                "iterations": i + 1
+                "iterations": i + 1,
+                "acceleration": "shift_invert",
+                "shift": sigma,
+                "factorization_cached": cached
             }
-            
-        lambda_old = lambda_new
+        if lambda_new is not None:
+            lambda_old = lambda_new
         x = x_new
 
     raise ValueError(f"Phương pháp không hội tụ sau {max_iter} lần lặp.")
 
 
-def power_method_deflation(A, num_values=None, x0=None, tol=1e-6, max_iter=100):
+def power_method_deflation(A, num_values=None, x0=None, tol=1e-6, max_iter=100, trace='full'):
     """
     Tìm nhiều giá trị riêng bằng phương pháp Lũy thừa kết hợp Xuống thang (Hotelling's deflation).
     """
@@ -76,7 +225,7 @@ def power_method_deflation(A, num_values=None, x0=None, tol=1e-6, max_iter=100):
         initial_vector = x0 if s == 0 else None
         
         try:
-            result = power_method_single(A_current, x0=initial_vector, tol=tol, max_iter=max_iter)
+            result = power_method_single(A_current, x0=initial_vector, tol=tol, max_iter=max_iter, trace=trace)
         except ValueError as e:
             # Dừng nếu ma trận con không hội tụ
             break 
@@ -97,11 +246,12 @@ def power_method_deflation(A, num_values=None, x0=None, tol=1e-6, max_iter=100):
 
         eigen_pairs.append({'eigenvalue': lambda_val, 'eigenvector': v})
         
-        all_steps.append({
-            "eigenvalue_index": s + 1,
-            "matrix_before_deflation": A_current.copy(),
-            "iteration_details": result['steps']
-        })
+        if trace != 'none':
+            all_steps.append({
+                "eigenvalue_index": s + 1,
+                "matrix_before_deflation": trace_snapshot(A_current, trace),
+                "iteration_details": result['steps']
+            })
         
         # Thực hiện xuống thang Hotelling
         A_current = A_current - lambda_val * (v @ v.T)
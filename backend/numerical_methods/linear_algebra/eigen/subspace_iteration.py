@@ -0,0 +1,94 @@
+# backend/numerical_methods/linear_algebra/eigen/subspace_iteration.py
+import numpy as np
+import scipy.linalg
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+from backend.utils.helpers import trace_snapshot
+
+# Số vector "dự phòng" thêm vào khối: tốc độ hội tụ của trị riêng thứ i là |λ_{p+1} / λ_i| với p là kích thước khối
+SUBSPACE_OVERSAMPLING = 5
+
+def _is_symmetric(A):
+    if sp.issparse(A):
+        diff = spla.norm(A - A.T, 'fro')
+        return diff <= 1e-12 * max(spla.norm(A, 'fro'), 1.0)
+    return np.allclose(A, A.T, rtol=1e-12, atol=1e-14)
+
+def _rayleigh_ritz(Q, Z, symmetric):
+    # Chiếu A lên không gian con span(Q): H = QᵀAQ với Z = AQ; sắp xếp trị Ritz theo |θ| giảm dần
+    H = Q.T @ Z
+    if symmetric:
+        theta, W = scipy.linalg.eigh(0.5 * (H + H.T))
+    else:
+        theta, W = scipy.linalg.eig(H)
+        if np.all(np.abs(theta.imag) <= 1e-14 * max(np.abs(theta).max(), 1.0)):
+            theta, W = theta.real, W.real
+    order = np.argsort(-np.abs(theta), kind='stable')
+    return theta[order], W[:, order]
+
+def subspace_iteration(A, num_values=None, x0=None, tol=1e-6, max_iter=100, trace='full', seed=0):
+    """
+    Lặp không gian con (lặp lũy thừa theo khối) kèm chiếu Rayleigh-Ritz: tìm đồng thời num_values trị riêng
+    có trị tuyệt đối lớn nhất cùng vector riêng, không cần xuống thang.
+    Mỗi lần lặp chỉ gồm một phép nhân A với khối p vector (A đặc hoặc thưa), một phân rã QR (n×p)
+    và một bài toán trị riêng nhỏ p×p.
+    Dừng khi mọi cặp (θᵢ, yᵢ) cần tìm có phần dư ||Ayᵢ - θᵢyᵢ|| ≤ tol·max(|θᵢ|, 1).
+    trace: mức lưu vết các lần lặp ('none', 'summary', 'full').
+    """
+    if A.shape[0] != A.shape[1]:
+        raise ValueError("Ma trận phải là ma trận vuông.")
+    n = A.shape[0]
+    if sp.issparse(A):
+        A = A.tocsr().astype(float)
+    else:
+        A = np.asarray(A, dtype=float)
+    k = num_values if num_values is not None and 0 < num_values <= n else n
+    p = min(n, k + SUBSPACE_OVERSAMPLING)
+    symmetric = _is_symmetric(A)
+
+    X = np.random.default_rng(seed).standard_normal((n, p))
+    if x0 is not None:
+        x0 = np.asarray(x0, dtype=float).reshape(-1)
+        if x0.size != n:
+            raise ValueError(f"Vector khởi đầu phải có {n} phần tử.")
+        if np.linalg.norm(x0) > 0:
+            X[:, 0] = x0
+    Q, _ = np.linalg.qr(X)
+    Z = np.asarray(A @ Q)
+
+    steps = []
+    for it in range(1, max_iter + 1):
+        theta, W = _rayleigh_ritz(Q, Z, symmetric)
+        Y = Q @ W[:, :k]
+        R = Z @ W[:, :k] - Y * theta[:k]
+        residuals = np.linalg.norm(R, axis=0)
+        scale = np.maximum(np.abs(theta[:k]), 1.0)
+        converged = int(np.sum(residuals <= tol * scale))
+
+        if trace != 'none':
+            steps.append({
+                'k': it,
+                'ritz_values': theta[:k].copy(),
+                'residuals': residuals,
+                'converged': converged,
+                'basis': trace_snapshot(Y, trace)
+            })
+
+        if converged == k:
+            Y = Y / np.linalg.norm(Y, axis=0)
+            return {
+                "status": "success",
+                "mode": "subspace",
+                "symmetric": bool(symmetric),
+                "block_size": p,
+                "eigen_pairs": [{'eigenvalue': theta[i], 'eigenvector': Y[:, [i]]} for i in range(k)],
+                "residuals": residuals,
+                "iterations": it,
+                "steps": steps
+            }
+
+        # Bước lũy thừa theo khối: Q ← qr(AQ), tính sẵn AQ cho phép chiếu ở lần lặp sau
+        Q, _ = np.linalg.qr(Z)
+        Z = np.asarray(A @ Q)
+
+    raise ValueError(f"Lặp không gian con không hội tụ sau {max_iter} lần lặp ({converged}/{k} cặp trị riêng đạt sai số).")
@@ -1,10 +1,69 @@
 # backend/numerical_methods/linear_algebra/eigen/svd.py
 import numpy as np
-from backend.utils.helpers import zero_small
+from backend.utils.helpers import zero_small, trace_snapshot
 
-def svd_power_deflation(A, num_singular=None, max_iter=20, tol=1e-15, y_init=None):
+SVD_ALGORITHMS = ('full', 'randomized')
+# Tham số của SVD ngẫu nhiên (Halko–Martinsson–Tropp): số cột phác họa thêm ngoài hạng cần tìm
+# và số lần lặp lũy thừa (AAᵀ)^q, giúp phổ suy giảm nhanh hơn khi các giá trị kỳ dị giảm chậm
+RSVD_OVERSAMPLING = 10
+RSVD_POWER_ITERS = 4
+# Hạng phác họa ban đầu khi chưa biết trước hạng (chế độ ngưỡng / chặn sai số); mỗi lần không đủ thì nhân đôi
+RSVD_INITIAL_RANK = 16
+
+def randomized_svd(A, rank, oversampling=RSVD_OVERSAMPLING, power_iters=RSVD_POWER_ITERS, seed=0):
+    """
+    SVD rút gọn ngẫu nhiên (Halko–Martinsson–Tropp) với l = rank + oversampling cột phác họa:
+    1. Y = (AAᵀ)^q·AΩ với Ω ngẫu nhiên n×l, trực chuẩn hóa lại (QR) sau mỗi phép nhân để giữ ổn định;
+    2. Q = qr(Y) là cơ sở trực chuẩn xấp xỉ miền giá trị của A;
+    3. SVD của ma trận nhỏ B = QᵀA (l×n): B = ŨΣVᵀ, suy ra A ≈ (QŨ)ΣVᵀ.
+    Chi phí O(mnl) và bộ nhớ O((m + n)l), không tạo AᵀA nên không bình phương số điều kiện.
+    Trả về (U, s, Vt) gồm l thành phần (hoặc SVD đầy đủ nếu l ≥ min(m, n)).
+    """
+    m, n = A.shape
+    l = rank + oversampling
+    if l >= min(m, n):
+        return np.linalg.svd(A, full_matrices=False)
+
+    Omega = np.random.default_rng(seed).standard_normal((n, l))
+    Q, _ = np.linalg.qr(A @ Omega)
+    for _ in range(power_iters):
+        Z, _ = np.linalg.qr(A.T @ Q)
+        Q, _ = np.linalg.qr(A @ Z)
+    B = Q.T @ A
+    U_b, s, Vt = np.linalg.svd(B, full_matrices=False)
+    return Q @ U_b, s, Vt
+
+def svd_randomized(A, num_singular=None, oversampling=RSVD_OVERSAMPLING, power_iters=RSVD_POWER_ITERS, seed=0, trace='full'):
+    """
+    Tính num_singular giá trị kỳ dị lớn nhất cùng các vector kỳ dị bằng SVD ngẫu nhiên,
+    thay cho lũy thừa + xuống thang trên AᵀA.
+    trace: với 'none' không trả về thông tin phác họa.
+    """
+    A = np.asarray(A, dtype=float)
+    if A.size == 0:
+        raise ValueError("Ma trận đầu vào không được rỗng.")
+    m, n = A.shape
+    max_singular = min(m, n)
+    k = num_singular if num_singular is not None and num_singular > 0 else max_singular
+    k = min(k, max_singular)
+
+    U, s, Vt = randomized_svd(A, k, oversampling=oversampling, power_iters=power_iters, seed=seed)
+    sketch_size = min(k + oversampling, max_singular)
+    return {
+        "status": "success",
+        "U": U[:, :k], "Sigma_diag": s[:k], "Vt": Vt[:k, :],
+        "method": "Randomized SVD (Halko–Martinsson–Tropp)",
+        "intermediate_steps": {
+            'matrix_used_info': f"phác họa Y = (AAᵀ)^{power_iters}·AΩ với Ω ngẫu nhiên ({n}, {sketch_size})",
+            'sketch_size': sketch_size,
+            'power_iters': power_iters
+        } if trace != 'none' else None
+    }
+
+def svd_power_deflation(A, num_singular=None, max_iter=20, tol=1e-15, y_init=None, trace='full'):
     """
     Tính SVD của ma trận A bằng phương pháp power method + deflation.
+    trace: mức lưu vết các bước ('none', 'summary', 'full').
     """
     A = np.array(A, dtype=float)
     m, n = A.shape
@@ -19,7 +78,7 @@ def svd_power_deflation(A, num_singular=None, max_iter=20, tol=1e-15, y_init=Non
         vector_size = m
         use_ATA = False
         
-    Matrix_work_original = Matrix_work.copy()
+    Matrix_work_original = trace_snapshot(Matrix_work, trace)
     singular_values = []
     vectors = []
     steps = []
@@ -38,9 +97,9 @@ def svd_power_deflation(A, num_singular=None, max_iter=20, tol=1e-15, y_init=Non
             y = np.random.rand(vector_size, 1)
             y = y / np.linalg.norm(y)
             
-        y_steps = [y.copy()]
+        y_steps = [trace_snapshot(y, trace)]
         lambda_steps = []
-        matrix_before_deflation = Matrix_work.copy()
+        matrix_before_deflation = trace_snapshot(Matrix_work, trace)
         
         lambda_val = 0.0
         for i in range(max_iter):
@@ -54,7 +113,7 @@ def svd_power_deflation(A, num_singular=None, max_iter=20, tol=1e-15, y_init=Non
             lambda_new = float(y_new.T @ Matrix_work @ y_new)
             
             y = y_new
-            y_steps.append(y.copy())
+            y_steps.append(trace_snapshot(y, trace))
             lambda_steps.append(lambda_new)
             
             if i > 0 and abs(lambda_steps[-1] - lambda_steps[-2]) < tol:
@@ -72,16 +131,17 @@ def svd_power_deflation(A, num_singular=None, max_iter=20, tol=1e-15, y_init=Non
         # Deflation
         Matrix_work = Matrix_work - lambda_val * (y @ y.T)
         
-        steps.append({
-            'singular_index': s + 1,
-            'matrix_before_deflation': matrix_before_deflation,
-            'matrix_after_deflation': Matrix_work.copy(),
-            'lambda_steps': lambda_steps,
-            'y_steps': y_steps,
-            'eigenvalue': lambda_val,
-            'singular_value': singular,
-            'eigenvector': y,
-        })
+        if trace != 'none':
+            steps.append({
+                'singular_index': s + 1,
+                'matrix_before_deflation': matrix_before_deflation,
+                'matrix_after_deflation': trace_snapshot(Matrix_work, trace),
+                'lambda_steps': lambda_steps,
+                'y_steps': y_steps if trace == 'full' else None,
+                'eigenvalue': lambda_val,
+                'singular_value': singular,
+                'eigenvector': trace_snapshot(y, trace),
+            })
 
     if not singular_values:
         raise ValueError('Không thể tìm được giá trị kỳ dị nào với các tham số đã cho.')
@@ -102,10 +162,10 @@ def svd_power_deflation(A, num_singular=None, max_iter=20, tol=1e-15, y_init=Non
         "U": U, "Sigma_diag": Sigma_diag, "Vt": V.T,
         "method": "Power Method & Deflation",
         "intermediate_steps": {
-            'matrix_used_info': f"{'AᵀA' if use_ATA else 'AAᵀ'} (kích thước {Matrix_work_original.shape})",
+            'matrix_used_info': f"{'AᵀA' if use_ATA else 'AAᵀ'} (kích thước {Matrix_work.shape})",
             'original_matrix': Matrix_work_original,
             'steps': steps
-        }
+        } if trace != 'none' else None
     }
 
 def svd_numpy(A):
@@ -124,23 +184,59 @@ def svd_numpy(A):
         "intermediate_steps": None
     }
 
-def calculate_svd_approximation(A, method='rank-k', **kwargs):
+def _randomized_svd_adaptive(A, enough, max_rank):
+    # Nhân đôi hạng phác họa cho đến khi enough(s, l) đúng với l giá trị kỳ dị đầu, hoặc đã là SVD đầy đủ
+    l = min(RSVD_INITIAL_RANK, max_rank)
+    while True:
+        U, s, Vt = randomized_svd(A, l)
+        if len(s) >= max_rank or enough(s, l):
+            return U, s, Vt
+        l = min(2 * l, max_rank)
+
+def calculate_svd_approximation(A, method='rank-k', trace='full', algorithm='full', **kwargs):
     """
     Tính toán xấp xỉ ma trận A bằng SVD dựa trên các phương pháp khác nhau.
+    trace: với 'none' không trả về ma trận gốc và ma trận sai số, chỉ trả về ma trận xấp xỉ.
+    algorithm: 'full' dùng SVD đầy đủ; 'randomized' chỉ tính các thành phần cần thiết bằng SVD ngẫu nhiên
+    (hạng phác họa tăng dần với chế độ ngưỡng / chặn sai số). Khi đó sai số được tính theo
+    ||A - A_k||²_F = ||A||²_F - Σσᵢ² (A_k là hình chiếu của A lên span(U_k)), các thành phần bị loại bỏ
+    và hạng gốc chỉ tính trên các giá trị kỳ dị đã phác họa.
     """
     try:
         A = np.array(A, dtype=float)
         if A.ndim != 2:
             return {"success": False, "error": "Đầu vào phải là một ma trận 2D."}
+        if algorithm not in SVD_ALGORITHMS:
+            return {"success": False, "error": f"Thuật toán SVD '{algorithm}' không hợp lệ. Chỉ hỗ trợ: {', '.join(SVD_ALGORITHMS)}."}
 
-        U, s, Vt = np.linalg.svd(A, full_matrices=False)
-        original_rank = np.sum(s > 1e-10)
-        
         A_norm = np.linalg.norm(A)
+        max_rank = min(A.shape)
+        randomized = algorithm == 'randomized'
+
+        if not randomized:
+            U, s, Vt = np.linalg.svd(A, full_matrices=False)
+        elif method == 'rank-k':
+            k = int(kwargs.get('k', 1))
+            if k > max_rank or k < 1:
+                return {"success": False, "error": f"Hạng k phải nằm trong khoảng [1, {max_rank}]."}
+            U, s, Vt = randomized_svd(A, k)
+        elif method == 'threshold':
+            threshold = float(kwargs.get('threshold', 0.1))
+            U, s, Vt = _randomized_svd_adaptive(A, lambda s, l: s[l - 1] < threshold, max_rank)
+        elif method == 'error-bound':
+            target = (float(kwargs.get('error_bound', 0.01)) * A_norm) ** 2
+            U, s, Vt = _randomized_svd_adaptive(A, lambda s, l: A_norm ** 2 - np.sum(s[:l] ** 2) < target, max_rank)
+        else:
+            U, s, Vt = randomized_svd(A, 1)
+        original_rank = np.sum(s > 1e-10)
 
         k = 0
         method_used = ""
         info = {}
+        if randomized:
+            info['algorithm'] = 'randomized'
+            info['computed_singular_values'] = len(s)
+            info['original_rank_is_lower_bound'] = bool(len(s) < max_rank and original_rank == len(s))
 
         if method == 'rank-k':
             k = int(kwargs.get('k', 1))
@@ -164,6 +260,12 @@ def calculate_svd_approximation(A, method='rank-k', **kwargs):
 
             if A_norm == 0:
                 k = 0
+            elif randomized:
+                # Phần năng lượng còn lại sau k thành phần: ||A||²_F - Σ_{i≤k} σᵢ²
+                target_absolute_error_norm_sq = (relative_error_bound * A_norm) ** 2
+                tail = A_norm ** 2 - np.cumsum(s ** 2)
+                below = np.flatnonzero(tail < target_absolute_error_norm_sq)
+                k = int(below[0]) + 1 if below.size else len(s)
             else:
                 target_absolute_error_norm_sq = (relative_error_bound * A_norm) ** 2
                 
@@ -179,13 +281,19 @@ def calculate_svd_approximation(A, method='rank-k', **kwargs):
                 
                 if k == 0: k = 1
 
-        A_approx = np.dot(U[:, :k], np.dot(np.diag(s[:k]), Vt[:k, :]))
+        A_approx = np.dot(U[:, :k] * s[:k], Vt[:k, :])
 
-        error_matrix = A - A_approx
-        absolute_error = np.linalg.norm(error_matrix)
+        if randomized and trace == 'none':
+            # Không tạo ma trận sai số m×n: A_k là hình chiếu trực giao của A nên ||A - A_k||²_F = ||A||²_F - Σσᵢ²
+            error_matrix = None
+            absolute_error = np.sqrt(max(A_norm ** 2 - np.sum(s[:k] ** 2), 0.0))
+        else:
+            error_matrix = A - A_approx
+            absolute_error = np.linalg.norm(error_matrix)
         relative_error = (absolute_error / A_norm) * 100 if A_norm > 0 else 0
 
-        total_energy = np.sum(s**2)
+        # Với SVD ngẫu nhiên, tổng năng lượng là ||A||²_F (gồm cả các giá trị kỳ dị không được phác họa)
+        total_energy = A_norm ** 2 if randomized else np.sum(s**2)
         retained_energy = np.sum(s[:k]**2)
         info['energy_ratio'] = (retained_energy / total_energy) * 100 if total_energy > 0 else 100
         
@@ -195,9 +303,9 @@ def calculate_svd_approximation(A, method='rank-k', **kwargs):
         return {
             "success": True,
             "method_used": method_used,
-            "original_matrix": A.tolist(),
+            "original_matrix": A.tolist() if trace != 'none' else None,
             "approximated_matrix": A_approx.tolist(),
-            "error_matrix": error_matrix.tolist(),
+            "error_matrix": error_matrix.tolist() if trace != 'none' else None,
             "original_rank": int(original_rank),
             "effective_rank": int(k),
             "absolute_error": float(absolute_error),
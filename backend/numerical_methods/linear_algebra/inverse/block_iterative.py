@@ -0,0 +1,173 @@
+# backend/numerical_methods/linear_algebra/inverse/block_iterative.py
+# Chức năng: Lặp Jacobi / Gauss-Seidel theo khối cho hệ nhiều vế phải AX = B (dùng để tính A⁻¹ với B = I).
+# Mỗi cột của X được theo dõi hội tụ riêng: cột nào đã đạt sai số thì được cố định và loại khỏi
+# tập cột đang lặp, các cột còn lại được xử lý cùng lúc bằng phép nhân ma trận (BLAS-3).
+import numpy as np
+import scipy.linalg
+from backend.utils.helpers import zero_small, abs_row_sums, abs_col_sums, trace_snapshot
+from backend.numerical_methods.linear_algebra.iterative.gauss_seidel import _coefficients, _strict_upper_product
+
+BLOCK_ENGINES = ('standard', 'block')
+
+def parse_engine(value, default='standard'):
+    """
+    Kiểm tra và chuẩn hóa tham số engine lấy từ request.
+    Ném ra lỗi ValueError nếu giá trị không hợp lệ.
+    """
+    if value is None or str(value).strip() == '':
+        return default
+    engine = str(value).strip().lower()
+    if engine not in BLOCK_ENGINES:
+        raise ValueError(f"Engine '{value}' không hợp lệ. Chỉ hỗ trợ: {', '.join(BLOCK_ENGINES)}.")
+    return engine
+
+def _prepare(A, B, X0):
+    A = np.asarray(A, dtype=float)
+    n = A.shape[0]
+    if A.ndim != 2 or n != A.shape[1]:
+        raise ValueError("Ma trận A phải là ma trận vuông.")
+    B = np.asarray(B, dtype=float)
+    if B.ndim == 1:
+        B = B.reshape(-1, 1)
+    X0 = np.asarray(X0, dtype=float)
+    if X0.ndim == 1:
+        X0 = X0.reshape(-1, 1)
+    if B.shape[0] != n or X0.shape != B.shape:
+        raise ValueError("Kích thước của A, B và X₀ không tương thích.")
+
+    diag_elements = np.diag(A)
+    if np.any(np.isclose(diag_elements, 0)):
+        raise ValueError("Ma trận có phần tử trên đường chéo chính bằng 0, không thể thực hiện phép lặp.")
+
+    diag_abs = np.abs(diag_elements)
+    row_sum_off_diag = abs_row_sums(A) - diag_abs
+    col_sum_off_diag = abs_col_sums(A) - diag_abs
+    is_row_dominant = bool(np.all(diag_abs > row_sum_off_diag))
+    is_col_dominant = bool(np.all(diag_abs > col_sum_off_diag))
+    if not is_row_dominant and not is_col_dominant:
+        raise ValueError("Ma trận không chéo trội hàng hoặc cột. Hội tụ không được đảm bảo.")
+    return A, B, X0, diag_elements, diag_abs, row_sum_off_diag, col_sum_off_diag, is_row_dominant, is_col_dominant
+
+def _column_norms(D, norm):
+    # Chuẩn vector (∞ hoặc 1) của từng cột
+    return np.max(np.abs(D), axis=0) if norm == np.inf else np.sum(np.abs(D), axis=0)
+
+def _block_iterate(step, B, X0, stopping_factor, norm, tol, max_iter, trace):
+    """
+    Vòng lặp chung: step(X_act, B_act) trả về X_{k+1} cho các cột đang lặp.
+    Sai số hậu nghiệm được đánh giá theo từng cột: stopping_factor · ||x_{k+1} - x_k||.
+    """
+    X = X0.copy()
+    active = np.arange(X.shape[1])
+    X_act = X.copy()
+    B_act = B
+    column_iterations = np.zeros(X.shape[1], dtype=int)
+    iterations_data = []
+
+    for i in range(max_iter):
+        X_next = step(X_act, B_act)
+        diff_norms = _column_norms(X_next - X_act, norm)
+        estimated_errors = stopping_factor * diff_norms
+        converged = estimated_errors < tol
+
+        if trace != 'none':
+            X[:, active] = X_next
+            iterations_data.append({
+                "k": i + 1,
+                "x_k": trace_snapshot(X, trace),
+                "error": float(np.max(estimated_errors)),
+                "diff_norm": float(np.max(diff_norms)),
+                "active_columns": int(active.size)
+            })
+
+        if np.all(converged):
+            X[:, active] = X_next
+            column_iterations[active] = i + 1
+            return X, i + 1, iterations_data, column_iterations
+
+        if np.any(converged):
+            # Cố định các cột đã hội tụ và thu gọn khối đang lặp
+            X[:, active[converged]] = X_next[:, converged]
+            column_iterations[active[converged]] = i + 1
+            keep = ~converged
+            active = active[keep]
+            X_act = np.ascontiguousarray(X_next[:, keep])
+            B_act = B[:, active]
+        else:
+            X_act = X_next
+
+    raise ValueError(f"Phương pháp không hội tụ sau {max_iter} lần lặp ({active.size} cột chưa hội tụ).")
+
+def block_jacobi(A, B, X0, tol=1e-5, max_iter=100, trace='full'):
+    """
+    Giải AX = B bằng lặp Jacobi theo khối: X_{k+1} = X_k - T(AX_k - B), T = D⁻¹.
+    Ma trận lặp B_J = I - TA không được tạo ra; mỗi bước chỉ cần một phép nhân A·X (BLAS-3)
+    trên các cột chưa hội tụ.
+    """
+    A, B, X0, diag_elements, diag_abs, row_off, col_off, is_row_dominant, is_col_dominant = _prepare(A, B, X0)
+    inv_diag = (1.0 / diag_elements).reshape(-1, 1)
+
+    # ||I - TA||∞ = max_i Σ_{j≠i}|a_ij| / |a_ii|,  ||I - AT||₁ = max_j Σ_{i≠j}|a_ij| / |a_jj|
+    if is_row_dominant:
+        norm, norm_used = np.inf, "infinity"
+        contraction_coefficient = float(np.max(row_off / diag_abs))
+        stopping_factor = contraction_coefficient / (1 - contraction_coefficient)
+    else:
+        norm, norm_used = 1, "1"
+        contraction_coefficient = float(np.max(col_off / diag_abs))
+        lambda_factor = np.max(diag_abs) / np.min(diag_abs)
+        stopping_factor = lambda_factor * contraction_coefficient / (1 - contraction_coefficient)
+
+    def step(X_act, B_act):
+        R = A @ X_act
+        R -= B_act
+        R *= inv_diag
+        return X_act - R
+
+    X, iterations, iterations_data, column_iterations = _block_iterate(
+        step, B, X0, stopping_factor, norm, tol, max_iter, trace
+    )
+    return {
+        "status": "success",
+        "solution": zero_small(X, tol),
+        "iterations": iterations,
+        "iterations_data": iterations_data,
+        "column_iterations": column_iterations,
+        "contraction_coefficient": contraction_coefficient,
+        "norm_used": norm_used,
+        "is_row_dominant": is_row_dominant,
+        "is_col_dominant": is_col_dominant,
+        "engine": "block"
+    }
+
+def block_gauss_seidel(A, B, X0, tol=1e-5, max_iter=100, trace='full'):
+    """
+    Giải AX = B bằng lặp Gauss-Seidel theo khối: (D + L)X_{k+1} = B - UX_k.
+    UX_k tính bằng dtrmm và hệ tam giác giải bằng trsm cho cả khối cột chưa hội tụ (BLAS-3).
+    """
+    A, B, X0, _, diag_abs, row_off, col_off, is_row_dominant, _ = _prepare(A, B, X0)
+
+    s, q, norm = _coefficients(A, diag_abs, row_off, col_off, is_row_dominant)
+    denominator = (1 - s) * (1 - q)
+    if np.isclose(denominator, 0):
+        raise ValueError(f"Hệ số q={q:.4f} hoặc s={s:.4f} không hợp lệ, gây lỗi chia cho 0.")
+    stopping_factor = q / denominator
+
+    def step(X_act, B_act):
+        return scipy.linalg.solve_triangular(A, B_act - _strict_upper_product(A, X_act), lower=True, check_finite=False)
+
+    X, iterations, iterations_data, column_iterations = _block_iterate(
+        step, B, X0, stopping_factor, norm, tol, max_iter, trace
+    )
+    return {
+        "status": "success",
+        "solution": zero_small(X, tol),
+        "iterations": iterations,
+        "iterations_data": iterations_data,
+        "column_iterations": column_iterations,
+        "coeff_q": q,
+        "coeff_s": s,
+        "norm_used": "infinity" if norm == np.inf else "1",
+        "is_row_dominant": is_row_dominant,
+        "engine": "block"
+    }
@@ -1,8 +1,29 @@
 # backend/numerical_methods/linear_algebra/inverse/bordering.py
 import numpy as np
-from backend.utils.helpers import zero_small
+from backend.utils.helpers import zero_small, trace_snapshot
 
-def bordering_inverse(A, tol=1e-15):
+def border_inverse_step(buf, k, u_k, v_k, a_kk, tol):
+    """
+    Một bước viền quanh, cập nhật tại chỗ: buf[:k, :k] chứa A_k⁻¹, sau bước này
+    buf[:k+1, :k+1] chứa nghịch đảo của A_{k+1} = [[A_k, u_k], [v_kᵀ, a_kk]]. Chi phí O(k²).
+    Trả về θ_k = a_kk - v_kᵀA_k⁻¹u_k; ném ra ValueError (không thay đổi buf) nếu θ_k ≈ 0.
+    """
+    inv_Ak = buf[:k, :k]
+    inv_Ak_u_k = inv_Ak @ u_k
+    v_k_T_inv_Ak = v_k @ inv_Ak
+
+    theta_k = a_kk - v_k @ inv_Ak_u_k
+    if abs(theta_k) < tol:
+        raise ValueError(f"Ma trận suy biến tại bước k={k+1} (theta ≈ 0).")
+
+    # B11 = A_k⁻¹ + (A_k⁻¹u_k)(v_kᵀA_k⁻¹)/θ, B12 = -A_k⁻¹u_k/θ, B21 = -v_kᵀA_k⁻¹/θ, B22 = 1/θ
+    inv_Ak += np.outer(inv_Ak_u_k / theta_k, v_k_T_inv_Ak)
+    buf[:k, k] = -inv_Ak_u_k / theta_k
+    buf[k, :k] = -v_k_T_inv_Ak / theta_k
+    buf[k, k] = 1.0 / theta_k
+    return float(theta_k)
+
+def bordering_inverse(A, tol=1e-15, trace='full'):
     """
     Tính ma trận nghịch đảo bằng phương pháp viền quanh.
     """
@@ -16,51 +37,35 @@ def bordering_inverse(A, tol=1e-15):
     if abs(A[0, 0]) < tol:
         raise ValueError("Phần tử A[0,0] bằng 0, không thể bắt đầu phương pháp viền quanh.")
     
-    inv_Ak = np.array([[1.0 / A[0, 0]]])
-    steps.append({
-        "k": 1,
-        "A_k": A[0,0],
-        "inv_A_k": inv_Ak
-    })
+    # Nghịch đảo của ma trận con cấp k nằm ở góc trên trái buf[:k, :k], được cập nhật tại chỗ
+    buf = np.empty((n, n), dtype=float)
+    buf[0, 0] = 1.0 / A[0, 0]
+    if trace != 'none':
+        steps.append({
+            "k": 1,
+            "A_k": A[0,0],
+            "inv_A_k": trace_snapshot(buf[:1, :1], trace)
+        })
 
     # Bước 2: Lặp từ cấp 2 đến n
     for k in range(1, n):
-        # Tách các khối từ ma trận A cấp k+1
-        u_k = A[:k, k].reshape(-1, 1)      # Cột viền
-        v_k_T = A[k, :k].reshape(1, -1)   # Hàng viền
-        a_kk = A[k, k]
-        
-        # Tính các thành phần trung gian
-        inv_Ak_u_k = inv_Ak @ u_k
-        v_k_T_inv_Ak = v_k_T @ inv_Ak
-        
-        theta_k = a_kk - (v_k_T @ inv_Ak_u_k)[0, 0]
-        if abs(theta_k) < tol:
-            raise ValueError(f"Ma trận suy biến tại bước k={k+1} (theta ≈ 0).")
-
-        # Tính các khối của ma trận nghịch đảo mới
-        B11 = inv_Ak + (inv_Ak_u_k @ v_k_T_inv_Ak) / theta_k
-        B12 = -inv_Ak_u_k / theta_k
-        B21 = -v_k_T_inv_Ak / theta_k
-        B22 = np.array([[1.0 / theta_k]])
+        # Cột viền u_k = A[:k, k], hàng viền v_kᵀ = A[k, :k]
+        theta_k = border_inverse_step(buf, k, A[:k, k], A[k, :k], A[k, k], tol)
 
-        # Ghép các khối lại
-        top_row = np.hstack((B11, B12))
-        bottom_row = np.hstack((B21, B22))
-        inv_Ak = np.vstack((top_row, bottom_row))
+        if trace != 'none':
+            steps.append({
+                "k": k + 1,
+                "theta": theta_k,
+                "inv_A_k": trace_snapshot(buf[:k + 1, :k + 1], trace)
+            })
 
-        steps.append({
-            "k": k + 1,
-            "theta": theta_k,
-            "inv_A_k": inv_Ak
-        })
-        
-    check_matrix = A @ inv_Ak
+    inv_Ak = buf
+    check_matrix = A @ inv_Ak if trace != 'none' else None
 
     return {
         "status": "success",
         "inverse": zero_small(inv_Ak, tol),
-        "check": zero_small(check_matrix, tol),
+        "check": zero_small(check_matrix, tol) if check_matrix is not None else None,
         "steps": steps,
         "num_vars": n
     }
\ No newline at end of file
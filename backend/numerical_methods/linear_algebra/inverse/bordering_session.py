@@ -0,0 +1,167 @@
+# backend/numerical_methods/linear_algebra/inverse/bordering_session.py
+# Chức năng: Phiên viền quanh tăng dần. Client gửi A một lần, sau đó thêm dần các hàng/cột mới
+# và nhận lại A⁻¹ đã cập nhật với chi phí O(n²) cho mỗi hàng/cột thay vì tính lại từ đầu O(n³).
+import threading
+import uuid
+import numpy as np
+from backend.utils.cache import LRUCache
+from backend.numerical_methods.linear_algebra.inverse.bordering import border_inverse_step
+
+# Các phiên được lưu trong bộ nhớ đệm LRU giới hạn số phiên, dung lượng và thời gian sống:
+# phiên không được dùng quá BORDERING_SESSION_TTL giây sẽ bị xóa.
+BORDERING_SESSION_CACHE_SIZE = 32
+BORDERING_SESSION_BYTES = 256 * 1024 * 1024
+BORDERING_SESSION_TTL = 15 * 60
+
+def _session_nbytes(session):
+    return session["A"].nbytes + session["inverse"].nbytes
+
+_sessions = LRUCache(
+    maxsize=BORDERING_SESSION_CACHE_SIZE,
+    max_bytes=BORDERING_SESSION_BYTES,
+    sizeof=_session_nbytes,
+    ttl=BORDERING_SESSION_TTL
+)
+
+def get_bordering_session_stats():
+    return _sessions.stats()
+
+def _session_result(session, thetas):
+    n = session["n"]
+    return {
+        "status": "success",
+        "session_id": session["id"],
+        "n": n,
+        "inverse": session["inverse"][:n, :n].copy(),
+        "thetas": thetas,
+        "appended": session["appended"],
+        "ttl": BORDERING_SESSION_TTL
+    }
+
+def _get_session(session_id):
+    session = _sessions.get(session_id)
+    if session is None:
+        raise KeyError(f"Phiên viền quanh '{session_id}' không tồn tại hoặc đã hết hạn. Hãy tạo phiên mới.")
+    return session
+
+def _fits_budget(size):
+    # Hai bộ đệm A và A⁻¹ (float64) kích thước size×size có vừa dung lượng cho phép không
+    return 2 * 8 * size * size <= _sessions.max_bytes
+
+def _too_large_message(size):
+    return (f"Ma trận {size}×{size} vượt quá dung lượng cho phép của phiên viền quanh "
+            f"({_sessions.max_bytes / 2 ** 20:g} MB).")
+
+def _ensure_capacity(session, size):
+    # Bộ đệm A và A⁻¹ được cấp phát dư (tăng gấp đôi) để mỗi lần thêm hàng/cột không phải sao chép lại toàn bộ
+    capacity = session["A"].shape[0]
+    if size <= capacity:
+        return
+    if not _fits_budget(size):
+        raise ValueError(_too_large_message(size))
+    # Nếu gấp đôi vượt dung lượng cho phép thì chỉ cấp phát vừa đủ
+    new_capacity = max(size, 2 * capacity)
+    if not _fits_budget(new_capacity):
+        new_capacity = size
+    n = session["n"]
+    old = {key: session[key] for key in ("A", "inverse")}
+    for key in ("A", "inverse"):
+        buf = np.empty((new_capacity, new_capacity), dtype=float)
+        buf[:n, :n] = session[key][:n, :n]
+        session[key] = buf
+    # Cập nhật lại dung lượng phiên trong bộ nhớ đệm; nếu không lưu được thì giữ bộ đệm cũ
+    if not _sessions.put(session["id"], session):
+        session.update(old)
+        raise ValueError(_too_large_message(size))
+
+def _append_border(session, U, V, D):
+    # Thêm lần lượt từng hàng/cột của khối viền [[A, U], [V, D]]; trả về các θ.
+    n = session["n"]
+    A, inverse = session["A"], session["inverse"]
+    k = D.shape[0]
+    A[:n, n:n + k] = U
+    A[n:n + k, :n] = V
+    A[n:n + k, n:n + k] = D
+    thetas = []
+    for j in range(k):
+        m = n + j
+        thetas.append(border_inverse_step(inverse, m, A[:m, m], A[m, :m], A[m, m], session["tol"]))
+    return thetas
+
+def create_bordering_session(A, tol=1e-15):
+    """
+    Tạo phiên viền quanh cho ma trận vuông A (tính A⁻¹ bằng viền quanh, O(n³)).
+    Trả về kết quả chứa session_id dùng cho các lần thêm hàng/cột tiếp theo.
+    """
+    A = np.asarray(A, dtype=float)
+    if A.ndim != 2 or A.shape[0] != A.shape[1]:
+        raise ValueError("Ma trận phải là ma trận vuông.")
+    if abs(A[0, 0]) < tol:
+        raise ValueError("Phần tử A[0,0] bằng 0, không thể bắt đầu phương pháp viền quanh.")
+
+    n = A.shape[0]
+    if not _fits_budget(n):
+        raise ValueError(_too_large_message(n))
+    session = {
+        "id": uuid.uuid4().hex,
+        "n": 1,
+        "tol": tol,
+        "A": np.empty((n, n), dtype=float),
+        "inverse": np.empty((n, n), dtype=float),
+        "appended": 0,
+        "lock": threading.Lock()
+    }
+    session["A"][0, 0] = A[0, 0]
+    session["inverse"][0, 0] = 1.0 / A[0, 0]
+    thetas = [float(A[0, 0])]
+    if n > 1:
+        thetas += _append_border(session, A[:1, 1:], A[1:, :1], A[1:, 1:])
+    session["n"] = n
+
+    if not _sessions.put(session["id"], session):
+        raise ValueError(_too_large_message(n))
+    return _session_result(session, thetas)
+
+def append_bordering_session(session_id, U, V, D):
+    """
+    Thêm k hàng/cột mới vào ma trận của phiên: A ← [[A, U], [V, D]] với U (n×k), V (k×n), D (k×k).
+    Cập nhật A⁻¹ bằng k bước viền quanh, mỗi bước O(n²). Nếu gặp θ ≈ 0 thì phiên giữ nguyên trạng thái cũ.
+    """
+    session = _get_session(session_id)
+    with session["lock"]:
+        n = session["n"]
+        D = np.atleast_2d(np.asarray(D, dtype=float))
+        k = D.shape[0]
+        if k == 0 or D.shape != (k, k):
+            raise ValueError("Khối góc D phải là ma trận vuông k×k (k ≥ 1).")
+        U = np.asarray(U, dtype=float)
+        V = np.asarray(V, dtype=float)
+        if U.size != n * k or V.size != k * n:
+            raise ValueError(f"Cột viền phải có {n}×{k} phần tử và hàng viền phải có {k}×{n} phần tử (n = {n}, k = {k}).")
+        if k == 1:
+            U, V = U.reshape(n, 1), V.reshape(1, n)
+        elif U.shape != (n, k) or V.shape != (k, n):
+            raise ValueError(f"Cột viền phải có kích thước {n}×{k} và hàng viền phải có kích thước {k}×{n}.")
+
+        _ensure_capacity(session, n + k)
+        # Với nhiều hàng/cột, lưu lại A⁻¹ hiện tại để khôi phục nếu một bước giữa chừng thất bại
+        backup = session["inverse"][:n, :n].copy() if k > 1 else None
+        try:
+            thetas = _append_border(session, U, V, D)
+        except ValueError:
+            if backup is not None:
+                session["inverse"][:n, :n] = backup
+            raise
+        session["n"] = n + k
+        session["appended"] += k
+        return _session_result(session, thetas)
+
+def get_bordering_session(session_id):
+    """Trả về A⁻¹ hiện tại của phiên."""
+    session = _get_session(session_id)
+    with session["lock"]:
+        return _session_result(session, [])
+
+def delete_bordering_session(session_id):
+    """Xóa phiên; trả về False nếu phiên không tồn tại (hoặc đã hết hạn)."""
+    return _sessions.pop(session_id) is not None
@@ -1,54 +1,46 @@
 # backend/numerical_methods/linear_algebra/inverse/cholesky_inverse.py
 import numpy as np
 import scipy.linalg
+from scipy.linalg import lapack
 from backend.utils.helpers import zero_small
+from backend.numerical_methods.linear_algebra.direct.cholesky import CHOLESKY_VARIANTS
+from backend.numerical_methods.linear_algebra.direct.factorization import (
+    get_cholesky_factorization, get_packed_cholesky_factorization,
+    get_ldlt_factorization, ldlt_solve_factored
+)
+from backend.utils.matrix_io import packed_order
 
-def cholesky_inverse(A, tol=1e-15):
+def cholesky_inverse(A, tol=1e-15, trace='full', variant='cholesky', packed=False):
     """
-    Tính ma trận nghịch đảo A⁻¹ bằng phương pháp Cholesky, tái sử dụng
-    logic phân rã đã có.
+    Tính ma trận nghịch đảo A⁻¹ bằng phương pháp Cholesky, dùng chung phân rã
+    (và bộ nhớ đệm phân rã) với solve_cholesky.
     - Nếu A không đối xứng, tính (AᵀA)⁻¹Aᵀ.
+    - variant='ldlt': A đối xứng không xác định dương, A⁻¹ tính từ A = LDLᵀ.
+    - packed=True: A là tam giác trên dạng gói, A⁻¹ cũng trả về dạng gói.
     """
+    if variant not in CHOLESKY_VARIANTS:
+        raise ValueError(f"Biến thể '{variant}' không hợp lệ. Chỉ hỗ trợ: {', '.join(CHOLESKY_VARIANTS)}.")
+    if packed:
+        if variant != 'cholesky':
+            raise ValueError("Lưu trữ dạng gói chỉ hỗ trợ phân rã Cholesky.")
+        return _cholesky_inverse_packed(A, tol)
     if A.shape[0] != A.shape[1]:
         raise ValueError("Ma trận phải là ma trận vuông.")
+    if variant == 'ldlt':
+        return _ldlt_inverse(A, tol, trace)
 
-    is_symmetric = np.allclose(A, A.T, atol=tol)
-    
-    M = A
-    transformation_message = "Ma trận A đối xứng, tiến hành phân tích Cholesky trực tiếp."
-    if not is_symmetric:
-        M = A.T @ A
-        transformation_message = "Ma trận A không đối xứng. Chuyển sang tính M = AᵀA."
+    # Bước 1: Phân rã Cholesky M = UᵀU (M = A hoặc AᵀA), pivot không dương => M không xác định dương
+    _, factorization, _ = get_cholesky_factorization(A, tol)
+    is_symmetric = factorization["is_symmetric"]
+    U = factorization["U"]
+    n = U.shape[0]
 
-    # Bước 1: Phân rã Cholesky: M = UᵀU (Tái sử dụng logic từ file cholesky.py)
-    try:
-        eigenvalues = np.linalg.eigvalsh(M)
-        if np.min(eigenvalues) <= tol:
-            raise ValueError("Ma trận (hoặc AᵀA) không xác định dương, không thể phân tích Cholesky.")
-    except np.linalg.LinAlgError:
-        raise ValueError("Lỗi tính toán giá trị riêng. Ma trận có vấn đề về số học.")
+    # Bước 2-3: M⁻¹ = U⁻¹(U⁻¹)ᵀ, tính bằng LAPACK dpotri (chỉ cho nửa trên, đối xứng hóa lại)
+    inv_M_upper, info = lapack.dpotri(U, lower=0)
+    if info != 0:
+        raise ValueError("Ma trận (hoặc AᵀA) suy biến, không thể tính nghịch đảo.")
+    inv_M = np.triu(inv_M_upper) + np.triu(inv_M_upper, 1).T
 
-    n = M.shape[0]
-    U = np.zeros((n, n), dtype=float)
-    for i in range(n):
-        sum_k = np.dot(U[:i, i], U[:i, i])
-        val_inside_sqrt = M[i, i] - sum_k
-        if val_inside_sqrt <= tol:
-            raise ValueError(f"Phần tử trên đường chéo U[{i},{i}] không dương. Ma trận không xác định dương.")
-        
-        U[i, i] = np.sqrt(val_inside_sqrt)
-        
-        for j in range(i + 1, n):
-            sum_k = np.dot(U[:i, i], U[:i, j])
-            U[i, j] = (M[i, j] - sum_k) / U[i, i]
-
-    # Bước 2: Tìm nghịch đảo của U (ma trận tam giác trên) bằng cách giải UX = I
-    I = np.eye(n)
-    inv_U = scipy.linalg.solve_triangular(U, I)
-
-    # Bước 3: Tính nghịch đảo của M: M⁻¹ = U⁻¹(U⁻¹)ᵀ
-    inv_M = inv_U @ inv_U.T
-    
     # Bước 4: Tính A⁻¹
     if is_symmetric:
         inv_A = inv_M
@@ -56,19 +48,66 @@ def cholesky_inverse(A, tol=1e-15):
     else:
         inv_A = inv_M @ A.T
         final_message = "Tính ma trận nghịch đảo A⁻¹ = (AᵀA)⁻¹Aᵀ thành công."
-        
+
+    intermediates = None
+    if trace != 'none':
+        # U⁻¹ chỉ cần để hiển thị các bước trung gian
+        inv_U = scipy.linalg.solve_triangular(U, np.eye(n))
+        intermediates = {
+            "M": zero_small(factorization["M"], tol) if not is_symmetric else None,
+            "U": zero_small(U, tol),
+            "Ut": zero_small(U.T, tol),
+            "U_inv": zero_small(inv_U, tol),
+            "M_inv": zero_small(inv_M, tol)
+        }
+
     return {
         "status": "success",
+        "variant": "cholesky",
         "inverse": zero_small(inv_A, tol),
         "is_symmetric": is_symmetric,
-        "transformation_message": transformation_message,
+        "transformation_message": factorization["transformation_message"],
         "final_message": final_message,
-        "intermediates": {
-            "M": zero_small(M, tol) if not is_symmetric else None,
-            "U": zero_small(U, tol),
-            "Ut": zero_small(U.T, tol),
-            "U_inv": zero_small(inv_U, tol),
-            "M_inv": zero_small(inv_M, tol)
-        },
+        "intermediates": intermediates,
+        "num_vars": n
+    }
+
+def _cholesky_inverse_packed(packed, tol):
+    packed = np.asarray(packed, dtype=float)
+    n = packed_order(packed.size)
+    _, factorization, _ = get_packed_cholesky_factorization(packed, n, tol)
+    inv_packed, info = lapack.dpptri(n, factorization["U_packed"], lower=1)
+    if info != 0:
+        raise ValueError("Ma trận suy biến, không thể tính nghịch đảo.")
+    return {
+        "status": "success",
+        "variant": "cholesky",
+        "packed": True,
+        "inverse": zero_small(inv_packed, tol),
+        "is_symmetric": True,
+        "transformation_message": factorization["transformation_message"],
+        "final_message": "Tính ma trận nghịch đảo A⁻¹ thành công (kết quả là tam giác trên dạng gói).",
+        "intermediates": None,
+        "num_vars": n
+    }
+
+def _ldlt_inverse(A, tol, trace):
+    _, factorization, _ = get_ldlt_factorization(A, tol)
+    n = A.shape[0]
+    inv_A, _, _ = ldlt_solve_factored(factorization, np.eye(n))
+    intermediates = None
+    if trace != 'none':
+        L = np.empty_like(factorization["L_perm"])
+        L[factorization["perm"]] = factorization["L_perm"]
+        intermediates = {"L": zero_small(L, tol), "D": zero_small(factorization["D"], tol)}
+    return {
+        "status": "success",
+        "variant": "ldlt",
+        "inverse": zero_small(inv_A, tol),
+        "is_symmetric": True,
+        "inertia": factorization["inertia"],
+        "transformation_message": factorization["transformation_message"],
+        "final_message": "Tính ma trận nghịch đảo A⁻¹ = (LDLᵀ)⁻¹ thành công.",
+        "intermediates": intermediates,
         "num_vars": n
-    }
\ No newline at end of file
+    }
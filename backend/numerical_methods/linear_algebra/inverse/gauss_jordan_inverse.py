@@ -1,8 +1,9 @@
 #backend/numerical_methods/linear_algebra/inverse/gauss_jordan_inverse.py
 import numpy as np
 from backend.numerical_methods.linear_algebra.direct.gauss_jordan import gauss_jordan
+from backend.numerical_methods.linear_algebra.direct.factorization import store_inverse
 
-def gauss_jordan_inverse(A, tol=1e-15):
+def gauss_jordan_inverse(A, tol=1e-15, trace='full'):
     """
     Tính ma trận nghịch đảo của A bằng phương pháp Gauss-Jordan.
     """
@@ -11,7 +12,7 @@ def gauss_jordan_inverse(A, tol=1e-15):
         raise ValueError("Ma trận A phải là ma trận vuông để tính ma trận nghịch đảo.")
     
     I = np.eye(n)
-    result = gauss_jordan(A, I, tol)
+    result = gauss_jordan(A, I, tol, trace=trace)
     
     if result["status"] != "unique_solution":
         raise ValueError("Ma trận A không khả nghịch, không thể tính ma trận nghịch đảo.")
@@ -20,6 +21,8 @@ def gauss_jordan_inverse(A, tol=1e-15):
     
     return {
         "inverse": inverse_A,
+        # Mã của A⁻¹ trong bộ nhớ đệm, dùng cho cập nhật hạng thấp (/inverse/woodbury)
+        "inverse_id": store_inverse(A, inverse_A, tol),
         "steps": result["steps"],
         "num_vars": n
     }
\ No newline at end of file
@@ -2,8 +2,9 @@
 import numpy as np
 from backend.utils.helpers import zero_small
 from backend.numerical_methods.linear_algebra.iterative.jacobi import jacobi # Tái sử dụng hàm jacobi đã có
+from backend.numerical_methods.linear_algebra.inverse.block_iterative import block_jacobi
 
-def jacobi_inverse(A, x0_method='method1', tol=1e-5, max_iter=100):
+def jacobi_inverse(A, x0_method='method1', tol=1e-5, max_iter=100, trace='full', engine='standard'):
     """
     Tìm ma trận nghịch đảo A⁻¹ bằng cách giải hệ AX = I sử dụng phương pháp lặp Jacobi đã có.
     """
@@ -32,21 +33,29 @@ def jacobi_inverse(A, x0_method='method1', tol=1e-5, max_iter=100):
 
     # 3. Gọi hàm jacobi gốc để giải hệ AX = I
     # Hàm jacobi đã xử lý đúng điều kiện chéo trội và công thức sai số hậu nghiệm
-    result = jacobi(A, I, X0, tol, max_iter)
+    # engine='block': theo dõi hội tụ từng cột, cố định các cột đã hội tụ và
+    # chỉ lặp trên khối cột còn lại (nhanh hơn nhiều với ma trận lớn)
+    if engine == 'block':
+        result = block_jacobi(A, I, X0, tol, max_iter, trace=trace)
+    elif engine == 'standard':
+        result = jacobi(A, I, X0, tol, max_iter, trace=trace)
+        result["engine"] = "standard"
+    else:
+        raise ValueError("Engine không hợp lệ. Chỉ hỗ trợ 'standard' và 'block'.")
     
     # 4. Xử lý kết quả trả về
     inverse_A = result["solution"]
-    check_matrix = A @ inverse_A
+    check_matrix = A @ inverse_A if trace != 'none' else None
 
     # Thêm các thông tin đặc thù của bài toán nghịch đảo vào kết quả
     result["inverse"] = inverse_A
     result["check_matrix"] = check_matrix
     result["x0_method"] = x0_method
-    result["initial_matrix"] = X0
+    result["initial_matrix"] = X0 if trace != 'none' else None
     
     # Xóa các trường không cần thiết cho bài toán nghịch đảo
     del result["solution"]
-    del result["matrix_B"]
-    del result["vector_d"]
+    result.pop("matrix_B", None)
+    result.pop("vector_d", None)
 
     return result
\ No newline at end of file
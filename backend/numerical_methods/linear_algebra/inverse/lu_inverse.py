@@ -2,8 +2,9 @@
 import numpy as np
 import scipy.linalg
 from backend.utils.helpers import zero_small
+from backend.numerical_methods.linear_algebra.direct.factorization import store_inverse
 
-def lu_inverse(A, tol=1e-15):
+def lu_inverse(A, tol=1e-15, trace='full'):
     """
     Tính ma trận nghịch đảo A⁻¹ bằng cách giải n hệ phương trình Ax = eᵢ
     sử dụng phân rã LU. (Phiên bản đã sửa lỗi thứ tự cột).
@@ -39,12 +40,15 @@ def lu_inverse(A, tol=1e-15):
         x = scipy.linalg.solve_triangular(U, y)
         
         inv_A_cols.append(x)
-        steps_solve.append({
-            "column_index": i + 1,
-            "b_col": zero_small(b_col, tol),
-            "y_col": zero_small(y, tol),
-            "x_col": zero_small(x, tol)
-        })
+        if trace == 'full':
+            steps_solve.append({
+                "column_index": i + 1,
+                "b_col": zero_small(b_col, tol),
+                "y_col": zero_small(y, tol),
+                "x_col": zero_small(x, tol)
+            })
+        elif trace == 'summary':
+            steps_solve.append({"column_index": i + 1, "b_col": None, "y_col": None, "x_col": None})
 
     # Ghép các cột kết quả lại thành ma trận A⁻¹
     inv_A = np.column_stack(inv_A_cols)
@@ -52,11 +56,13 @@ def lu_inverse(A, tol=1e-15):
     return {
         "status": "success",
         "inverse": zero_small(inv_A, tol),
+        # Mã của A⁻¹ trong bộ nhớ đệm, dùng cho cập nhật hạng thấp (/inverse/woodbury)
+        "inverse_id": store_inverse(A, inv_A, tol),
         "decomposition": {
             "P": zero_small(P, tol),
             "L": zero_small(L, tol),
             "U": zero_small(U, tol)
-        },
+        } if trace != 'none' else None,
         "steps_solve": steps_solve,
         "num_vars": n
     }
\ No newline at end of file
@@ -1,15 +1,43 @@
 # backend/numerical_methods/linear_algebra/inverse/newton_inverse.py
 import numpy as np
-from backend.utils.helpers import zero_small
+from backend.utils.helpers import zero_small, trace_snapshot, estimate_norm2
 
-def newton_inverse(A, tol=1e-5, max_iter=100, x0_method='method1'):
+# Các chế độ lặp:
+# - 'classic'   : cài đặt gốc (kiểm tra det(A), chọn X₀ theo chuẩn 2 tính bằng SVD, sai số theo chuẩn 2).
+# - 'hyperpower': lặp hyperpower bậc p (p = 2 là Newton-Schulz), ||A||₂ ước lượng bằng lặp lũy thừa,
+#                 không kiểm tra det(A) mà theo dõi phần dư Rₖ = E - AXₖ để phát hiện suy biến/phân kỳ.
+# - 'scaled'    : Newton-Schulz có hệ số co giãn αₖ (hội tụ nhanh hơn ở giai đoạn đầu với ma trận điều kiện xấu).
+NEWTON_MODES = ('classic', 'hyperpower', 'scaled')
+HYPERPOWER_ORDERS = (2, 3, 4)
+
+NORM2_POWER_ITERS = 30
+# Lặp lũy thừa cho ước lượng σ_max từ dưới lên, nới rộng một chút để giá trị riêng của AX₀ không vượt quá 1
+NORM2_SAFETY = 1.01
+SCALING_POWER_ITERS = 8
+# Theo dõi hội tụ: dừng nếu ||Rₖ||_F không giảm (tương đối) quá STALL_RTOL sau STALL_WINDOW lần lặp liên tiếp,
+# hoặc tăng quá DIVERGENCE_FACTOR lần so với giá trị nhỏ nhất đã đạt
+STALL_WINDOW = 5
+STALL_RTOL = 1e-13
+DIVERGENCE_FACTOR = 2.0
+
+def newton_inverse(A, tol=1e-5, max_iter=100, x0_method='method1', trace='full', mode='classic', order=2):
     """
     Tìm ma trận nghịch đảo gần đúng bằng phương pháp lặp Newton.
     Xₖ₊₁ = Xₖ(2E - AXₖ)
+    mode: 'classic', 'hyperpower' (bậc order = 2, 3, 4) hoặc 'scaled' (xem NEWTON_MODES).
+    Kết quả kèm số phép toán dấu phẩy động ước lượng (flops) của chế độ đã chọn.
     """
     n = A.shape[0]
     if n != A.shape[1]:
         raise ValueError("Ma trận phải là ma trận vuông.")
+    if mode not in NEWTON_MODES:
+        raise ValueError(f"Chế độ '{mode}' không hợp lệ. Chỉ hỗ trợ: {', '.join(NEWTON_MODES)}.")
+    if order not in HYPERPOWER_ORDERS:
+        raise ValueError(f"Bậc lặp hyperpower phải là một trong {HYPERPOWER_ORDERS}.")
+    if mode != 'classic':
+        return _newton_inverse_fast(A, tol, max_iter, x0_method, trace, mode, order)
+    if order != 2:
+        raise ValueError("Chế độ 'classic' chỉ hỗ trợ bậc 2, hãy dùng mode='hyperpower' cho bậc 3, 4.")
     if np.isclose(np.linalg.det(A), 0):
         raise ValueError("Ma trận suy biến (det(A) ≈ 0), không có nghịch đảo.")
 
@@ -55,14 +83,19 @@ def newton_inverse(A, tol=1e-5, max_iter=100, x0_method='method1'):
         # Đánh giá sai số hậu nghiệm
         estimated_error = (q / (1 - q)) * diff_norm
         
-        iterations_data.append({
-            "k": i,
-            "x_k": X_k_plus_1,
-            "diff_norm": diff_norm,
-            "estimated_error": estimated_error
-        })
+        if trace != 'none':
+            iterations_data.append({
+                "k": i,
+                "x_k": trace_snapshot(X_k_plus_1, trace),
+                "diff_norm": diff_norm,
+                "estimated_error": estimated_error
+            })
         
         if estimated_error < tol:
+            # Ước lượng: det ~ 2n³/3 (LU), mỗi chuẩn 2 ~ 8n³/3 (SVD chỉ tính giá trị kỳ dị), nhân ma trận 2n³;
+            # mỗi bước lặp gồm 2 phép nhân ma trận và một chuẩn 2 của Xₖ₊₁ - Xₖ
+            setup_flops = (2 * n**3) // 3 + 3 * (8 * n**3) // 3 + 2 * (2 * n**3)
+            iteration_flops = 2 * (2 * n**3) + (8 * n**3) // 3
             return {
                 "status": "success",
                 "inverse": zero_small(X_k_plus_1, tol),
@@ -70,10 +103,151 @@ def newton_inverse(A, tol=1e-5, max_iter=100, x0_method='method1'):
                 "iterations_data": iterations_data,
                 "contraction_coefficient": q,
                 "x0_label": x0_label,
-                "initial_matrix": X_k,
-                "check_matrix": A @ X_k_plus_1
+                "initial_matrix": X_k if trace != 'none' else None,
+                "check_matrix": A @ X_k_plus_1 if trace != 'none' else None,
+                "mode": mode,
+                "order": 2,
+                "flops": _flops_summary(setup_flops, iteration_flops, i)
             }
         
         X_k = X_k_plus_1
 
+    raise ValueError(f"Phương pháp không hội tụ sau {max_iter} lần lặp. Sai số cuối cùng là {estimated_error:.2e}.")
+
+def _flops_summary(setup_flops, iteration_flops, iterations):
+    return {
+        "setup": int(setup_flops),
+        "per_iteration": int(iteration_flops),
+        "total": int(setup_flops + iteration_flops * iterations)
+    }
+
+def _spectral_radius(R, iters, seed=0):
+    # Ước lượng max|λ(R)| bằng vài bước lặp lũy thừa (R đối xứng khi X₀ = cAᵀ); ước lượng từ dưới lên
+    v = np.random.default_rng(seed).standard_normal(R.shape[0])
+    v /= np.linalg.norm(v)
+    rho = 0.0
+    for _ in range(iters):
+        w = R @ v
+        rho = float(np.linalg.norm(w))
+        if rho == 0:
+            break
+        v = w / rho
+    return rho
+
+def _scaling_factor(R, M):
+    # M = AXₖ(E + Rₖ) = E - Rₖ² có phổ trong [λmin, λmax] với λmin = 1 - ρ², ρ = ρ(Rₖ) (không giả sử λmax = 1).
+    # α_F = tr(M) / ||M||²_F là hệ số làm ||E - αM||_F nhỏ nhất nên phần dư Frobenius không tăng so với α = 1;
+    # chặn trên bởi 2 / (λmin + λmax) để phổ của αM không vượt quá khoảng đối xứng quanh 1
+    # (tránh đẩy các trị riêng lớn tới phần dư ≈ -1 khi phổ co cụm).
+    rho = _spectral_radius(R, SCALING_POWER_ITERS)
+    lam_min = max(1.0 - rho**2, 0.0)
+    lam_max = _spectral_radius(M, SCALING_POWER_ITERS)
+    M_norm_sq = float(np.sum(M * M))
+    if lam_max == 0 or M_norm_sq == 0:
+        return 1.0
+    alpha_f = float(np.trace(M)) / M_norm_sq
+    return min(alpha_f, 2.0 / (lam_min + lam_max))
+
+def _newton_inverse_fast(A, tol, max_iter, x0_method, trace, mode, order):
+    """
+    Lặp hyperpower bậc p: Rₖ = E - AXₖ, Xₖ₊₁ = Xₖ(E + Rₖ + ... + Rₖᵖ⁻¹), khi đó Rₖ₊₁ = Rₖᵖ.
+    Newton-Schulz co giãn (mode='scaled'): Xₖ₊₁ = αₖXₖ(E + Rₖ), αₖ lấy theo phổ thực tế của AXₖ(E + Rₖ)
+    (xem _scaling_factor) để đưa phổ của AXₖ₊₁ lại gần 1.
+    Sai số hậu nghiệm theo chuẩn Frobenius: ||A⁻¹ - Xₖ|| ≤ ||Xₖ||·||Rₖ|| / (1 - ||Rₖ||) khi ||Rₖ|| < 1.
+    """
+    n = A.shape[0]
+    A = np.asarray(A, dtype=float)
+    if mode == 'scaled':
+        order = 2
+
+    if x0_method == 'method2':
+        scale = np.linalg.norm(A, 1) * np.linalg.norm(A, np.inf)
+        x0_label = "X₀ = Aᵀ / (||A||₁·||A||∞)"
+        setup_flops = 2 * n**2
+    else:
+        # Với X₀ = cAᵀ, c = 1/||A||₂² là lựa chọn tối ưu nên chế độ tự động luôn dùng method1
+        sigma, power_iters = estimate_norm2(A, max_iter=NORM2_POWER_ITERS)
+        scale = NORM2_SAFETY * sigma**2
+        x0_label = "X₀ = Aᵀ / ||A||₂² (||A||₂ ước lượng bằng lặp lũy thừa)"
+        if x0_method != 'method1':
+            x0_label = f"Tự động chọn {x0_label}"
+        setup_flops = power_iters * 4 * n**2
+    if np.isclose(scale, 0):
+        raise ValueError("Chuẩn của ma trận A bằng 0, không thể chọn X₀.")
+
+    X_k = A.T / scale
+    X_0 = X_k
+    iterations_data = []
+    residual_history = []
+    scaling_history = []
+    # Mỗi bước: AXₖ (2n³), p - 2 phép nhân cho đa thức Horner, Xₖ·P (2n³), cộng các chuẩn Frobenius O(n²)
+    iteration_flops = order * 2 * n**3 + 6 * n**2
+    if mode == 'scaled':
+        iteration_flops += 2 * SCALING_POWER_ITERS * 2 * n**2 + 4 * n**2
+
+    AX = A @ X_k
+    for k in range(max_iter + 1):
+        R = -AX
+        R[np.diag_indices(n)] += 1.0
+        residual = float(np.linalg.norm(R, 'fro'))
+        if not np.isfinite(residual):
+            raise ValueError("Phép lặp bị tràn số, ma trận có thể suy biến.")
+        residual_history.append(residual)
+
+        best = min(residual_history)
+        if residual > DIVERGENCE_FACTOR * best:
+            raise ValueError(f"Phần dư ||E - AXₖ|| tăng từ {best:.2e} lên {residual:.2e} sau {k} lần lặp: phép lặp phân kỳ, ma trận có thể suy biến.")
+        if k >= STALL_WINDOW and residual > (1 - STALL_RTOL) * residual_history[k - STALL_WINDOW]:
+            if residual < 1:
+                # Phần dư đã nhỏ nhưng dừng ở mức sai số làm tròn
+                raise ValueError(f"Phần dư ||E - AXₖ|| dừng ở {residual:.2e} (giới hạn sai số làm tròn), không đạt được tol = {tol:.1e}. Hãy tăng tol.")
+            raise ValueError(f"Phần dư ||E - AXₖ|| ≈ {residual:.2e} không giảm sau {STALL_WINDOW} lần lặp liên tiếp: ma trận suy biến hoặc điều kiện quá xấu.")
+
+        estimated_error = float(np.linalg.norm(X_k, 'fro')) * residual / (1 - residual) if residual < 1 else np.inf
+
+        if k > 0 and trace != 'none':
+            iterations_data.append({
+                "k": k,
+                "x_k": trace_snapshot(X_k, trace),
+                "diff_norm": float(np.linalg.norm(X_k - X_prev, 'fro')),
+                "estimated_error": estimated_error,
+                "residual_norm": residual
+            })
+
+        if estimated_error < tol:
+            return {
+                "status": "success",
+                "inverse": zero_small(X_k, tol),
+                "iterations": k,
+                "iterations_data": iterations_data,
+                "contraction_coefficient": residual_history[0],
+                "x0_label": x0_label,
+                "initial_matrix": X_0 if trace != 'none' else None,
+                "check_matrix": np.identity(n) - R if trace != 'none' else None,
+                "mode": mode,
+                "order": order,
+                "residual_history": residual_history,
+                "scaling_factors": scaling_history if mode == 'scaled' else None,
+                "flops": _flops_summary(setup_flops, iteration_flops, k)
+            }
+        if k == max_iter:
+            break
+
+        # P = E + R + ... + Rᵖ⁻¹ theo sơ đồ Horner
+        P = R.copy()
+        P[np.diag_indices(n)] += 1.0
+        for _ in range(order - 2):
+            P = R @ P
+            P[np.diag_indices(n)] += 1.0
+
+        X_prev = X_k
+        X_k = X_k @ P
+        AX = A @ X_k
+        if mode == 'scaled':
+            # AXₖ₊₁ dùng cho cả hệ số co giãn lẫn phần dư của bước sau
+            alpha = _scaling_factor(R, AX)
+            scaling_history.append(alpha)
+            X_k *= alpha
+            AX *= alpha
+
     raise ValueError(f"Phương pháp không hội tụ sau {max_iter} lần lặp. Sai số cuối cùng là {estimated_error:.2e}.")
\ No newline at end of file
@@ -0,0 +1,88 @@
+# backend/numerical_methods/linear_algebra/inverse/woodbury.py
+import numpy as np
+import scipy.linalg
+from backend.utils.helpers import zero_small
+from backend.numerical_methods.linear_algebra.direct.factorization import get_inverse, store_inverse
+
+# Nếu số điều kiện của ma trận C = I + VᵀA⁻¹U (capacitance) vượt ngưỡng này thì công thức Woodbury mất chính xác,
+# khi đó tính lại (A + UVᵀ)⁻¹ từ đầu bằng phân rã LU.
+WOODBURY_MAX_CONDITION = 1e8
+# Kiểm tra nhanh O(n²) kết quả X ≈ (A + UVᵀ)⁻¹: sai số dư tương đối ||(A + UVᵀ)Xp - p|| / ||p|| với vector ngẫu nhiên p
+# không được vượt quá WOODBURY_PROBE_TOL, hoặc WOODBURY_PROBE_GROWTH lần sai số dư tương ứng của A⁻¹ đã lưu
+# (với A có điều kiện xấu thì chính A⁻¹ cũng chỉ chính xác đến mức đó).
+WOODBURY_PROBE_TOL = 1e-8
+WOODBURY_PROBE_GROWTH = 100
+
+def _as_factor(M, n, name):
+    M = np.asarray(M, dtype=float)
+    if M.ndim == 1 or (M.ndim == 2 and M.shape[0] == 1 and n != 1):
+        M = M.reshape(-1, 1)
+    if M.ndim != 2 or M.shape[0] != n:
+        raise ValueError(f"Ma trận {name} phải có {n} hàng (kích thước n×k).")
+    return M
+
+def woodbury_inverse(inverse_id, U, V, tol=1e-15, max_condition=WOODBURY_MAX_CONDITION, trace='summary'):
+    """
+    Tính (A + UVᵀ)⁻¹ từ A⁻¹ đã lưu (theo inverse_id) bằng công thức Sherman–Morrison–Woodbury:
+        (A + UVᵀ)⁻¹ = A⁻¹ - A⁻¹U (I + VᵀA⁻¹U)⁻¹ VᵀA⁻¹,
+    chi phí O(n²k) thay vì O(n³). Nếu ma trận C = I + VᵀA⁻¹U có điều kiện xấu (hoặc kết quả không qua
+    được phép kiểm tra sai số dư), tính lại nghịch đảo từ đầu bằng phân rã LU.
+    Kết quả được lưu lại với inverse_id mới để tiếp tục cập nhật.
+    """
+    A, A_inv = get_inverse(inverse_id)
+    n = A.shape[0]
+    U = _as_factor(U, n, "U")
+    V = _as_factor(V, n, "V")
+    if U.shape != V.shape:
+        raise ValueError(f"Hai ma trận U và V phải cùng kích thước n×k (U: {U.shape[0]}x{U.shape[1]}, V: {V.shape[0]}x{V.shape[1]}).")
+    k = U.shape[1]
+
+    A_new = A + U @ V.T
+    W = A_inv @ U                      # A⁻¹U  (n×k)
+    Z = V.T @ A_inv                    # VᵀA⁻¹ (k×n)
+    C = np.identity(k) + V.T @ W       # ma trận C (k×k)
+    # Số điều kiện của C đối với nhiễu trên VᵀA⁻¹U: (1 + ||VᵀA⁻¹U||₂)·||C⁻¹||₂ ≥ cond₂(C).
+    # Khác với cond₂(C), đại lượng này còn phát hiện triệt tiêu khi C ≈ 0 (kể cả khi k = 1).
+    sigma_min = np.linalg.svd(C, compute_uv=False)[-1]
+    condition = float((1 + np.linalg.norm(C - np.identity(k), 2)) / sigma_min) if sigma_min > 0 else np.inf
+
+    new_inverse = None
+    probe_residual = None
+    fallback_reason = None
+    if np.isfinite(condition) and condition <= max_condition:
+        new_inverse = A_inv - W @ np.linalg.solve(C, Z)
+        p = np.random.default_rng(0).standard_normal(n)
+        p_norm = np.linalg.norm(p)
+        probe_residual = float(np.linalg.norm(A_new @ (new_inverse @ p) - p) / p_norm)
+        baseline = float(np.linalg.norm(A @ (A_inv @ p) - p) / p_norm)
+        probe_tol = max(WOODBURY_PROBE_TOL, WOODBURY_PROBE_GROWTH * baseline)
+        if not probe_residual <= probe_tol:
+            new_inverse = None
+            fallback_reason = f"Sai số dư kiểm tra {probe_residual:.2e} vượt ngưỡng {probe_tol:.0e}."
+    else:
+        fallback_reason = f"Số điều kiện của C = I + VᵀA⁻¹U là {condition:.2e}, vượt ngưỡng {max_condition:.0e}."
+
+    update_method = "woodbury"
+    if new_inverse is None:
+        update_method = "refactorization"
+        try:
+            new_inverse = scipy.linalg.inv(A_new)
+        except (np.linalg.LinAlgError, ValueError):
+            raise ValueError("Ma trận A + UVᵀ suy biến, không có nghịch đảo.")
+        if not np.all(np.isfinite(new_inverse)):
+            raise ValueError("Ma trận A + UVᵀ suy biến, không có nghịch đảo.")
+
+    return {
+        "status": "success",
+        "inverse": zero_small(new_inverse, tol),
+        "inverse_id": store_inverse(A_new, new_inverse, tol),
+        "previous_inverse_id": inverse_id,
+        "rank": k,
+        "update_method": update_method,
+        "fallback_reason": fallback_reason,
+        "capacitance_condition": condition,
+        "probe_residual": probe_residual,
+        "capacitance": C if trace != 'none' else None,
+        # Phép kiểm tra (A + UVᵀ)·X tốn O(n³) nên chỉ tính khi lưu vết đầy đủ
+        "check_matrix": zero_small(A_new @ new_inverse, tol) if trace == 'full' else None
+    }
@@ -1,10 +1,67 @@
 # backend/numerical_methods/linear_algebra/iterative/gauss_seidel.py
 # Chức năng: Cung cấp thuật toán lặp Gauss-Seidel.
 import numpy as np
-from backend.utils.helpers import zero_small
+import scipy.linalg
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+from scipy.linalg import blas
+from backend.utils.helpers import zero_small, trace_snapshot, abs_row_sums, abs_col_sums
 
-def gauss_seidel(A, b, x0, tol=1e-5, max_iter=100):
+# Số hàng xử lý mỗi lần khi tính tổng trên phần tam giác dưới của ma trận đặc
+# (tránh tạo bản sao |A| kích thước n×n)
+COEFF_BLOCK_ROWS = 128
+
+def _strict_lower_abs_sums(A, axis):
+    # Tổng trị tuyệt đối phần tam giác dưới ngặt của A theo hàng (axis=1) hoặc theo cột (axis=0).
+    if sp.issparse(A):
+        lower_strict = sp.tril(A, k=-1, format='csr')
+        return abs_row_sums(lower_strict) if axis == 1 else abs_col_sums(lower_strict)
+    n = A.shape[0]
+    sums = np.zeros(n)
+    for start in range(0, n, COEFF_BLOCK_ROWS):
+        stop = min(start + COEFF_BLOCK_ROWS, n)
+        # Khối hàng start:stop, chỉ các cột < stop; mặt nạ chọn các phần tử a_ij với j < i
+        block = np.abs(A[start:stop, :stop])
+        mask = np.tri(stop - start, stop, k=start - 1, dtype=bool)
+        if axis == 1:
+            sums[start:stop] = np.sum(block, axis=1, where=mask)
+        else:
+            sums[:stop] += np.sum(block, axis=0, where=mask)
+    return sums
+
+def _coefficients(A, diag_abs, row_sum_off_diag, col_sum_off_diag, is_row_dominant):
+    # Hệ số s, q và chuẩn dùng để đánh giá sai số.
+    # Phần tam giác trên ngặt được suy ra từ tổng ngoài đường chéo trừ đi phần tam giác dưới ngặt.
+    if is_row_dominant:
+        q_num = _strict_lower_abs_sums(A, axis=1)             # Σ_{j<i} |a_ij|
+        q_den = diag_abs - (row_sum_off_diag - q_num)         # |a_ii| - Σ_{j>i} |a_ij|
+        s, norm = 0, np.inf
+    else:
+        below_diag = _strict_lower_abs_sums(A, axis=0)        # Σ_{i>j} |a_ij|
+        s = np.max(below_diag / diag_abs)
+        q_num = col_sum_off_diag - below_diag                 # Σ_{i<j} |a_ij|
+        q_den = diag_abs - below_diag
+        norm = 1
+    q_den[np.isclose(q_den, 0)] = 1e-15
+    return s, np.max(q_num / q_den), norm
+
+def _strict_upper_product(A, x):
+    # Tính Ux (U là phần tam giác trên ngặt của A đặc) mà không tạo bản sao n×n:
+    # dtrmm trên A.T (Fortran-contiguous, lower=1, trans_a=1 tương đương triu(A))
+    # với đường chéo đơn vị cho (U + I)x, sau đó trừ đi x.
+    return blas.dtrmm(1.0, A.T, x, lower=1, trans_a=1, diag=1) - x
+
+def gauss_seidel(A, b, x0, tol=1e-5, max_iter=100, trace='full'):
     # Giải hệ Ax=b bằng phương pháp Gauss-Seidel.
+    # trace: mức lưu vết các bước lặp ('none', 'summary', 'full').
+    # Mỗi bước lặp giải hệ tam giác dưới (D + L)x_k+1 = b - Ux_k:
+    # scipy.linalg.solve_triangular với A đặc, spsolve_triangular với A thưa (scipy.sparse,
+    # bộ nhớ tỉ lệ với nnz thay vì n²).
+    sparse = sp.issparse(A)
+    if sparse:
+        A = A.tocsr()
+    else:
+        A = np.asarray(A, dtype=float)
     n = A.shape[0]
     if n != A.shape[1]:
         raise ValueError("Ma trận A phải là ma trận vuông.")
@@ -13,43 +70,23 @@ def gauss_seidel(A, b, x0, tol=1e-5, max_iter=100):
     if x0.ndim == 1:
         x0 = x0.reshape(-1, 1)
 
-    diag_elements = np.diag(A)
+    diag_elements = A.diagonal() if sparse else np.diag(A)
     if np.any(np.isclose(diag_elements, 0)):
         raise ValueError("Ma trận có phần tử trên đường chéo chính bằng 0.")
 
     diag_abs = np.abs(diag_elements)
-    row_sum_off_diag = np.sum(np.abs(A), axis=1) - diag_abs
-    col_sum_off_diag = np.sum(np.abs(A), axis=0) - diag_abs
+    row_sum_off_diag = abs_row_sums(A) - diag_abs
+    col_sum_off_diag = abs_col_sums(A) - diag_abs
     is_row_dominant = np.all(diag_abs > row_sum_off_diag)
     is_col_dominant = np.all(diag_abs > col_sum_off_diag)
 
     if not is_row_dominant and not is_col_dominant:
         raise ValueError("Ma trận không chéo trội hàng hoặc cột. Hội tụ không được đảm bảo.")
 
-    s, q, norm = 0, 0, 0
-    if is_row_dominant:
-        norm = np.inf
-        s = 0
-        q_num = np.zeros(n)
-        q_den = np.zeros(n)
-        for i in range(n):
-            q_num[i] = np.sum(np.abs(A[i, :i]))
-            q_den[i] = np.abs(A[i, i]) - np.sum(np.abs(A[i, i+1:]))
-        q_den[np.isclose(q_den, 0)] = 1e-15
-        q = np.max(q_num / q_den)
-    else: # is_col_dominant
-        norm = 1
-        s_num = np.zeros(n)
-        for j in range(n):
-            s_num[j] = np.sum(np.abs(A[j+1:, j]))
-        s = np.max(s_num / diag_abs)
-        q_num = np.zeros(n)
-        q_den = np.zeros(n)
-        for j in range(n):
-            q_num[j] = np.sum(np.abs(A[:j, j]))
-            q_den[j] = np.abs(A[j, j]) - np.sum(np.abs(A[j+1:, j]))
-        q_den[np.isclose(q_den, 0)] = 1e-15
-        q = np.max(q_num / q_den)
+    s, q, norm = _coefficients(A, diag_abs, row_sum_off_diag, col_sum_off_diag, is_row_dominant)
+    if sparse:
+        lower = sp.tril(A, format='csr')
+        upper_strict = sp.triu(A, k=1, format='csr')
     
     denominator = (1 - s) * (1 - q)
     if np.isclose(denominator, 0):
@@ -60,21 +97,23 @@ def gauss_seidel(A, b, x0, tol=1e-5, max_iter=100):
     iterations_data = []
     
     for i in range(max_iter):
-        x_prev = x_k.copy()
-        for j in range(n):
-            sum1 = np.dot(A[j, :j], x_k[:j, :])
-            sum2 = np.dot(A[j, j+1:], x_prev[j+1:, :])
-            x_k[j, :] = (b[j, :] - sum1 - sum2) / A[j, j]
+        x_prev = x_k
+        if sparse:
+            x_k = spla.spsolve_triangular(lower, b - upper_strict @ x_prev, lower=True)
+        else:
+            # solve_triangular chỉ đọc phần tam giác dưới (kể cả đường chéo) của A
+            x_k = scipy.linalg.solve_triangular(A, b - _strict_upper_product(A, x_prev), lower=True, check_finite=False)
         
         diff_norm = np.linalg.norm(x_k - x_prev, norm)
         estimated_error = stopping_factor * diff_norm
         
-        iterations_data.append({
-            "k": i + 1,
-            "x_k": x_k,
-            "error": estimated_error,
-            "diff_norm": diff_norm
-        })
+        if trace != 'none':
+            iterations_data.append({
+                "k": i + 1,
+                "x_k": trace_snapshot(x_k, trace),
+                "error": estimated_error,
+                "diff_norm": diff_norm
+            })
         
         if estimated_error < tol:
             return {
@@ -1,11 +1,18 @@
 # backend/numerical_methods/linear_algebra/iterative/jacobi.py
 import numpy as np
-from backend.utils.helpers import zero_small
+import scipy.sparse as sp
+from backend.utils.helpers import zero_small, trace_snapshot, abs_row_sums, abs_col_sums, matrix_norm
 
-def jacobi(A, b, x0, tol=1e-5, max_iter=100):
+def jacobi(A, b, x0, tol=1e-5, max_iter=100, trace='full'):
     """
     Giải hệ phương trình Ax=b bằng phương pháp lặp Jacobi.
+    trace: mức lưu vết các bước lặp ('none', 'summary', 'full').
+    A có thể là ma trận thưa (scipy.sparse): khi đó B cũng thưa, mọi phép tính
+    chỉ dùng các phần tử khác 0 và bộ nhớ tỉ lệ với nnz thay vì n².
     """
+    sparse = sp.issparse(A)
+    if sparse:
+        A = A.tocsr()
     n = A.shape[0]
     if n != A.shape[1]:
         raise ValueError("Ma trận A phải là ma trận vuông.")
@@ -14,14 +21,14 @@ def jacobi(A, b, x0, tol=1e-5, max_iter=100):
     if x0.ndim == 1:
         x0 = x0.reshape(-1, 1)
 
-    diag_elements = np.diag(A)
+    diag_elements = A.diagonal() if sparse else np.diag(A)
     if np.any(np.isclose(diag_elements, 0)):
         raise ValueError("Ma trận có phần tử trên đường chéo chính bằng 0, không thể thực hiện phép lặp.")
 
     # Kiểm tra điều kiện chéo trội
     diag_abs = np.abs(diag_elements)
-    row_sum = np.sum(np.abs(A), axis=1) - diag_abs
-    col_sum = np.sum(np.abs(A), axis=0) - diag_abs
+    row_sum = abs_row_sums(A) - diag_abs
+    col_sum = abs_col_sums(A) - diag_abs
     is_row_dominant = np.all(diag_abs > row_sum)
     is_col_dominant = np.all(diag_abs > col_sum)
 
@@ -29,21 +36,26 @@ def jacobi(A, b, x0, tol=1e-5, max_iter=100):
         raise ValueError("Ma trận không chéo trội hàng hoặc cột. Hội tụ không được đảm bảo.")
 
     # Thiết lập ma trận lặp B và vector d
-    T = np.diag(1.0 / diag_elements)
-    B = np.identity(n) - T @ A
+    if sparse:
+        T = sp.diags(1.0 / diag_elements, format='csr')
+        I = sp.identity(n, format='csr')
+    else:
+        T = np.diag(1.0 / diag_elements)
+        I = np.identity(n)
+    B = I - T @ A
     d = T @ b
     
     # Xác định chuẩn và hệ số co để đánh giá sai số
     if is_row_dominant:
         norm = np.inf
         norm_used = "infinity"
-        contraction_coefficient = np.linalg.norm(B, norm)
+        contraction_coefficient = matrix_norm(B, norm)
         stopping_factor = contraction_coefficient / (1 - contraction_coefficient)
     else: # is_col_dominant
         norm = 1
         norm_used = "1"
-        B1_conv = np.identity(n) - A @ T
-        contraction_coefficient = np.linalg.norm(B1_conv, norm)
+        B1_conv = I - A @ T
+        contraction_coefficient = matrix_norm(B1_conv, norm)
         lambda_factor = np.max(diag_abs) / np.min(diag_abs)
         stopping_factor = lambda_factor * contraction_coefficient / (1 - contraction_coefficient)
 
@@ -56,12 +68,13 @@ def jacobi(A, b, x0, tol=1e-5, max_iter=100):
         diff_norm = np.linalg.norm(x_k_plus_1 - x_k, norm)
         estimated_error = stopping_factor * diff_norm
 
-        iterations_data.append({
-            "k": i + 1,
-            "x_k": x_k_plus_1,
-            "error": estimated_error,
-            "diff_norm": diff_norm
-        })
+        if trace != 'none':
+            iterations_data.append({
+                "k": i + 1,
+                "x_k": trace_snapshot(x_k_plus_1, trace),
+                "error": estimated_error,
+                "diff_norm": diff_norm
+            })
         
         if estimated_error < tol:
             return {
@@ -73,8 +86,8 @@ def jacobi(A, b, x0, tol=1e-5, max_iter=100):
                 "norm_used": norm_used,
                 "is_row_dominant": is_row_dominant,
                 "is_col_dominant": is_col_dominant,
-                "matrix_B": zero_small(B, tol),
-                "vector_d": zero_small(d, tol)
+                "matrix_B": zero_small(B, tol) if trace != 'none' else None,
+                "vector_d": zero_small(d, tol) if trace != 'none' else None
             }
         
         x_k = x_k_plus_1
@@ -0,0 +1,296 @@
+# backend/numerical_methods/linear_algebra/iterative/krylov.py
+# Chức năng: Các phương pháp lặp không gian Krylov (CG, GMRES(m), BiCGSTAB) có tiền điều kiện.
+# Khác với Jacobi / Gauss-Seidel, các phương pháp này không đòi hỏi ma trận chéo trội
+# và thường hội tụ sau vài chục bước lặp với hệ lớn (A đặc hoặc thưa scipy.sparse).
+import numpy as np
+import scipy.linalg
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+from backend.utils.helpers import zero_small, trace_snapshot
+
+KRYLOV_METHODS = ('cg', 'gmres', 'bicgstab')
+PRECONDITIONERS = ('none', 'jacobi', 'ilu0')
+DEFAULT_GMRES_RESTART = 30
+
+def _ilu0_sparse(A):
+    """
+    Phân tích ILU(0) của ma trận thưa CSR: L, U giữ nguyên cấu trúc thưa của A (không thêm phần tử mới).
+    Trả về (L, U) dạng CSR với L có đường chéo đơn vị (không lưu).
+    """
+    A = A.tocsr(copy=True)
+    A.sum_duplicates()
+    A.sort_indices()
+    n = A.shape[0]
+    indptr = A.indptr.tolist()
+    indices = A.indices.tolist()
+    data = A.data.tolist()
+
+    diag_ptr = [-1] * n
+    position = [-1] * n   # position[j] = vị trí của phần tử (i, j) trong data của hàng i đang xét
+    for i in range(n):
+        row_start, row_end = indptr[i], indptr[i + 1]
+        for p in range(row_start, row_end):
+            position[indices[p]] = p
+        for p in range(row_start, row_end):
+            k = indices[p]
+            if k >= i:
+                break
+            # l_ik = a_ik / u_kk, rồi khử a_ij -= l_ik * u_kj chỉ với các j đã có trong cấu trúc của hàng i
+            data[p] /= data[diag_ptr[k]]
+            l_ik = data[p]
+            for q in range(diag_ptr[k] + 1, indptr[k + 1]):
+                w = position[indices[q]]
+                if w != -1:
+                    data[w] -= l_ik * data[q]
+        diag_ptr[i] = position[i]
+        if diag_ptr[i] == -1 or data[diag_ptr[i]] == 0:
+            raise ValueError(f"Không thể phân tích ILU(0): phần tử chéo u[{i+1},{i+1}] bằng 0.")
+        for p in range(row_start, row_end):
+            position[indices[p]] = -1
+
+    LU = sp.csr_matrix((np.array(data), A.indices, A.indptr), shape=A.shape)
+    return sp.tril(LU, k=-1, format='csr'), sp.triu(LU, format='csr')
+
+def _ilu0_dense(A):
+    """
+    ILU(0) của ma trận đặc: cấu trúc của A là đầy đủ nên đây chính là phân rã LU không hoán vị.
+    Trả về ma trận chứa L (dưới đường chéo, đường chéo đơn vị) và U (từ đường chéo trở lên).
+    """
+    LU = np.array(A, dtype=float)
+    n = LU.shape[0]
+    for k in range(n):
+        if LU[k, k] == 0:
+            raise ValueError(f"Không thể phân tích ILU(0): phần tử chéo u[{k+1},{k+1}] bằng 0.")
+        LU[k+1:, k] /= LU[k, k]
+        LU[k+1:, k+1:] -= np.outer(LU[k+1:, k], LU[k, k+1:])
+    return LU
+
+def make_preconditioner(A, kind):
+    """
+    Trả về hàm M⁻¹: r -> z xấp xỉ nghiệm của Az = r.
+    - 'none':   z = r
+    - 'jacobi': z = D⁻¹r (D là đường chéo của A)
+    - 'ilu0':   z = U⁻¹L⁻¹r với LU là phân tích ILU(0) của A
+    """
+    if kind not in PRECONDITIONERS:
+        raise ValueError(f"Tiền điều kiện '{kind}' không hợp lệ. Chỉ hỗ trợ: {', '.join(PRECONDITIONERS)}.")
+    if kind == 'none':
+        return lambda r: r
+
+    if kind == 'jacobi':
+        diag = A.diagonal() if sp.issparse(A) else np.diag(A)
+        if np.any(diag == 0):
+            raise ValueError("Ma trận có phần tử trên đường chéo chính bằng 0, không dùng được tiền điều kiện Jacobi.")
+        inv_diag = 1.0 / diag
+        return lambda r: inv_diag * r
+
+    if sp.issparse(A):
+        L, U = _ilu0_sparse(A)
+        # Giải hai hệ tam giác bằng SuperLU với thứ tự tự nhiên và không hoán vị hàng: với ma trận
+        # tam giác, phân rã không sinh thêm phần tử, còn mỗi lần giải nhanh hơn nhiều so với spsolve_triangular.
+        options = dict(permc_spec='NATURAL', diag_pivot_thresh=0, options={'SymmetricMode': True})
+        lower = spla.splu((L + sp.identity(A.shape[0], format='csr')).tocsc(), **options)
+        upper = spla.splu(U.tocsc(), **options)
+        return lambda r: upper.solve(lower.solve(r))
+    LU = _ilu0_dense(A)
+    return lambda r: scipy.linalg.solve_triangular(
+        LU, scipy.linalg.solve_triangular(LU, r, lower=True, unit_diagonal=True, check_finite=False),
+        lower=False, check_finite=False
+    )
+
+def _cg(A, b, x, M, tol, max_iter, record):
+    # Gradient liên hợp có tiền điều kiện (PCG) cho A đối xứng xác định dương.
+    b_norm = np.linalg.norm(b)
+    r = b - A @ x
+    z = M(r)
+    p = z.copy()
+    rz = r @ z
+    rel_res = np.linalg.norm(r) / b_norm
+    for k in range(1, max_iter + 1):
+        Ap = A @ p
+        pAp = p @ Ap
+        if pAp <= 0:
+            raise ValueError(f"pᵀAp = {pAp:.4e} ≤ 0 tại bước {k}: ma trận không xác định dương, hãy dùng GMRES hoặc BiCGSTAB.")
+        alpha = rz / pAp
+        x_new = x + alpha * p
+        r -= alpha * Ap
+        rel_res = np.linalg.norm(r) / b_norm
+        if record:
+            record(k, x_new, x, rel_res)
+        x = x_new
+        if rel_res < tol:
+            return x, k, rel_res
+        z = M(r)
+        rz_new = r @ z
+        p = z + (rz_new / rz) * p
+        rz = rz_new
+    return x, max_iter, rel_res
+
+def _gmres(A, b, x, M, tol, max_iter, record, restart):
+    # GMRES(m) tiền điều kiện phải: cực tiểu ||b - A(x0 + M⁻¹V_j y)|| trên không gian Krylov,
+    # khởi động lại sau mỗi m bước. Trực giao hóa Gram-Schmidt cổ điển lặp hai lần (vector hóa).
+    n = b.shape[0]
+    b_norm = np.linalg.norm(b)
+    k = 0
+    while k < max_iter:
+        r = b - A @ x
+        beta = np.linalg.norm(r)
+        if beta / b_norm < tol:
+            break
+        m = min(restart, max_iter - k)
+        V = np.zeros((m + 1, n))
+        H = np.zeros((m + 1, m))
+        cs, sn = np.zeros(m), np.zeros(m)
+        g = np.zeros(m + 1)
+        g[0] = beta
+        V[0] = r / beta
+        x_cycle = x
+        for j in range(m):
+            w = A @ M(V[j])
+            for _ in range(2):
+                h = V[:j+1] @ w
+                w -= V[:j+1].T @ h
+                H[:j+1, j] += h
+            H[j+1, j] = np.linalg.norm(w)
+            breakdown = H[j+1, j] <= np.finfo(float).eps * beta
+            if not breakdown:
+                V[j+1] = w / H[j+1, j]
+            # Áp dụng các phép quay Givens trước đó rồi tạo phép quay mới để khử H[j+1, j]
+            for i in range(j):
+                H[i, j], H[i+1, j] = cs[i] * H[i, j] + sn[i] * H[i+1, j], -sn[i] * H[i, j] + cs[i] * H[i+1, j]
+            denom = np.hypot(H[j, j], H[j+1, j])
+            cs[j], sn[j] = H[j, j] / denom, H[j+1, j] / denom
+            H[j, j], H[j+1, j] = denom, 0.0
+            g[j+1] = -sn[j] * g[j]
+            g[j] = cs[j] * g[j]
+            k += 1
+            rel_res = abs(g[j+1]) / b_norm
+            done = rel_res < tol or breakdown or k >= max_iter
+            # Nghiệm x_k chỉ được tạo khi cần lưu vết hoặc ở bước cuối của chu kỳ
+            if done or record or j == m - 1:
+                y = scipy.linalg.solve_triangular(H[:j+1, :j+1], g[:j+1], check_finite=False)
+                x_new = x + M(V[:j+1].T @ y)
+                if record:
+                    record(k, x_new, x_cycle, rel_res)
+                x_cycle = x_new
+            if done:
+                break
+        x = x_cycle
+        if breakdown:
+            break
+    # Sai số dư thực sự (ước lượng từ các phép quay Givens có thể lệch do sai số làm tròn)
+    return x, k, np.linalg.norm(b - A @ x) / b_norm
+
+def _bicgstab(A, b, x, M, tol, max_iter, record):
+    # BiCGSTAB tiền điều kiện phải (van der Vorst) cho ma trận không đối xứng.
+    b_norm = np.linalg.norm(b)
+    r = b - A @ x
+    r_hat = r.copy()
+    rho_old = alpha = omega = 1.0
+    v = np.zeros_like(b)
+    p = np.zeros_like(b)
+    rel_res = np.linalg.norm(r) / b_norm
+    for k in range(1, max_iter + 1):
+        rho = r_hat @ r
+        if rho == 0:
+            raise ValueError(f"BiCGSTAB bị gián đoạn tại bước {k} (ρ = 0), hãy thử GMRES.")
+        p = r if k == 1 else r + (rho / rho_old) * (alpha / omega) * (p - omega * v)
+        p_hat = M(p)
+        v = A @ p_hat
+        alpha = rho / (r_hat @ v)
+        s = r - alpha * v
+        s_norm = np.linalg.norm(s)
+        if s_norm / b_norm < tol:
+            x_new = x + alpha * p_hat
+            rel_res = s_norm / b_norm
+            if record:
+                record(k, x_new, x, rel_res)
+            return x_new, k, rel_res
+        s_hat = M(s)
+        t = A @ s_hat
+        omega = (t @ s) / (t @ t)
+        x_new = x + alpha * p_hat + omega * s_hat
+        r = s - omega * t
+        rel_res = np.linalg.norm(r) / b_norm
+        if record:
+            record(k, x_new, x, rel_res)
+        x = x_new
+        if rel_res < tol:
+            return x, k, rel_res
+        if omega == 0:
+            raise ValueError(f"BiCGSTAB bị gián đoạn tại bước {k} (ω = 0), hãy thử GMRES.")
+        rho_old = rho
+    return x, max_iter, rel_res
+
+def krylov_solve(A, b, x0=None, method='gmres', preconditioner='none', tol=1e-8, max_iter=1000,
+                 restart=DEFAULT_GMRES_RESTART, trace='full'):
+    """
+    Giải hệ Ax = b bằng phương pháp Krylov: 'cg' (A đối xứng xác định dương), 'gmres' (GMRES(m)) hoặc 'bicgstab'.
+    A có thể là ma trận đặc hoặc thưa (scipy.sparse); b là một vector (một vế phải).
+    Dừng khi sai số dư tương đối ||b - Ax_k|| / ||b|| < tol.
+    trace: mức lưu vết các bước lặp ('none', 'summary', 'full').
+    """
+    if method not in KRYLOV_METHODS:
+        raise ValueError(f"Phương pháp '{method}' không hợp lệ. Chỉ hỗ trợ: {', '.join(KRYLOV_METHODS)}.")
+    sparse = sp.issparse(A)
+    A = A.tocsr() if sparse else np.asarray(A, dtype=float)
+    n = A.shape[0]
+    if n != A.shape[1]:
+        raise ValueError("Ma trận A phải là ma trận vuông.")
+    b = np.asarray(b, dtype=float)
+    if b.ndim == 2 and b.shape[1] != 1:
+        raise ValueError("Phương pháp Krylov chỉ hỗ trợ một vế phải b (một vector cột).")
+    b = b.reshape(-1)
+    if b.shape[0] != n:
+        raise ValueError(f"Số hàng của b ({b.shape[0]}) không khớp với kích thước của A ({n}).")
+    x = np.zeros(n) if x0 is None else np.array(x0, dtype=float).reshape(-1)
+    if x.shape[0] != n:
+        raise ValueError(f"Kích thước của x0 ({x.shape[0]}) không khớp với kích thước của A ({n}).")
+    if max_iter < 1:
+        raise ValueError("Số lần lặp tối đa phải lớn hơn 0.")
+    if method == 'gmres' and restart < 1:
+        raise ValueError("Số bước khởi động lại m của GMRES phải lớn hơn 0.")
+
+    if method == 'cg':
+        asymmetry = abs(A - A.T).max() if sparse else np.max(np.abs(A - A.T))
+        if asymmetry > 1e-12 * max(abs(A).max(), 1.0):
+            raise ValueError("Phương pháp CG yêu cầu ma trận A đối xứng, hãy dùng GMRES hoặc BiCGSTAB.")
+
+    if not np.any(b):
+        x, iterations, rel_res = np.zeros(n), 0, 0.0
+        iterations_data = []
+    else:
+        M = make_preconditioner(A, preconditioner)
+        iterations_data = []
+
+        def record(k, x_new, x_old, rel_res):
+            iterations_data.append({
+                "k": k,
+                "x_k": trace_snapshot(x_new.reshape(-1, 1), trace),
+                "error": float(rel_res),
+                "diff_norm": float(np.linalg.norm(x_new - x_old, np.inf))
+            })
+        if trace == 'none':
+            record = None
+
+        if method == 'cg':
+            x, iterations, rel_res = _cg(A, b, x, M, tol, max_iter, record)
+        elif method == 'gmres':
+            x, iterations, rel_res = _gmres(A, b, x, M, tol, max_iter, record, restart)
+        else:
+            x, iterations, rel_res = _bicgstab(A, b, x, M, tol, max_iter, record)
+
+        if not rel_res < tol:
+            raise ValueError(f"Phương pháp không hội tụ sau {max_iter} lần lặp. Sai số dư tương đối cuối cùng là {rel_res:.2e}.")
+
+    return {
+        "status": "success",
+        "method": method,
+        # tol là sai số dư tương đối nên ngưỡng làm tròn về 0 cũng tương đối theo ||x||∞
+        "solution": zero_small(x.reshape(-1, 1), tol * np.max(np.abs(x), initial=0.0)),
+        "iterations": iterations,
+        "iterations_data": iterations_data,
+        "relative_residual": float(rel_res),
+        "preconditioner": preconditioner,
+        "restart": restart if method == 'gmres' else None
+    }
@@ -1,8 +1,13 @@
 import numpy as np
-from backend.utils.helpers import zero_small
+import scipy.sparse as sp
+from backend.utils.helpers import zero_small, trace_snapshot, matrix_norm
 
-def simple_iteration(B, d, x0, tol=1e-5, max_iter=100, norm_choice='inf'):
+def simple_iteration(B, d, x0, tol=1e-5, max_iter=100, norm_choice='inf', trace='full'):
     # Giải hệ phương trình x = Bx + d bằng phương pháp lặp đơn.
+    # trace: mức lưu vết các bước lặp ('none', 'summary', 'full').
+    # B có thể là ma trận thưa (scipy.sparse), khi đó mỗi bước lặp là một phép nhân ma trận thưa - vector.
+    if sp.issparse(B):
+        B = B.tocsr()
     if B.shape[0] != B.shape[1]:
         raise ValueError(f"Ma trận B phải là ma trận vuông. Kích thước hiện tại: {B.shape}")
     if d.ndim == 1:
@@ -15,7 +20,7 @@ def simple_iteration(B, d, x0, tol=1e-5, max_iter=100, norm_choice='inf'):
         raise ValueError(f"Kích thước của d ({d.shape}) và x0 ({x0.shape}) phải giống nhau.")
 
     norm = np.inf if norm_choice == 'inf' else 1
-    norm_B = np.linalg.norm(B, norm)
+    norm_B = matrix_norm(B, norm)
     
     warning_message = None
     if norm_B >= 1:
@@ -32,14 +37,15 @@ def simple_iteration(B, d, x0, tol=1e-5, max_iter=100, norm_choice='inf'):
         stopping_threshold = abs((1 - norm_B) / norm_B) * tol
 
     x_k = x0.copy()
-    iterations_data = [{'k': 0, 'x_k': x_k, 'error': None}]
+    iterations_data = [{'k': 0, 'x_k': trace_snapshot(x_k, trace), 'error': None}] if trace != 'none' else []
     
     for k in range(1, max_iter + 1):
         x_k_plus_1 = B @ x_k + d
         error = np.linalg.norm(x_k_plus_1 - x_k, norm)
         x_k = x_k_plus_1
         
-        iterations_data.append({'k': k, 'x_k': x_k, 'error': error})
+        if trace != 'none':
+            iterations_data.append({'k': k, 'x_k': trace_snapshot(x_k, trace), 'error': error})
         
         if error < stopping_threshold:
             return {
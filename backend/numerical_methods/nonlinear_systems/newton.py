@@ -1,17 +1,64 @@
 # backend/numerical_methods/nonlinear_systems/newton.py
 import numpy as np
-from sympy import symbols, sympify, Matrix, latex
+from sympy import latex
+from backend.utils.expression_parser import compile_system
 
-def solve_newton_system(n, expr_list, x0_list, stop_option, stop_value, norm_choice, max_iter=200):
+NEWTON_ENGINES = ('compiled', 'trace')
+
+def _compiled_step(system):
+    """
+    Bước lặp Newton trên các hàm NumPy đã lambdify: giải J(X_k)·ΔX = F(X_k)
+    bằng np.linalg.solve thay vì nghịch đảo ma trận Jacobi.
+    """
+    F_num, J_num = system["F_num"], system["J_num"]
+
+    def step(X, k):
+        F_val = np.asarray(F_num(*X), dtype=float).reshape(-1)
+        J_val = np.asarray(J_num(*X), dtype=float)
+
+        if not np.all(np.isfinite(J_val)) or np.linalg.cond(J_val) > 1 / np.finfo(float).eps:
+            raise ValueError(f"Ma trận Jacobi suy biến tại bước lặp {k+1}.")
+
+        return X - np.linalg.solve(J_val, F_val)
+
+    return step
+
+def _symbolic_step(system, n):
+    """
+    Bước lặp Newton trên ma trận SymPy (chế độ 'trace'): thế giá trị, tính det và J⁻¹.
+    """
+    variables, F, J = system["variables"], system["F"], system["J"]
+
+    def step(X, k):
+        subs = {variables[i]: X[i] for i in range(n)}
+        F_val = F.subs(subs).evalf()
+        J_val = J.subs(subs).evalf()
+
+        if abs(J_val.det().evalf()) < 1e-12:
+            raise ValueError(f"Ma trận Jacobi suy biến tại bước lặp {k+1}.")
+
+        # Công thức lặp Newton: X_k+1 = X_k - J(X_k)^-1 * F(X_k)
+        delta_X = J_val.inv() * F_val
+        return X - np.array(delta_X.tolist(), dtype=float).flatten()
+
+    return step
+
+def solve_newton_system(n, expr_list, x0_list, stop_option, stop_value, norm_choice, max_iter=200, engine='compiled', trace='full'):
     """
     Giải hệ phương trình phi tuyến F(X) = 0 bằng phương pháp Newton.
+    - engine='compiled': F và J được lambdify một lần, mỗi bước giải hệ tuyến tính bằng NumPy.
+    - engine='trace': tính toán symbolic bằng SymPy ở mỗi bước (chậm, dùng để đối chiếu).
+    trace='none' bỏ qua bảng các bước lặp (chỉ trả về nghiệm và số lần lặp).
     """
+    if engine not in NEWTON_ENGINES:
+        raise ValueError(f"Chế độ tính '{engine}' không hợp lệ. Chỉ hỗ trợ: {', '.join(NEWTON_ENGINES)}.")
+
     try:
-        # 1. Khởi tạo các biến symbolic và ma trận
-        variables = symbols(f'x1:{n+1}')
-        F = Matrix([sympify(expr) for expr in expr_list])
-        X = Matrix(x0_list)
-        J = F.jacobian(variables)
+        # 1. Khởi tạo các biến symbolic, ma trận và hàm đã biên dịch
+        system = compile_system(expr_list, n)
+        J = system["J"]
+        step = _compiled_step(system) if engine == 'compiled' else _symbolic_step(system, n)
+        X = np.array(x0_list, dtype=float)
         iterations_data = []
 
         # 2. Vòng lặp chính
@@ -19,44 +66,29 @@ def solve_newton_system(n, expr_list, x0_list, stop_option, stop_value, norm_cho
         if stop_option == 'iterations':
             max_iter = int(stop_value)
             for k in range(max_iter):
-                F_val = F.subs({variables[i]: X[i] for i in range(n)}).evalf()
-                J_val = J.subs({variables[i]: X[i] for i in range(n)}).evalf()
-
-                if abs(J_val.det().evalf()) < 1e-12:
-                    raise ValueError(f"Ma trận Jacobi suy biến tại bước lặp {k+1}.")
-                
-                # Công thức lặp Newton: X_k+1 = X_k - J(X_k)^-1 * F(X_k)
-                delta_X = J_val.inv() * F_val
-                X = X - delta_X
-                
+                X = step(X, k)
+
                 step_info = {f"x{i+1}": float(X[i]) for i in range(n)}
                 step_info['k'] = k + 1
                 iterations_data.append(step_info)
-        
+
         # TH2: Dừng theo sai số
         else:
             tol = float(stop_value)
             for k in range(max_iter):
                 X_prev = X.copy()
-                F_val = F.subs({variables[i]: X[i] for i in range(n)}).evalf()
-                J_val = J.subs({variables[i]: X[i] for i in range(n)}).evalf()
-
-                if abs(J_val.det().evalf()) < 1e-12:
-                    raise ValueError(f"Ma trận Jacobi suy biến tại bước lặp {k+1}.")
-
-                delta_X = J_val.inv() * F_val
-                X = X - delta_X
+                X = step(X, k)
 
                 # Tính toán sai số
-                diff_vec = np.array(X.tolist(), dtype=float) - np.array(X_prev.tolist(), dtype=float)
-                
+                diff_vec = X - X_prev
+
                 if norm_choice == '1':
                     error = float(np.linalg.norm(diff_vec, 1))
-                    norm_X = float(np.linalg.norm(np.array(X.tolist(), dtype=float), 1))
+                    norm_X = float(np.linalg.norm(X, 1))
                 else: # Mặc định là chuẩn vô cùng
                     error = float(np.linalg.norm(diff_vec, np.inf))
-                    norm_X = float(np.linalg.norm(np.array(X.tolist(), dtype=float), np.inf))
-                
+                    norm_X = float(np.linalg.norm(X, np.inf))
+
                 rel_err = error / norm_X if norm_X > 1e-12 else float('inf')
 
                 step_info = {f"x{i+1}": float(X[i]) for i in range(n)}
@@ -70,20 +102,21 @@ def solve_newton_system(n, expr_list, x0_list, stop_option, stop_value, norm_cho
                     break
             else: # Nếu vòng lặp kết thúc mà không break
                 raise ValueError(f"Phương pháp không hội tụ sau {max_iter} lần lặp.")
-        
+
         # 3. Chuẩn bị kết quả trả về
         # Chuyển ma trận Jacobi symbolic sang LaTeX
         try:
             J_latex = [[latex(elem) for elem in row] for row in J.tolist()]
         except Exception:
             J_latex = [[str(elem) for elem in row] for row in J.tolist()]
-            
+
         return {
             "status": "success",
             "solution": [float(val) for val in X],
             "iterations": len(iterations_data),
             "jacobian_matrix_latex": J_latex,
-            "steps": iterations_data,
+            "engine": engine,
+            "steps": iterations_data if trace != 'none' else [],
             "message": f"Hội tụ sau {len(iterations_data)} lần lặp."
         }
 
@@ -91,4 +124,4 @@ def solve_newton_system(n, expr_list, x0_list, stop_option, stop_value, norm_cho
         raise e # Ném lại lỗi để route xử lý
     except Exception as e:
         import traceback
-        raise Exception(f"Lỗi không xác định trong thuật toán: {str(e)}\n{traceback.format_exc()}")
\ No newline at end of file
+        raise Exception(f"Lỗi không xác định trong thuật toán: {str(e)}\n{traceback.format_exc()}")
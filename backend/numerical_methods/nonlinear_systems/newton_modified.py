@@ -1,16 +1,18 @@
 # backend/numerical_methods/nonlinear_systems/newton_modified.py
 import numpy as np
-from sympy import symbols, sympify, Matrix
+from sympy import symbols, Matrix
+from backend.utils.expression_parser import sympify_expression
 
-def solve_newton_modified_system(n, expr_list, x0_list, stop_option, stop_value, norm_choice, max_iter=200):
+def solve_newton_modified_system(n, expr_list, x0_list, stop_option, stop_value, norm_choice, max_iter=200, trace='full'):
     """
     Giải hệ phương trình phi tuyến F(X) = 0 bằng phương pháp Newton cải tiến.
     Ma trận Jacobi chỉ được tính và nghịch đảo một lần tại X_0.
+    trace='none' bỏ qua bảng các bước lặp (chỉ trả về nghiệm và số lần lặp).
     """
     try:
         # 1. Khởi tạo
         variables = symbols(f'x1:{n+1}')
-        F = Matrix([sympify(expr) for expr in expr_list])
+        F = Matrix([sympify_expression(expr) for expr in expr_list])
         X = Matrix(x0_list)
         J = F.jacobian(variables)
         
@@ -69,7 +71,7 @@ def solve_newton_modified_system(n, expr_list, x0_list, stop_option, stop_value,
             "solution": [float(val) for val in X],
             "iterations": len(iterations_data),
             "J0_inv_matrix": [[float(v) for v in row] for row in J0_inv.tolist()],
-            "steps": iterations_data,
+            "steps": iterations_data if trace != 'none' else [],
             "message": f"Hội tụ sau {len(iterations_data)} lần lặp."
         }
     except (ValueError, TypeError) as e:
@@ -1,6 +1,7 @@
 # backend/numerical_methods/nonlinear_systems/simple_iteration.py
 import numpy as np
-from sympy import symbols, sympify, Matrix, lambdify
+from sympy import symbols, Matrix, lambdify
+from backend.utils.expression_parser import sympify_expression
 from scipy.optimize import differential_evolution
 import traceback
 
@@ -14,13 +15,14 @@ def find_global_maximum_on_box(func, variables, bounds):
     except Exception:
         return -np.inf
 
-def solve_simple_iteration_system(n, expr_list, x0_list, a0_list, b0_list, stop_option, stop_value):
+def solve_simple_iteration_system(n, expr_list, x0_list, a0_list, b0_list, stop_option, stop_value, trace='full'):
     """
     Giải hệ phương trình phi tuyến X = phi(X) bằng phương pháp lặp đơn.
+    trace='none' bỏ qua bảng các bước lặp (chỉ trả về nghiệm và số lần lặp).
     """
     try:
         variables = symbols(f'x1:{n+1}')
-        phi = Matrix([sympify(expr) for expr in expr_list])
+        phi = Matrix([sympify_expression(expr) for expr in expr_list])
         X = Matrix(x0_list)
         bounds = list(zip(a0_list, b0_list))
         J = phi.jacobian(variables)
@@ -95,7 +97,7 @@ def solve_simple_iteration_system(n, expr_list, x0_list, a0_list, b0_list, stop_
             "status": "success",
             "solution": [float(val) for val in X],
             "iterations": len(iterations_data),
-            "steps": iterations_data,
+            "steps": iterations_data if trace != 'none' else [],
             "message": f"Hội tụ sau {len(iterations_data)} lần lặp.",
             "J_max_vals": J_max_vals.tolist(),
             "max_row_sum": float(max_row_sum),
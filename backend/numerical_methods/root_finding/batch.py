@@ -0,0 +1,294 @@
+# backend/numerical_methods/root_finding/batch.py
+import numpy as np
+
+# Giải đồng thời nhiều bài toán f(x) = y_i trên các khoảng [a_i, b_i] ("làn").
+# Mỗi làn lặp song song trên mảng NumPy; làn nào hội tụ hoặc gặp lỗi thì bị
+# loại khỏi tập đang chạy (mặt nạ active) thay vì ném lỗi cho cả lô.
+
+def _evaluate(func, x):
+    """
+    Gọi hàm đã lambdify trên mảng x; hàm hằng (vd. f'(x) = 2) trả về số vô hướng
+    nên cần broadcast lại theo kích thước của x.
+    """
+    with np.errstate(all='ignore'):
+        return np.broadcast_to(np.asarray(func(x), dtype=float), x.shape).copy()
+
+def _shifted(f, targets):
+    """
+    Trả về g(x, idx) = f(x) - y[idx], với x có thể là (L,) hoặc (L, S) điểm mẫu.
+    """
+    def g(x, idx):
+        t = targets[idx].reshape((-1,) + (1,) * (x.ndim - 1))
+        return _evaluate(f, x) - t
+    return g
+
+def _init_lanes(num_lanes):
+    return {
+        "solutions": np.full(num_lanes, np.nan),
+        "iterations": np.zeros(num_lanes, dtype=int),
+        "converged": np.zeros(num_lanes, dtype=bool),
+        "errors": np.full(num_lanes, np.nan),
+        "messages": [None] * num_lanes
+    }
+
+def _fail(lanes, active, idx, mask, message):
+    """
+    Đánh dấu lỗi cho các làn idx[mask] và loại chúng khỏi tập đang chạy.
+    message có thể là chuỗi hoặc hàm nhận chỉ số làn.
+    """
+    for lane in idx[mask]:
+        lanes["messages"][lane] = message(lane) if callable(message) else message
+    active[idx[mask]] = False
+
+def _check_sign_conditions(g_prime, g_double_prime, a, b, idx, lanes, active, message):
+    """
+    Kiểm tra f'(x), f''(x) không đổi dấu trên [a_i, b_i] cho từng làn (20 điểm mẫu).
+    """
+    x_check = np.linspace(a[idx], b[idx], 20, axis=1)
+    for func in (g_prime, g_double_prime):
+        values = _evaluate(func, x_check)
+        finite = np.all(np.isfinite(values), axis=1)
+        _fail(lanes, active, idx, ~finite, "Không thể kiểm tra đạo hàm trên khoảng [a, b].")
+        mixed = np.any(values > 1e-9, axis=1) & np.any(values < -1e-9, axis=1)
+        _fail(lanes, active, idx, finite & mixed, message)
+
+def _derivative_bounds(func, a, b, idx):
+    """
+    Tính min và max của |func| trên [a_i, b_i] cho từng làn (500 điểm mẫu).
+    """
+    values = np.abs(_evaluate(func, np.linspace(a[idx], b[idx], 500, axis=1)))
+    return np.min(values, axis=1), np.max(values, axis=1)
+
+def _finish(lanes, active, mode, max_iter):
+    """
+    Các làn còn chạy sau vòng lặp cuối: hội tụ nếu dừng theo số lần lặp, ngược lại báo lỗi.
+    """
+    if mode == 'iterations':
+        lanes["converged"][active] = True
+    else:
+        for lane in np.flatnonzero(active):
+            lanes["messages"][lane] = f"Phương pháp không hội tụ sau {max_iter} lần lặp."
+    lanes["converged"] &= np.isfinite(lanes["solutions"])
+    return lanes
+
+def bisection_batch(f, a, b, mode, value, targets=None, max_iter=200):
+    """
+    Phương pháp chia đôi chạy đồng thời trên nhiều khoảng [a_i, b_i] cho f(x) = y_i.
+    """
+    a = np.array(a, dtype=float)
+    b = np.array(b, dtype=float)
+    targets = np.zeros_like(a) if targets is None else np.array(targets, dtype=float)
+    g = _shifted(f, targets)
+
+    L = a.size
+    lanes = _init_lanes(L)
+    active = np.ones(L, dtype=bool)
+    all_idx = np.arange(L)
+
+    # Kiểm tra điều kiện cách ly nghiệm
+    fa = g(a, all_idx)
+    fb = g(b, all_idx)
+    _fail(lanes, active, all_idx, ~(fa * fb < 0),
+          lambda i: f"Khoảng [{a[i]}, {b[i]}] không phải là khoảng cách ly nghiệm vì f(a)={fa[i]:.4f} và f(b)={fb[i]:.4f} không trái dấu.")
+
+    c_prev = a.copy()
+    n_iters = int(value) if mode == 'iterations' else max_iter
+    tol = None if mode == 'iterations' else float(value)
+
+    for i in range(n_iters):
+        idx = np.flatnonzero(active)
+        if idx.size == 0:
+            break
+
+        c = (a[idx] + b[idx]) / 2
+        fc = g(c, idx)
+        error = np.abs(c - c_prev[idx])
+
+        lanes["solutions"][idx] = c
+        lanes["iterations"][idx] = i + 1
+        lanes["errors"][idx] = error
+
+        # Điều kiện dừng của từng làn
+        done = fc == 0.0
+        if mode == 'absolute_error':
+            done |= error < tol
+        elif mode == 'relative_error':
+            with np.errstate(divide='ignore', invalid='ignore'):
+                relative_error = np.where(np.abs(c) > 1e-15, error / np.abs(c), np.inf)
+            done |= relative_error < tol
+        lanes["converged"][idx[done]] = True
+        active[idx[done]] = False
+
+        # Cập nhật khoảng cho các làn còn lại
+        left = fa[idx] * fc < 0
+        keep = ~done
+        b[idx[keep & left]] = c[keep & left]
+        a[idx[keep & ~left]] = c[keep & ~left]
+        fa[idx[keep & ~left]] = fc[keep & ~left]
+        c_prev[idx] = c
+
+    return _finish(lanes, active, mode, n_iters)
+
+def secant_batch(f, f_prime, f_double_prime, a, b, mode, value, stop_condition, targets=None, max_iter=200):
+    """
+    Phương pháp dây cung chạy đồng thời trên nhiều khoảng [a_i, b_i] cho f(x) = y_i.
+    """
+    a = np.array(a, dtype=float)
+    b = np.array(b, dtype=float)
+    targets = np.zeros_like(a) if targets is None else np.array(targets, dtype=float)
+    g = _shifted(f, targets)
+
+    L = a.size
+    lanes = _init_lanes(L)
+    active = np.ones(L, dtype=bool)
+    idx = np.arange(L)
+
+    # 1. Kiểm tra các điều kiện hội tụ ban đầu
+    fa = g(a, idx)
+    fb = g(b, idx)
+    _fail(lanes, active, idx, ~(fa * fb < 0),
+          lambda i: f"Điều kiện f(a)f(b) < 0 không thỏa mãn. f(a)={fa[i]:.4f}, f(b)={fb[i]:.4f}")
+    idx = np.flatnonzero(active)
+    _check_sign_conditions(f_prime, f_double_prime, a, b, idx, lanes, active,
+                           "Điều kiện hội tụ f'(x) và f''(x) không đổi dấu trên [a, b] không thỏa mãn.")
+
+    # 2. Chọn điểm cố định d (điểm Fourier) và điểm lặp x0
+    fpp_a = _evaluate(f_double_prime, a)
+    fpp_b = _evaluate(f_double_prime, b)
+    fpp_mid = _evaluate(f_double_prime, (a + b) / 2)
+    use_a = fa * fpp_a > 0
+    use_b = ~use_a & (fb * fpp_b > 0)
+    use_a_mid = ~use_a & ~use_b & (fa * fpp_mid > 0)
+    use_b_mid = ~use_a & ~use_b & ~use_a_mid & (fb * fpp_mid > 0)
+    d_is_a = use_a | use_a_mid
+    d = np.where(d_is_a, a, b)
+    x0 = np.where(d_is_a, b, a)
+    idx = np.flatnonzero(active)
+    _fail(lanes, active, idx, ~(d_is_a | use_b | use_b_mid)[idx],
+          "Không tìm thấy điểm Fourier phù hợp để đảm bảo hội tụ.")
+
+    # 3. Tính các hằng số m1, M1
+    m1 = np.full(L, np.nan)
+    M1 = np.full(L, np.nan)
+    idx = np.flatnonzero(active)
+    if idx.size:
+        m1[idx], M1[idx] = _derivative_bounds(f_prime, a, b, idx)
+        _fail(lanes, active, idx, ~(m1[idx] >= 1e-12),
+              "Đạo hàm f'(x) có giá trị gần bằng 0 trong khoảng, công thức sai số không đáng tin cậy.")
+
+    # 4. Quá trình lặp
+    x_curr = x0.copy()
+    f_d = g(d, np.arange(L))
+    n_iters = int(value) if mode == 'iterations' else max_iter
+    tol = float(value)
+
+    for i in range(n_iters):
+        idx = np.flatnonzero(active)
+        if idx.size == 0:
+            break
+
+        f_curr = g(x_curr[idx], idx)
+        denominator = f_curr - f_d[idx]
+        bad = ~(np.abs(denominator) >= 1e-15)
+        _fail(lanes, active, idx, bad, "Mẫu số f(x_n) - f(d) tiến tới 0, không thể tiếp tục.")
+        idx, f_curr, denominator = idx[~bad], f_curr[~bad], denominator[~bad]
+
+        x_prev = x_curr[idx]
+        x_new = x_prev - (f_curr * (x_prev - d[idx])) / denominator
+        x_curr[idx] = x_new
+        lanes["solutions"][idx] = x_new
+        lanes["iterations"][idx] = i + 1
+
+        # Đánh giá sai số và kiểm tra điều kiện dừng
+        if mode in ('absolute_error', 'relative_error'):
+            if stop_condition == 'xn_x_prev':
+                error = ((M1[idx] - m1[idx]) / m1[idx]) * np.abs(x_new - x_prev)
+            else:
+                error = np.abs(f_curr) / m1[idx]
+            if mode == 'relative_error':
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    error = np.where(np.abs(x_new) < 1e-12, np.inf, error / np.abs(x_new))
+            lanes["errors"][idx] = error
+            done = error < tol
+            lanes["converged"][idx[done]] = True
+            active[idx[done]] = False
+
+    result = _finish(lanes, active, mode, n_iters)
+    result.update({"m1": m1, "M1": M1, "d": d, "x0": x0})
+    return result
+
+def newton_batch(f, f_prime, f_double_prime, a, b, x0, mode, value, stop_condition, targets=None, max_iter=200):
+    """
+    Phương pháp Newton chạy đồng thời trên nhiều khoảng [a_i, b_i] với điểm đầu x0_i cho f(x) = y_i.
+    """
+    a = np.array(a, dtype=float)
+    b = np.array(b, dtype=float)
+    x0 = np.array(x0, dtype=float)
+    targets = np.zeros_like(a) if targets is None else np.array(targets, dtype=float)
+    g = _shifted(f, targets)
+
+    L = a.size
+    lanes = _init_lanes(L)
+    active = np.ones(L, dtype=bool)
+
+    # 1. Kiểm tra điều kiện hội tụ (f', f'' không đổi dấu)
+    _check_sign_conditions(f_prime, f_double_prime, a, b, np.arange(L), lanes, active,
+                           "Điều kiện hội tụ: f'(x) và f''(x) phải không đổi dấu trên [a, b].")
+
+    # 2. Tính các hằng số m1, M2
+    m1 = np.full(L, np.nan)
+    M2 = np.full(L, np.nan)
+    idx = np.flatnonzero(active)
+    if idx.size:
+        m1[idx], _ = _derivative_bounds(f_prime, a, b, idx)
+        _, M2[idx] = _derivative_bounds(f_double_prime, a, b, idx)
+        _fail(lanes, active, idx, ~(m1[idx] >= 1e-12),
+              "Đạo hàm f'(x) có giá trị gần bằng 0 trong khoảng, công thức sai số không đáng tin cậy.")
+
+    # 3. Quá trình lặp
+    x_k = x0.copy()
+    n_iters = int(value) if mode == 'iterations' else max_iter
+    tol = float(value)
+
+    for k in range(n_iters):
+        idx = np.flatnonzero(active)
+        if idx.size == 0:
+            break
+
+        f_xk = g(x_k[idx], idx)
+        df_xk = _evaluate(f_prime, x_k[idx])
+        bad = ~(np.abs(df_xk) >= 1e-12)
+        _fail(lanes, active, idx, bad, lambda i: f"Đạo hàm bằng 0 tại x = {x_k[i]}. Không thể tiếp tục.")
+        idx, f_xk, df_xk = idx[~bad], f_xk[~bad], df_xk[~bad]
+
+        x_next = x_k[idx] - f_xk / df_xk
+
+        # Kiểm tra điểm lặp có nằm ngoài khoảng không
+        outside = ~((a[idx] <= x_next) & (x_next <= b[idx]))
+        for lane, x_out in zip(idx[outside], x_next[outside]):
+            lanes["messages"][lane] = f"Điểm lặp x_{k+1} = {x_out:.6f} nằm ngoài khoảng [{a[lane]}, {b[lane]}]."
+        active[idx[outside]] = False
+        inside = ~outside
+        idx, x_prev, x_next = idx[inside], x_k[idx[inside]], x_next[inside]
+
+        x_k[idx] = x_next
+        lanes["solutions"][idx] = x_next
+        lanes["iterations"][idx] = k + 1
+
+        # Đánh giá sai số và kiểm tra điều kiện dừng
+        if mode in ('absolute_error', 'relative_error'):
+            if stop_condition == 'xn_x_prev':
+                error = (M2[idx] / (2 * m1[idx])) * (x_next - x_prev)**2
+            else:
+                error = np.abs(g(x_next, idx)) / m1[idx]
+            if mode == 'relative_error':
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    error = np.where(np.abs(x_next) < 1e-12, np.inf, error / np.abs(x_next))
+            lanes["errors"][idx] = error
+            done = error < tol
+            lanes["converged"][idx[done]] = True
+            active[idx[done]] = False
+
+    result = _finish(lanes, active, mode, n_iters)
+    result.update({"m1": m1, "M2": M2, "x0": x0})
+    return result
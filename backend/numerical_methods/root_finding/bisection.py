@@ -1,10 +1,11 @@
 # backend/numerical_methods/root_finding/bisection.py
 import numpy as np
 
-def bisection_method(f, a, b, mode, value, max_iter=200):
+def bisection_method(f, a, b, mode, value, max_iter=200, trace='full'):
     """
     Tìm nghiệm của f(x) = 0 trên khoảng [a, b] bằng phương pháp chia đôi.
     Hàm này chỉ thực hiện tính toán và trả về kết quả thô.
+    trace='none' bỏ qua bảng các bước lặp (chỉ trả về nghiệm và số lần lặp).
     """
     steps = []
     
@@ -43,7 +44,7 @@ def bisection_method(f, a, b, mode, value, max_iter=200):
             else:
                 a = c
                 fa = fc
-        return {"solution": c, "steps": steps, "iterations": len(steps)}
+        return {"solution": c, "steps": steps if trace != 'none' else [], "iterations": len(steps)}
 
     # Xử lý cho sai số tuyệt đối và tương đối
     c_prev = a # Khởi tạo để vòng lặp đầu tiên chạy
@@ -78,4 +79,4 @@ def bisection_method(f, a, b, mode, value, max_iter=200):
     if i >= max_iter:
         raise ValueError(f"Phương pháp không hội tụ sau {max_iter} lần lặp.")
 
-    return {"solution": c, "steps": steps, "iterations": len(steps)}
\ No newline at end of file
+    return {"solution": c, "steps": steps if trace != 'none' else [], "iterations": len(steps)}
\ No newline at end of file
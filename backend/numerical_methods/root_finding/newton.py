@@ -1,9 +1,10 @@
 # backend/numerical_methods/root_finding/newton.py
 import numpy as np
 
-def newton_method(f, f_prime, f_double_prime, a, b, x0, mode, value, stop_condition, max_iter=200):
+def newton_method(f, f_prime, f_double_prime, a, b, x0, mode, value, stop_condition, max_iter=200, trace='full'):
     """
     Tìm nghiệm của f(x) = 0 bằng phương pháp Newton (Tiếp tuyến).
+    trace='none' bỏ qua bảng các bước lặp (chỉ trả về nghiệm và số lần lặp).
     """
     steps = []
 
@@ -75,4 +76,4 @@ def newton_method(f, f_prime, f_double_prime, a, b, x0, mode, value, stop_condit
     if not done and mode != 'iterations':
         raise ValueError(f"Phương pháp không hội tụ sau {iterations_to_run} lần lặp.")
 
-    return {"solution": x_k, "iterations": len(steps), "steps": steps, "m1": m1, "M2": M2, "x0": x0}
\ No newline at end of file
+    return {"solution": x_k, "iterations": len(steps), "steps": steps if trace != 'none' else [], "m1": m1, "M2": M2, "x0": x0}
\ No newline at end of file
@@ -1,9 +1,10 @@
 # backend/numerical_methods/root_finding/secant.py
 import numpy as np
 
-def secant_method(f, f_prime, f_double_prime, a, b, mode, value, stop_condition, max_iter=200):
+def secant_method(f, f_prime, f_double_prime, a, b, mode, value, stop_condition, max_iter=200, trace='full'):
     """
     Tìm nghiệm của f(x) = 0 bằng phương pháp Dây cung (Secant).
+    trace='none' bỏ qua bảng các bước lặp (chỉ trả về nghiệm và số lần lặp).
     """
     steps = []
 
@@ -86,4 +87,4 @@ def secant_method(f, f_prime, f_double_prime, a, b, mode, value, stop_condition,
     if i >= max_iter -1 and not done and mode != 'iterations':
         raise ValueError(f"Không hội tụ sau {max_iter} lần lặp.")
 
-    return {"solution": x_curr, "steps": steps, "iterations": len(steps), "m1": m1, "M1": M1, "d": d, "x0": x0}
\ No newline at end of file
+    return {"solution": x_curr, "steps": steps if trace != 'none' else [], "iterations": len(steps), "m1": m1, "M1": M1, "d": d, "x0": x0}
\ No newline at end of file
@@ -1,9 +1,10 @@
 # backend/numerical_methods/root_finding/simple_iteration.py
 import numpy as np
 
-def simple_iteration_method(phi, phi_prime, a, b, x0, mode, value, max_iter=200):
+def simple_iteration_method(phi, phi_prime, a, b, x0, mode, value, max_iter=200, trace='full'):
     """
     Tìm nghiệm của x = phi(x) bằng phương pháp lặp đơn.
+    trace='none' bỏ qua bảng các bước lặp (chỉ trả về nghiệm và số lần lặp).
     """
     # 1. Kiểm tra điều kiện cách ly nghiệm f(x) = phi(x) - x
     f = lambda x: phi(x) - x
@@ -61,4 +62,4 @@ def simple_iteration_method(phi, phi_prime, a, b, x0, mode, value, max_iter=200)
     if not done and mode != 'iterations':
         raise ValueError(f"Phương pháp không hội tụ sau {iterations_to_run} lần lặp.")
 
-    return {"solution": x_k, "iterations": len(steps), "steps": steps, "q": q, "x0": x0}
\ No newline at end of file
+    return {"solution": x_k, "iterations": len(steps), "steps": steps if trace != 'none' else [], "q": q, "x0": x0}
\ No newline at end of file
@@ -9,6 +9,7 @@ from backend.numerical_methods.horner_table.w_function import calculate_w_functi
 from backend.api_formatters.horner_table import format_w_function_result
 from backend.numerical_methods.horner_table.change_variables import change_variables
 from backend.api_formatters.horner_table import format_change_variables_result
+from backend.routes.trace_routes import page_trace
 import traceback
 
 horner_bp = Blueprint('horner', __name__, url_prefix='/api/horner')
@@ -68,7 +69,7 @@ def all_derivatives_route():
 
         formatted_result = format_all_derivatives_result(result)
 
-        return jsonify(formatted_result)
+        return jsonify(page_trace(formatted_result))
 
     except (ValueError, TypeError) as e:
         return jsonify({"error": str(e)}), 400
@@ -93,7 +94,7 @@ def reverse_horner_route():
         result['root'] = root
 
         formatted_result = format_reverse_horner_result(result)
-        return jsonify(formatted_result)
+        return jsonify(page_trace(formatted_result))
 
     except (ValueError, TypeError) as e:
         return jsonify({"error": str(e)}), 400
@@ -113,7 +114,7 @@ def w_function_route():
         result = calculate_w_function(roots)
         
         formatted_result = format_w_function_result(result)
-        return jsonify(formatted_result)
+        return jsonify(page_trace(formatted_result))
 
     except (ValueError, TypeError) as e:
         return jsonify({"error": str(e)}), 400
@@ -141,7 +142,7 @@ def change_variables_route():
 
         formatted_result = format_change_variables_result(result)
 
-        return jsonify(formatted_result)
+        return jsonify(page_trace(formatted_result))
 
     except (ValueError, TypeError) as e:
         return jsonify({"error": str(e)}), 400
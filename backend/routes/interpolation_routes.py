@@ -1,5 +1,6 @@
 # backend/routes/interpolation_routes.py
 from flask import Blueprint, request, jsonify
+from backend.routes.trace_routes import page_trace
 from backend.numerical_methods.interpolation.chebyshev_nodes import chebyshev_nodes
 from backend.api_formatters.interpolation import format_chebyshev_nodes_result, format_finite_difference_result
 from backend.numerical_methods.interpolation.lagrange import lagrange_interpolation
@@ -215,7 +216,7 @@ def spline_route():
             return jsonify({"error": "Loại spline không được hỗ trợ."}), 400
 
         formatted_result = format_spline_result(result)
-        return jsonify(formatted_result)
+        return jsonify(page_trace(formatted_result, ('splines',)))
 
     except (ValueError, TypeError) as e:
         return jsonify({"error": str(e)}), 400
@@ -1,9 +1,12 @@
 # backend/routes/linear_algebra_routes.py
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response, stream_with_context
+import json
 import numpy as np
+import scipy.sparse as sp
 from backend.numerical_methods.linear_algebra.direct.gauss_elimination import gauss_elimination
 from backend.api_formatters.linear_algebra import format_gauss_elimination_result
-from backend.utils.helpers import parse_matrix_from_string
+from backend.utils.helpers import parse_matrix_from_string, parse_trace_level, is_blank, parse_flag
+from backend.routes.trace_routes import page_trace
 from backend.numerical_methods.linear_algebra.direct.gauss_jordan import gauss_jordan
 from backend.api_formatters.linear_algebra import format_gauss_jordan_result
 from backend.numerical_methods.linear_algebra.direct.lu_decomposition import solve_lu
@@ -14,38 +17,128 @@ from backend.numerical_methods.linear_algebra.inverse.gauss_jordan_inverse impor
 from backend.api_formatters.linear_algebra import format_inverse_gauss_jordan_result
 from backend.numerical_methods.linear_algebra.inverse.lu_inverse import lu_inverse
 from backend.api_formatters.linear_algebra import format_lu_inverse_result
+from backend.numerical_methods.linear_algebra.inverse.woodbury import woodbury_inverse, WOODBURY_MAX_CONDITION
+from backend.api_formatters.linear_algebra import format_woodbury_result
 from backend.numerical_methods.linear_algebra.inverse.cholesky_inverse import cholesky_inverse
 from backend.api_formatters.linear_algebra import format_cholesky_inverse_result
 from backend.numerical_methods.linear_algebra.inverse.bordering import bordering_inverse
 from backend.api_formatters.linear_algebra import format_bordering_inverse_result
+from backend.numerical_methods.linear_algebra.inverse.bordering_session import (
+    create_bordering_session, append_bordering_session, get_bordering_session, delete_bordering_session
+)
+from backend.api_formatters.linear_algebra import format_bordering_session_result
 from backend.numerical_methods.linear_algebra.iterative.jacobi import jacobi
 from backend.api_formatters.linear_algebra import format_jacobi_result
 from backend.numerical_methods.linear_algebra.iterative.gauss_seidel import gauss_seidel
 from backend.api_formatters.linear_algebra import format_gauss_seidel_result
 from backend.numerical_methods.linear_algebra.iterative.simple_iteration import simple_iteration
 from backend.api_formatters.linear_algebra import format_simple_iteration_result
+from backend.numerical_methods.linear_algebra.iterative.krylov import krylov_solve, DEFAULT_GMRES_RESTART
+from backend.api_formatters.linear_algebra import format_krylov_result
 from backend.numerical_methods.linear_algebra.inverse.jacobi_inverse import jacobi_inverse
 from backend.api_formatters.linear_algebra import format_inverse_jacobi_result
-from backend.numerical_methods.linear_algebra.inverse.newton_inverse import newton_inverse
+from backend.numerical_methods.linear_algebra.inverse.newton_inverse import HYPERPOWER_ORDERS, newton_inverse
 from backend.api_formatters.linear_algebra import format_inverse_newton_result
 from backend.numerical_methods.linear_algebra.inverse.gauss_seidel_inverse import gauss_seidel_inverse
+from backend.numerical_methods.linear_algebra.inverse.block_iterative import parse_engine
 from backend.api_formatters.linear_algebra import format_inverse_gauss_seidel_result
-from backend.numerical_methods.linear_algebra.eigen.svd import svd_numpy, svd_power_deflation
+from backend.numerical_methods.linear_algebra.eigen.svd import SVD_ALGORITHMS, svd_numpy, svd_power_deflation, svd_randomized
 from backend.api_formatters.linear_algebra import format_svd_result
 from backend.numerical_methods.linear_algebra.eigen.danilevsky import danilevsky_algorithm
 from backend.api_formatters.linear_algebra import format_danilevsky_result
+from backend.numerical_methods.linear_algebra.eigen.hessenberg_qr import hessenberg_qr_eigen
+from backend.api_formatters.linear_algebra import format_hessenberg_qr_result
 from backend.numerical_methods.linear_algebra.eigen.power_method import power_method_single, power_method_deflation
 from backend.api_formatters.linear_algebra import format_power_method_result
+from backend.numerical_methods.linear_algebra.eigen.subspace_iteration import subspace_iteration
+from backend.api_formatters.linear_algebra import format_subspace_iteration_result
 from backend.numerical_methods.linear_algebra.eigen.svd import calculate_svd_approximation # THÊM DÒNG NÀY
 from backend.api_formatters.linear_algebra import format_svd_approximation_result # THÊM DÒNG NÀY
+from backend.numerical_methods.linear_algebra.direct.factorization import (
+    get_factorization, get_lu_factorization, get_cholesky_factorization,
+    check_multi_rhs_factorization, solve_factored_rows
+)
+from backend.utils.matrix_io import (
+    DEFAULT_STREAM_CHUNK_ROWS, BINARY_MIMETYPES, read_npy_header, iter_npy_rows, iter_ndjson_rows,
+    parse_binary_matrices, encode_npy, format_shape_header, parse_matrix_input, read_uploaded_matrix,
+    parse_packed_matrix
+)
 
 
 linear_algebra_bp = Blueprint('linear_algebra', __name__, url_prefix='/api/linear-algebra')
 
+def _request_data(matrix_names):
+    """
+    Lấy dữ liệu của request. Với JSON trả về request.json như cũ.
+    Với dữ liệu nhị phân (.npy nối tiếp, hoặc float64 thô kèm header X-Matrix-Shape),
+    các ma trận được gán lần lượt cho matrix_names, các tham số khác lấy từ query string.
+    Với form multipart, các tệp tải lên (.mtx, .npz, .npy, văn bản) được đọc theo tên trường.
+    """
+    if request.mimetype in BINARY_MIMETYPES:
+        arrays = parse_binary_matrices(request.get_data(cache=False), request.headers.get('X-Matrix-Shape'))
+        if len(arrays) > len(matrix_names):
+            raise ValueError(f"Nhận được {len(arrays)} ma trận, phương pháp này chỉ nhận tối đa {len(matrix_names)}: {', '.join(matrix_names)}.")
+        data = request.args.to_dict()
+        data.update(zip(matrix_names, arrays))
+        return data
+    if request.mimetype == 'multipart/form-data':
+        data = request.form.to_dict()
+        for name, file_storage in request.files.items():
+            data[name] = read_uploaded_matrix(file_storage)
+        return data
+    return request.json
+
+def _parse_hyperpower_order(value):
+    # Bậc lặp hyperpower: bỏ trống (hoặc null) thì mặc định là 2
+    if is_blank(value):
+        return 2
+    error = ValueError(f"Bậc lặp hyperpower phải là một trong {HYPERPOWER_ORDERS}.")
+    if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+        raise error
+    try:
+        order = int(value)
+    except (ValueError, TypeError):
+        raise error
+    if order not in HYPERPOWER_ORDERS:
+        raise error
+    return order
+
+def _parse_step_numbers(value):
+    # Danh sách số thứ tự bước (từ 1): [3, 5], 3 hoặc chuỗi "3,5"
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return None
+    items = value.replace(',', ' ').split() if isinstance(value, str) else (value if isinstance(value, list) else [value])
+    try:
+        steps = [int(item) for item in items]
+    except (ValueError, TypeError):
+        raise ValueError("expand_steps phải là danh sách số thứ tự bước (số nguyên dương).")
+    if any(step < 1 for step in steps):
+        raise ValueError("expand_steps phải là danh sách số thứ tự bước (số nguyên dương).")
+    return steps
+
+def _wants_binary():
+    best = request.accept_mimetypes.best_match(('application/json',) + BINARY_MIMETYPES)
+    return best in BINARY_MIMETYPES
+
+def _respond(result, binary_keys, formatter):
+    """
+    Trả kết quả về dạng .npy (các mảng binary_keys nối tiếp) nếu client yêu cầu qua header Accept,
+    ngược lại (hoặc khi kết quả không có các mảng đó, ví dụ hệ vô nghiệm) trả về JSON như thường.
+    """
+    if _wants_binary() and all(result.get(key) is not None for key in binary_keys):
+        arrays = [np.asarray(result[key], dtype=float) for key in binary_keys]
+        response = Response(encode_npy(arrays), mimetype='application/octet-stream')
+        response.headers['X-Matrix-Names'] = ','.join(binary_keys)
+        response.headers['X-Matrix-Shape'] = format_shape_header(arrays)
+        if result.get('inverse_id'):
+            response.headers['X-Inverse-Id'] = result['inverse_id']
+        return response, 200
+    return jsonify(page_trace(formatter(result))), 200
+
 @linear_algebra_bp.route('/solve/gauss', methods=['POST'])
 def solve_gauss():
     try:
-        data = request.json
+        data = _request_data(('matrix_a', 'matrix_b'))
         
         matrix_a_str = data.get('matrix_a')
         matrix_b_str = data.get('matrix_b')
@@ -56,7 +149,7 @@ def solve_gauss():
         except (ValueError, TypeError):
             zero_tolerance = 1e-15
 
-        if not matrix_a_str or not matrix_b_str:
+        if is_blank(matrix_a_str) or is_blank(matrix_b_str):
             return jsonify({"error": "Vui lòng nhập đầy đủ ma trận A và vector b."}), 400
 
         # Chuyển đổi chuỗi thành ma trận NumPy
@@ -70,11 +163,11 @@ def solve_gauss():
         # --- ĐÃ XÓA BỎ ĐOẠN KIỂM TRA MA TRẬN VUÔNG Ở ĐÂY ---
 
         # Truyền giá trị tolerance vào hàm thuật toán
-        result = gauss_elimination(A, b, tol=zero_tolerance)
+        trace = parse_trace_level(data.get('trace'))
+        result = gauss_elimination(A, b, tol=zero_tolerance, trace=trace)
         
         # Định dạng kết quả và trả về
-        formatted_result = format_gauss_elimination_result(result)
-        return jsonify(formatted_result), 200
+        return _respond(result, ('solution',), format_gauss_elimination_result)
 
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
@@ -84,7 +177,7 @@ def solve_gauss():
 @linear_algebra_bp.route('/solve/gauss-jordan', methods=['POST'])
 def solve_gauss_jordan_route():
     try:
-        data = request.json
+        data = _request_data(('matrix_a', 'matrix_b'))
         matrix_a_str = data.get('matrix_a')
         matrix_b_str = data.get('matrix_b')
         zero_tolerance_str = data.get('zero_tolerance', '1e-15')
@@ -94,7 +187,7 @@ def solve_gauss_jordan_route():
         except (ValueError, TypeError):
             zero_tolerance = 1e-15
 
-        if not matrix_a_str or not matrix_b_str:
+        if is_blank(matrix_a_str) or is_blank(matrix_b_str):
             return jsonify({"error": "Vui lòng nhập đầy đủ ma trận A và vector b."}), 400
 
         A = parse_matrix_from_string(matrix_a_str)
@@ -103,9 +196,9 @@ def solve_gauss_jordan_route():
         if A.shape[0] != b.shape[0]:
              return jsonify({"error": f"Lỗi kích thước: Ma trận A có {A.shape[0]} hàng, nhưng B có {b.shape[0]} hàng. Chúng phải bằng nhau."}), 400
 
-        result = gauss_jordan(A, b, tol=zero_tolerance)
-        formatted_result = format_gauss_jordan_result(result)
-        return jsonify(formatted_result), 200
+        trace = parse_trace_level(data.get('trace'))
+        result = gauss_jordan(A, b, tol=zero_tolerance, trace=trace)
+        return _respond(result, ('solution',), format_gauss_jordan_result)
 
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
@@ -115,7 +208,7 @@ def solve_gauss_jordan_route():
 @linear_algebra_bp.route('/solve/cholesky', methods=['POST'])
 def solve_cholesky_route():
     try:
-        data = request.json
+        data = _request_data(('matrix_a', 'matrix_b'))
         
         # 1. Lấy dữ liệu từ request JSON
         matrix_a_str = data.get('matrix_a')
@@ -130,23 +223,29 @@ def solve_cholesky_route():
             zero_tolerance = 1e-15
 
         # 3. Kiểm tra đầu vào cơ bản
-        if not matrix_a_str or not matrix_b_str:
+        if is_blank(matrix_a_str) or is_blank(matrix_b_str):
             return jsonify({"error": "Vui lòng nhập đầy đủ ma trận A và vector b."}), 400
 
         # 4. Phân tích chuỗi thành ma trận NumPy
-        A = parse_matrix_from_string(matrix_a_str)
+        # packed: A chỉ gồm tam giác trên dạng gói (n(n+1)/2 số), kích thước được kiểm tra trong solve_cholesky
+        packed = parse_flag(data.get('packed'))
         b = parse_matrix_from_string(matrix_b_str)
+        if packed:
+            A, _ = parse_packed_matrix(matrix_a_str)
+        else:
+            A = parse_matrix_from_string(matrix_a_str)
 
-        # 5. Kiểm tra tính hợp lệ của kích thước ma trận
-        if A.shape[0] != b.shape[0]:
-             return jsonify({"error": f"Lỗi kích thước: Ma trận A có {A.shape[0]} hàng, nhưng ma trận B có {b.shape[0]} hàng. Chúng phải bằng nhau."}), 400
+            # 5. Kiểm tra tính hợp lệ của kích thước ma trận
+            if A.shape[0] != b.shape[0]:
+                 return jsonify({"error": f"Lỗi kích thước: Ma trận A có {A.shape[0]} hàng, nhưng ma trận B có {b.shape[0]} hàng. Chúng phải bằng nhau."}), 400
 
         # 6. Gọi hàm thuật toán chính
-        result = solve_cholesky(A, b, tol=zero_tolerance)
+        trace = parse_trace_level(data.get('trace'))
+        variant = data.get('variant') or 'cholesky'
+        result = solve_cholesky(A, b, tol=zero_tolerance, trace=trace, variant=variant, packed=packed)
         
         # 7. Định dạng kết quả để trả về cho frontend
-        formatted_result = format_cholesky_result(result)
-        return jsonify(formatted_result), 200
+        return _respond(result, ('solution',), format_cholesky_result)
 
     except (ValueError, np.linalg.LinAlgError) as e:
         # Bắt các lỗi tính toán hoặc định dạng cụ thể và trả về lỗi 400 (Bad Request)
@@ -158,7 +257,7 @@ def solve_cholesky_route():
 @linear_algebra_bp.route('/solve/lu', methods=['POST'])
 def solve_lu_route():
     try:
-        data = request.json
+        data = _request_data(('matrix_a', 'matrix_b'))
         
         # 1. Lấy dữ liệu từ request JSON
         matrix_a_str = data.get('matrix_a')
@@ -173,7 +272,7 @@ def solve_lu_route():
             zero_tolerance = 1e-15
 
         # 3. Kiểm tra đầu vào cơ bản
-        if not matrix_a_str or not matrix_b_str:
+        if is_blank(matrix_a_str) or is_blank(matrix_b_str):
             return jsonify({"error": "Vui lòng nhập đầy đủ ma trận A và vector b."}), 400
 
         # 4. Phân tích chuỗi thành ma trận NumPy
@@ -185,11 +284,12 @@ def solve_lu_route():
              return jsonify({"error": f"Lỗi kích thước: Ma trận A có {A.shape[0]} hàng, nhưng ma trận B có {b.shape[0]} hàng. Chúng phải bằng nhau."}), 400
 
         # 6. Gọi hàm thuật toán chính
-        result = solve_lu(A, b, tol=zero_tolerance)
+        trace = parse_trace_level(data.get('trace'))
+        expand_steps = _parse_step_numbers(data.get('expand_steps'))
+        result = solve_lu(A, b, tol=zero_tolerance, trace=trace)
         
-        # 7. Định dạng kết quả để trả về cho frontend
-        formatted_result = format_lu_result(result)
-        return jsonify(formatted_result), 200
+        # 7. Định dạng kết quả để trả về cho frontend (L, U của từng bước chỉ được dựng lại ở đây)
+        return _respond(result, ('solution',), lambda r: format_lu_result(r, expand_steps))
 
     except (ValueError, np.linalg.LinAlgError) as e:
         # Bắt các lỗi tính toán hoặc định dạng cụ thể và trả về lỗi 400 (Bad Request)
@@ -198,13 +298,97 @@ def solve_lu_route():
         # Bắt các lỗi không mong muốn khác và trả về lỗi 500 (Internal Server Error)
         return jsonify({"error": f"Đã xảy ra lỗi không mong muốn trên máy chủ: {str(e)}"}), 500
 
+def _stored_factorization(method, fact_id):
+    factorization = get_factorization(fact_id)
+    if factorization is None:
+        raise ValueError(f"Không tìm thấy phân rã '{fact_id}' (có thể đã bị xóa khỏi bộ nhớ đệm). Hãy gửi lại ma trận A.")
+    check_multi_rhs_factorization(factorization, method)
+    return factorization
+
+def _stream_solutions(method, fact_id, factorization, row_chunks):
+    """
+    Sinh từng dòng NDJSON của kết quả: dòng đầu mô tả phân rã, mỗi dòng tiếp theo là nghiệm
+    của một khối vế phải (theo hàng), dòng cuối báo tổng số vế phải đã giải.
+    """
+    n = factorization["shape"][1]
+    yield json.dumps({"method": method, "factorization_id": fact_id, "n": n}) + "\n"
+    start = 0
+    try:
+        for B_rows in row_chunks:
+            if B_rows.shape[1] != n:
+                raise ValueError(f"Vế phải thứ {start + 1} có {B_rows.shape[1]} phần tử, cần đúng {n} phần tử.")
+            X_rows = solve_factored_rows(factorization, B_rows)
+            yield json.dumps({"start": start, "solutions": X_rows.tolist()}) + "\n"
+            start += B_rows.shape[0]
+    except (ValueError, np.linalg.LinAlgError) as e:
+        # Các khối trước đó đã được gửi đi nên chỉ có thể báo lỗi trong luồng
+        yield json.dumps({"error": str(e), "solved": start}) + "\n"
+        return
+    yield json.dumps({"done": True, "count": start}) + "\n"
+
+@linear_algebra_bp.route('/solve/<any(lu, cholesky):method>/stream', methods=['POST'])
+def solve_stream_route(method):
+    """
+    Giải AX = B với rất nhiều vế phải: A được phân rã một lần (hoặc lấy lại phân rã đã lưu),
+    B được đọc dần từ luồng và nghiệm được trả về từng khối dưới dạng NDJSON.
+    - application/x-ndjson: dòng đầu là JSON {"matrix_a": ..., "zero_tolerance": ...} hoặc
+      {"factorization_id": ...}; mỗi dòng sau là một vector b hoặc một danh sách các vector.
+    - application/octet-stream: tệp .npy có kích thước (k, n), cần tham số ?factorization_id=...
+    """
+    try:
+        chunk_rows = int(request.args.get('chunk_rows', DEFAULT_STREAM_CHUNK_ROWS))
+        if chunk_rows < 1:
+            return jsonify({"error": "chunk_rows phải là số nguyên dương."}), 400
+
+        if request.mimetype in ('application/octet-stream', 'application/x-npy'):
+            fact_id = request.args.get('factorization_id')
+            if not fact_id:
+                return jsonify({"error": "Cần tham số factorization_id khi gửi vế phải dạng .npy."}), 400
+            factorization = _stored_factorization(method, fact_id)
+            shape, dtype = read_npy_header(request.stream)
+            row_chunks = iter_npy_rows(request.stream, shape, dtype, chunk_rows)
+        else:
+            try:
+                header = json.loads(request.stream.readline() or b'null')
+            except ValueError:
+                header = None
+            if not isinstance(header, dict):
+                return jsonify({"error": "Dòng đầu tiên phải là một đối tượng JSON chứa matrix_a hoặc factorization_id."}), 400
+
+            fact_id = header.get('factorization_id')
+            if fact_id:
+                factorization = _stored_factorization(method, fact_id)
+            else:
+                matrix_a = header.get('matrix_a')
+                if not matrix_a:
+                    return jsonify({"error": "Vui lòng nhập ma trận A hoặc factorization_id."}), 400
+                A = parse_matrix_from_string(matrix_a) if isinstance(matrix_a, str) else np.array(matrix_a, dtype=float)
+                try:
+                    zero_tolerance = float(header.get('zero_tolerance', 1e-15))
+                except (ValueError, TypeError):
+                    zero_tolerance = 1e-15
+                factorize = get_lu_factorization if method == 'lu' else get_cholesky_factorization
+                fact_id, factorization, _ = factorize(A, zero_tolerance)
+                check_multi_rhs_factorization(factorization, method)
+            row_chunks = iter_ndjson_rows(request.stream, num_cols=factorization["shape"][1], chunk_rows=chunk_rows)
+
+        return Response(
+            stream_with_context(_stream_solutions(method, fact_id, factorization, row_chunks)),
+            mimetype='application/x-ndjson'
+        )
+
+    except (ValueError, np.linalg.LinAlgError) as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": f"Đã xảy ra lỗi không mong muốn trên máy chủ: {str(e)}"}), 500
+
 @linear_algebra_bp.route('/inverse/gauss-jordan', methods=['POST'])
 def inverse_gauss_jordan_route():
     """
     Route để tính ma trận nghịch đảo bằng phương pháp Gauss-Jordan.
     """
     try:
-        data = request.json
+        data = _request_data(('matrix_a',))
         matrix_a_str = data.get('matrix_a')
         zero_tolerance_str = data.get('zero_tolerance', '1e-15')
         
@@ -214,7 +398,7 @@ def inverse_gauss_jordan_route():
         except (ValueError, TypeError):
             zero_tolerance = 1e-15
 
-        if not matrix_a_str:
+        if is_blank(matrix_a_str):
             return jsonify({"error": "Vui lòng nhập ma trận A."}), 400
 
         # Chuyển đổi chuỗi thành ma trận NumPy
@@ -225,11 +409,11 @@ def inverse_gauss_jordan_route():
             return jsonify({"error": f"Ma trận A phải là ma trận vuông để tính nghịch đảo. Ma trận hiện tại có kích thước {A.shape[0]}x{A.shape[1]}."}), 400
 
         # Gọi hàm tính ma trận nghịch đảo
-        result = gauss_jordan_inverse(A, tol=zero_tolerance)
+        trace = parse_trace_level(data.get('trace'))
+        result = gauss_jordan_inverse(A, tol=zero_tolerance, trace=trace)
         
         # Định dạng kết quả và trả về
-        formatted_result = format_inverse_gauss_jordan_result(result)
-        return jsonify(formatted_result), 200
+        return _respond(result, ('inverse',), format_inverse_gauss_jordan_result)
 
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
@@ -242,7 +426,7 @@ def inverse_lu_route():
     Route để tính ma trận nghịch đảo bằng phương pháp phân rã LU.
     """
     try:
-        data = request.json
+        data = _request_data(('matrix_a',))
         matrix_a_str = data.get('matrix_a')
         zero_tolerance_str = data.get('zero_tolerance', '1e-15')
         
@@ -251,7 +435,7 @@ def inverse_lu_route():
         except (ValueError, TypeError):
             zero_tolerance = 1e-15
 
-        if not matrix_a_str:
+        if is_blank(matrix_a_str):
             return jsonify({"error": "Vui lòng nhập ma trận A."}), 400
 
         A = parse_matrix_from_string(matrix_a_str)
@@ -259,23 +443,56 @@ def inverse_lu_route():
         if A.shape[0] != A.shape[1]:
             return jsonify({"error": f"Ma trận A phải là ma trận vuông. Kích thước hiện tại là {A.shape[0]}x{A.shape[1]}."}), 400
 
-        result = lu_inverse(A, tol=zero_tolerance)
+        trace = parse_trace_level(data.get('trace'))
+        result = lu_inverse(A, tol=zero_tolerance, trace=trace)
         
-        formatted_result = format_lu_inverse_result(result)
-        return jsonify(formatted_result), 200
+        return _respond(result, ('inverse',), format_lu_inverse_result)
 
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": f"Đã xảy ra lỗi không mong muốn: {str(e)}"}), 500
 
+@linear_algebra_bp.route('/inverse/woodbury', methods=['POST'])
+def inverse_woodbury_route():
+    """
+    Route cập nhật ma trận nghịch đảo đã lưu (inverse_id, trả về bởi /inverse/gauss-jordan, /inverse/lu
+    hoặc chính route này) với thay đổi hạng thấp: (A + UVᵀ)⁻¹.
+    """
+    try:
+        data = _request_data(('matrix_u', 'matrix_v'))
+        inverse_id = data.get('inverse_id')
+        if is_blank(inverse_id):
+            return jsonify({"error": "Vui lòng cung cấp inverse_id của ma trận nghịch đảo đã tính."}), 400
+        if is_blank(data.get('matrix_u')) or is_blank(data.get('matrix_v')):
+            return jsonify({"error": "Vui lòng nhập hai ma trận U và V (kích thước n×k)."}), 400
+
+        try:
+            zero_tolerance = float(data.get('zero_tolerance', '1e-15'))
+        except (ValueError, TypeError):
+            zero_tolerance = 1e-15
+        max_condition = float(data.get('max_condition', WOODBURY_MAX_CONDITION))
+
+        U = parse_matrix_from_string(data.get('matrix_u'))
+        V = parse_matrix_from_string(data.get('matrix_v'))
+
+        # Mặc định không tính ma trận kiểm tra O(n³)
+        trace = parse_trace_level(data.get('trace'), default='summary')
+        result = woodbury_inverse(inverse_id, U, V, tol=zero_tolerance, max_condition=max_condition, trace=trace)
+        return _respond(result, ('inverse',), format_woodbury_result)
+
+    except (ValueError, np.linalg.LinAlgError) as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": f"Đã xảy ra lỗi không mong muốn: {str(e)}"}), 500
+
 @linear_algebra_bp.route('/inverse/cholesky', methods=['POST'])
 def inverse_cholesky_route():
     """
     Route để tính ma trận nghịch đảo bằng phương pháp Cholesky.
     """
     try:
-        data = request.json
+        data = _request_data(('matrix_a',))
         matrix_a_str = data.get('matrix_a')
         zero_tolerance_str = data.get('zero_tolerance', '1e-15')
         
@@ -284,18 +501,23 @@ def inverse_cholesky_route():
         except (ValueError, TypeError):
             zero_tolerance = 1e-15
 
-        if not matrix_a_str:
+        if is_blank(matrix_a_str):
             return jsonify({"error": "Vui lòng nhập ma trận A."}), 400
 
-        A = parse_matrix_from_string(matrix_a_str)
+        packed = parse_flag(data.get('packed'))
+        if packed:
+            A, _ = parse_packed_matrix(matrix_a_str)
+        else:
+            A = parse_matrix_from_string(matrix_a_str)
 
-        if A.shape[0] != A.shape[1]:
-            return jsonify({"error": f"Ma trận A phải là ma trận vuông. Kích thước hiện tại là {A.shape[0]}x{A.shape[1]}."}), 400
+            if A.shape[0] != A.shape[1]:
+                return jsonify({"error": f"Ma trận A phải là ma trận vuông. Kích thước hiện tại là {A.shape[0]}x{A.shape[1]}."}), 400
 
-        result = cholesky_inverse(A, tol=zero_tolerance)
+        trace = parse_trace_level(data.get('trace'))
+        variant = data.get('variant') or 'cholesky'
+        result = cholesky_inverse(A, tol=zero_tolerance, trace=trace, variant=variant, packed=packed)
         
-        formatted_result = format_cholesky_inverse_result(result)
-        return jsonify(formatted_result), 200
+        return _respond(result, ('inverse',), format_cholesky_inverse_result)
 
     except (ValueError, np.linalg.LinAlgError) as e:
         return jsonify({"error": str(e)}), 400
@@ -308,7 +530,7 @@ def inverse_bordering_route():
     Route để tính ma trận nghịch đảo bằng phương pháp viền quanh.
     """
     try:
-        data = request.json
+        data = _request_data(('matrix_a',))
         matrix_a_str = data.get('matrix_a')
         zero_tolerance_str = data.get('zero_tolerance', '1e-15')
         
@@ -317,35 +539,101 @@ def inverse_bordering_route():
         except (ValueError, TypeError):
             zero_tolerance = 1e-15
 
-        if not matrix_a_str:
+        if is_blank(matrix_a_str):
             return jsonify({"error": "Vui lòng nhập ma trận A."}), 400
 
         A = parse_matrix_from_string(matrix_a_str)
 
-        result = bordering_inverse(A, tol=zero_tolerance)
+        trace = parse_trace_level(data.get('trace'))
+        result = bordering_inverse(A, tol=zero_tolerance, trace=trace)
         
-        formatted_result = format_bordering_inverse_result(result)
-        return jsonify(formatted_result), 200
+        return _respond(result, ('inverse',), format_bordering_inverse_result)
 
     except (ValueError, np.linalg.LinAlgError) as e:
         return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": f"Đã xảy ra lỗi không mong muốn: {str(e)}"}), 500
     
+@linear_algebra_bp.route('/inverse/bordering/sessions', methods=['POST'])
+def create_bordering_session_route():
+    """
+    Tạo phiên viền quanh tăng dần: tính A⁻¹ và lưu trạng thái trên máy chủ.
+    """
+    try:
+        data = _request_data(('matrix_a',))
+        if is_blank(data.get('matrix_a')):
+            return jsonify({"error": "Vui lòng nhập ma trận A."}), 400
+        A = parse_matrix_from_string(data.get('matrix_a'))
+        try:
+            zero_tolerance = float(data.get('zero_tolerance', '1e-15'))
+        except (ValueError, TypeError):
+            zero_tolerance = 1e-15
+
+        result = create_bordering_session(A, tol=zero_tolerance)
+        response, _ = _respond(result, ('inverse',), format_bordering_session_result)
+        # Với phản hồi nhị phân (.npy), mã phiên chỉ có trong header
+        response.headers['X-Session-Id'] = result['session_id']
+        return response, 201
+
+    except (ValueError, np.linalg.LinAlgError) as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": f"Đã xảy ra lỗi không mong muốn: {str(e)}"}), 500
+
+@linear_algebra_bp.route('/inverse/bordering/sessions/<session_id>/append', methods=['POST'])
+def append_bordering_session_route(session_id):
+    """
+    Thêm các hàng/cột mới vào ma trận của phiên: A ← [[A, U], [V, D]].
+    Tham số: column (U, n×k), row (V, k×n), corner (D, k×k).
+    """
+    try:
+        data = _request_data(('column', 'row', 'corner'))
+        if any(is_blank(data.get(key)) for key in ('column', 'row', 'corner')):
+            return jsonify({"error": "Vui lòng nhập cột viền (column), hàng viền (row) và phần tử góc (corner)."}), 400
+        U = parse_matrix_from_string(data.get('column'))
+        V = parse_matrix_from_string(data.get('row'))
+        D = parse_matrix_from_string(data.get('corner'))
+
+        result = append_bordering_session(session_id, U, V, D)
+        return _respond(result, ('inverse',), format_bordering_session_result)
+
+    except (ValueError, np.linalg.LinAlgError) as e:
+        return jsonify({"error": str(e)}), 400
+    except KeyError as e:
+        return jsonify({"error": e.args[0]}), 404
+    except Exception as e:
+        return jsonify({"error": f"Đã xảy ra lỗi không mong muốn: {str(e)}"}), 500
+
+@linear_algebra_bp.route('/inverse/bordering/sessions/<session_id>', methods=['GET', 'DELETE'])
+def bordering_session_route(session_id):
+    try:
+        if request.method == 'DELETE':
+            if not delete_bordering_session(session_id):
+                return jsonify({"error": f"Phiên viền quanh '{session_id}' không tồn tại hoặc đã hết hạn."}), 404
+            return jsonify({"status": "success", "message": "Đã xóa phiên viền quanh.", "session_id": session_id}), 200
+
+        result = get_bordering_session(session_id)
+        return _respond(result, ('inverse',), format_bordering_session_result)
+
+    except KeyError as e:
+        return jsonify({"error": e.args[0]}), 404
+    except Exception as e:
+        return jsonify({"error": f"Đã xảy ra lỗi không mong muốn: {str(e)}"}), 500
+
 @linear_algebra_bp.route('/solve/jacobi', methods=['POST'])
 def solve_jacobi_route():
     try:
-        data = request.json
-        A = parse_matrix_from_string(data.get('matrix_a'))
+        data = _request_data(('matrix_a', 'matrix_b', 'x0'))
+        A = parse_matrix_input(data.get('matrix_a'))
         b = parse_matrix_from_string(data.get('matrix_b'))
         x0 = parse_matrix_from_string(data.get('x0'))
         
         tol = float(data.get('tolerance', 1e-5))
         max_iter = int(data.get('max_iter', 100))
         
-        result = jacobi(A, b, x0, tol=tol, max_iter=max_iter)
-        formatted_result = format_jacobi_result(result)
-        return jsonify(formatted_result), 200
+        trace = parse_trace_level(data.get('trace'))
+        result = jacobi(A, b, x0, tol=tol, max_iter=max_iter, trace=trace)
+        return _respond(result, ('solution',), format_jacobi_result)
 
     except (ValueError, np.linalg.LinAlgError) as e:
         return jsonify({"error": str(e)}), 400
@@ -355,17 +643,17 @@ def solve_jacobi_route():
 @linear_algebra_bp.route('/solve/gauss-seidel', methods=['POST'])
 def solve_gauss_seidel_route():
     try:
-        data = request.json
-        A = parse_matrix_from_string(data.get('matrix_a'))
+        data = _request_data(('matrix_a', 'matrix_b', 'x0'))
+        A = parse_matrix_input(data.get('matrix_a'))
         b = parse_matrix_from_string(data.get('matrix_b'))
         x0 = parse_matrix_from_string(data.get('x0'))
         
         tol = float(data.get('tolerance', 1e-5))
         max_iter = int(data.get('max_iter', 100))
         
-        result = gauss_seidel(A, b, x0, tol=tol, max_iter=max_iter)
-        formatted_result = format_gauss_seidel_result(result)
-        return jsonify(formatted_result), 200
+        trace = parse_trace_level(data.get('trace'))
+        result = gauss_seidel(A, b, x0, tol=tol, max_iter=max_iter, trace=trace)
+        return _respond(result, ('solution',), format_gauss_seidel_result)
 
     except (ValueError, np.linalg.LinAlgError) as e:
         return jsonify({"error": str(e)}), 400
@@ -375,12 +663,12 @@ def solve_gauss_seidel_route():
 @linear_algebra_bp.route('/solve/simple-iteration', methods=['POST'])
 def solve_simple_iteration_route():
     try:
-        data = request.json
-        B = parse_matrix_from_string(data.get('matrix_b')) # Lưu ý: matrix_b từ frontend là B
+        data = _request_data(('matrix_b', 'matrix_d', 'x0'))
+        B = parse_matrix_input(data.get('matrix_b')) # Lưu ý: matrix_b từ frontend là B
         d = parse_matrix_from_string(data.get('matrix_d'))
         x0_str = data.get('x0')
         
-        if not x0_str or not x0_str.strip():
+        if is_blank(x0_str):
             x0 = np.zeros((B.shape[0], d.shape[1]))
         else:
             x0 = parse_matrix_from_string(x0_str)
@@ -389,27 +677,58 @@ def solve_simple_iteration_route():
         max_iter = int(data.get('max_iter', 100))
         norm_choice = data.get('norm_choice', 'inf')
         
-        result = simple_iteration(B, d, x0, tol=tol, max_iter=max_iter, norm_choice=norm_choice)
-        formatted_result = format_simple_iteration_result(result)
-        return jsonify(formatted_result), 200
+        trace = parse_trace_level(data.get('trace'))
+        result = simple_iteration(B, d, x0, tol=tol, max_iter=max_iter, norm_choice=norm_choice, trace=trace)
+        return _respond(result, ('solution',), format_simple_iteration_result)
 
     except (ValueError, np.linalg.LinAlgError) as e:
         return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": f"Đã xảy ra lỗi không mong muốn: {str(e)}"}), 500
     
+@linear_algebra_bp.route('/solve/<any(cg, gmres, bicgstab):method>', methods=['POST'])
+def solve_krylov_route(method):
+    """
+    Giải hệ Ax = b bằng phương pháp Krylov (CG, GMRES(m), BiCGSTAB) với tiền điều kiện tùy chọn
+    (preconditioner: none, jacobi, ilu0). A có thể là ma trận thưa (COO, Matrix Market, .npz).
+    """
+    try:
+        data = _request_data(('matrix_a', 'matrix_b', 'x0'))
+        if is_blank(data.get('matrix_a')) or is_blank(data.get('matrix_b')):
+            return jsonify({"error": "Vui lòng nhập ma trận A và vector b."}), 400
+        A = parse_matrix_input(data.get('matrix_a'))
+        b = parse_matrix_from_string(data.get('matrix_b'))
+        x0_str = data.get('x0')
+        x0 = parse_matrix_from_string(x0_str) if not is_blank(x0_str) else None
+
+        tol = float(data.get('tolerance', 1e-8))
+        max_iter = int(data.get('max_iter', 1000))
+        restart = int(data.get('restart', DEFAULT_GMRES_RESTART))
+        preconditioner = str(data.get('preconditioner') or 'none').strip().lower()
+
+        trace = parse_trace_level(data.get('trace'))
+        result = krylov_solve(A, b, x0, method=method, preconditioner=preconditioner, tol=tol,
+                              max_iter=max_iter, restart=restart, trace=trace)
+        return _respond(result, ('solution',), format_krylov_result)
+
+    except (ValueError, np.linalg.LinAlgError) as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": f"Đã xảy ra lỗi không mong muốn: {str(e)}"}), 500
+
 @linear_algebra_bp.route('/inverse/jacobi', methods=['POST'])
 def inverse_jacobi_route():
     try:
-        data = request.json
+        data = _request_data(('matrix_a',))
         A = parse_matrix_from_string(data.get('matrix_a'))
         tol = float(data.get('tolerance', 1e-5))
         max_iter = int(data.get('max_iter', 100))
         x0_method = data.get('x0_method', 'method1')
 
-        result = jacobi_inverse(A, tol=tol, max_iter=max_iter, x0_method=x0_method)
-        formatted_result = format_inverse_jacobi_result(result)
-        return jsonify(formatted_result), 200
+        trace = parse_trace_level(data.get('trace'))
+        engine = parse_engine(data.get('engine'))
+        result = jacobi_inverse(A, tol=tol, max_iter=max_iter, x0_method=x0_method, trace=trace, engine=engine)
+        return _respond(result, ('inverse',), format_inverse_jacobi_result)
 
     except (ValueError, np.linalg.LinAlgError) as e:
         return jsonify({"error": str(e)}), 400
@@ -419,15 +738,17 @@ def inverse_jacobi_route():
 @linear_algebra_bp.route('/inverse/newton', methods=['POST'])
 def inverse_newton_route():
     try:
-        data = request.json
+        data = _request_data(('matrix_a',))
         A = parse_matrix_from_string(data.get('matrix_a'))
         tol = float(data.get('tolerance', 1e-5))
         max_iter = int(data.get('max_iter', 100))
         x0_method = data.get('x0_method', 'method1') # Giữ nguyên 'method1' làm mặc định
 
-        result = newton_inverse(A, tol=tol, max_iter=max_iter, x0_method=x0_method)
-        formatted_result = format_inverse_newton_result(result)
-        return jsonify(formatted_result), 200
+        trace = parse_trace_level(data.get('trace'))
+        mode = data.get('mode') or 'classic'
+        order = _parse_hyperpower_order(data.get('order'))
+        result = newton_inverse(A, tol=tol, max_iter=max_iter, x0_method=x0_method, trace=trace, mode=mode, order=order)
+        return _respond(result, ('inverse',), format_inverse_newton_result)
 
     except (ValueError, np.linalg.LinAlgError) as e:
         return jsonify({"error": str(e)}), 400
@@ -437,15 +758,16 @@ def inverse_newton_route():
 @linear_algebra_bp.route('/inverse/gauss-seidel', methods=['POST'])
 def inverse_gauss_seidel_route():
     try:
-        data = request.json
+        data = _request_data(('matrix_a',))
         A = parse_matrix_from_string(data.get('matrix_a'))
         tol = float(data.get('tolerance', 1e-5))
         max_iter = int(data.get('max_iter', 100))
         x0_method = data.get('x0_method', 'method1')
 
-        result = gauss_seidel_inverse(A, tol=tol, max_iter=max_iter, x0_method=x0_method)
-        formatted_result = format_inverse_gauss_seidel_result(result)
-        return jsonify(formatted_result), 200
+        trace = parse_trace_level(data.get('trace'))
+        engine = parse_engine(data.get('engine'))
+        result = gauss_seidel_inverse(A, tol=tol, max_iter=max_iter, x0_method=x0_method, trace=trace, engine=engine)
+        return _respond(result, ('inverse',), format_inverse_gauss_seidel_result)
 
     except (ValueError, np.linalg.LinAlgError) as e:
         return jsonify({"error": str(e)}), 400
@@ -456,32 +778,40 @@ def inverse_gauss_seidel_route():
 def svd_route():
     """
     Route để thực hiện phân tích SVD.
+    algorithm='randomized': chỉ tính num_singular thành phần lớn nhất bằng SVD ngẫu nhiên (mặc định 'full').
     """
     try:
-        data = request.json
+        data = _request_data(('matrix_a', 'y_init'))
         matrix_a_str = data.get('matrix_a')
         method = data.get('method', 'default')
+        algorithm = data.get('algorithm') or 'full'
         num_singular_str = data.get('num_singular')
         y_init_str = data.get('y_init')
 
-        if not matrix_a_str:
+        if is_blank(matrix_a_str):
             return jsonify({"error": "Vui lòng nhập ma trận A."}), 400
 
         A = parse_matrix_from_string(matrix_a_str)
         original_shape = A.shape
 
+        if algorithm not in SVD_ALGORITHMS:
+            return jsonify({"error": f"Thuật toán SVD '{algorithm}' không hợp lệ. Chỉ hỗ trợ: {', '.join(SVD_ALGORITHMS)}."}), 400
+
+        trace = parse_trace_level(data.get('trace'))
         result = {}
-        if method == 'power':
+        if algorithm == 'randomized':
+            num_singular = int(num_singular_str) if num_singular_str else None
+            result = svd_randomized(A, num_singular=num_singular, trace=trace)
+        elif method == 'power':
             # Xử lý các tham số cho power method
             num_singular = int(num_singular_str) if num_singular_str else None
-            y_init = parse_matrix_from_string(y_init_str) if y_init_str and y_init_str.strip() else None
+            y_init = parse_matrix_from_string(y_init_str) if not is_blank(y_init_str) else None
             
-            result = svd_power_deflation(A, num_singular=num_singular, y_init=y_init)
+            result = svd_power_deflation(A, num_singular=num_singular, y_init=y_init, trace=trace)
         else: # Mặc định là 'default'
             result = svd_numpy(A)
             
-        formatted_result = format_svd_result(result, original_shape)
-        return jsonify(formatted_result), 200
+        return _respond(result, ('U', 'Sigma_diag', 'Vt'), lambda r: format_svd_result(r, original_shape))
 
     except (ValueError, np.linalg.LinAlgError) as e:
         return jsonify({"error": str(e)}), 400
@@ -491,13 +821,14 @@ def svd_route():
 @linear_algebra_bp.route('/eigen/danilevsky', methods=['POST'])
 def danilevsky_route():
     try:
-        data = request.json
+        data = _request_data(('matrix_a',))
         A = parse_matrix_from_string(data.get('matrix_a'))
         
-        result = danilevsky_algorithm(A)
+        trace = parse_trace_level(data.get('trace'))
+        result = danilevsky_algorithm(A, trace=trace)
         
         formatted_result = format_danilevsky_result(result, A)
-        return jsonify(formatted_result), 200
+        return jsonify(page_trace(formatted_result)), 200
 
     except (ValueError, np.linalg.LinAlgError) as e:
         return jsonify({"error": str(e)}), 400
@@ -505,21 +836,51 @@ def danilevsky_route():
         import traceback
         return jsonify({"error": f"Đã xảy ra lỗi không mong muốn: {str(e)}\n{traceback.format_exc()}"}), 500
 
+@linear_algebra_bp.route('/eigen/qr', methods=['POST'])
+def hessenberg_qr_route():
+    """
+    Route tìm tất cả trị riêng bằng rút gọn Hessenberg + lặp QR dịch chuyển kép Francis.
+    """
+    try:
+        data = _request_data(('matrix_a',))
+        matrix_a_str = data.get('matrix_a')
+        if is_blank(matrix_a_str):
+            return jsonify({"error": "Vui lòng nhập ma trận A."}), 400
+        A = parse_matrix_from_string(matrix_a_str)
+
+        trace = parse_trace_level(data.get('trace'))
+        engine = data.get('engine') or 'auto'
+        compute_vectors = is_blank(data.get('compute_vectors')) or parse_flag(data.get('compute_vectors'))
+        result = hessenberg_qr_eigen(A, compute_vectors=compute_vectors, trace=trace, engine=engine)
+
+        formatted_result = format_hessenberg_qr_result(result, A)
+        return jsonify(page_trace(formatted_result)), 200
+
+    except (ValueError, np.linalg.LinAlgError) as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": f"Đã xảy ra lỗi không mong muốn: {str(e)}"}), 500
+
 @linear_algebra_bp.route('/eigen/power-single', methods=['POST'])
 def power_single_route():
     try:
-        data = request.json
+        data = _request_data(('matrix_a', 'x0'))
         A = parse_matrix_from_string(data.get('matrix_a'))
         tol = float(data.get('tolerance', 1e-9))
         max_iter = int(data.get('max_iter', 100))
         
         x0_str = data.get('x0')
-        x0 = parse_matrix_from_string(x0_str) if x0_str and x0_str.strip() else None
-
-        result = power_method_single(A, x0=x0, tol=tol, max_iter=max_iter)
+        x0 = parse_matrix_from_string(x0_str) if not is_blank(x0_str) else None
+
+        trace = parse_trace_level(data.get('trace'))
+        acceleration = data.get('acceleration') or 'none'
+        shift_str = data.get('shift')
+        shift = float(shift_str) if not is_blank(shift_str) else None
+        result = power_method_single(A, x0=x0, tol=tol, max_iter=max_iter, trace=trace,
+                                     acceleration=acceleration, shift=shift)
         
         formatted_result = format_power_method_result(result, A)
-        return jsonify(formatted_result), 200
+        return jsonify(page_trace(formatted_result)), 200
 
     except (ValueError, np.linalg.LinAlgError) as e:
         return jsonify({"error": str(e)}), 400
@@ -529,22 +890,36 @@ def power_single_route():
 
 @linear_algebra_bp.route('/eigen/power-deflation', methods=['POST'])
 def power_deflation_route():
+    """
+    Tìm nhiều trị riêng trội. mode='deflation' (mặc định): lũy thừa + xuống thang Hotelling từng trị riêng;
+    mode='subspace': lặp không gian con hội tụ đồng thời các trị riêng (hỗ trợ ma trận thưa).
+    """
     try:
-        data = request.json
-        A = parse_matrix_from_string(data.get('matrix_a'))
+        data = _request_data(('matrix_a', 'x0'))
+        mode = data.get('mode') or 'deflation'
+        if mode not in ('deflation', 'subspace'):
+            return jsonify({"error": f"Chế độ '{mode}' không hợp lệ. Chỉ hỗ trợ: deflation, subspace."}), 400
+        A = parse_matrix_input(data.get('matrix_a'))
         num_values_str = data.get('num_values')
-        num_values = int(num_values_str) if num_values_str and num_values_str.strip() else None
+        num_values = int(num_values_str) if num_values_str and str(num_values_str).strip() else None
         
         tol = float(data.get('tolerance', 1e-6))
         max_iter = int(data.get('max_iter', 100))
         
         x0_str = data.get('x0')
-        x0 = parse_matrix_from_string(x0_str) if x0_str and x0_str.strip() else None
+        x0 = parse_matrix_from_string(x0_str) if not is_blank(x0_str) else None
+
+        trace = parse_trace_level(data.get('trace'))
+        if mode == 'subspace':
+            result = subspace_iteration(A, num_values=num_values, x0=x0, tol=tol, max_iter=max_iter, trace=trace)
+            return jsonify(page_trace(format_subspace_iteration_result(result, A))), 200
 
-        result = power_method_deflation(A, num_values=num_values, x0=x0, tol=tol, max_iter=max_iter)
+        if sp.issparse(A):
+            A = A.toarray()
+        result = power_method_deflation(A, num_values=num_values, x0=x0, tol=tol, max_iter=max_iter, trace=trace)
         
         formatted_result = format_power_method_result(result, A)
-        return jsonify(formatted_result), 200
+        return jsonify(page_trace(formatted_result)), 200
 
     except (ValueError, np.linalg.LinAlgError) as e:
         return jsonify({"error": str(e)}), 400
@@ -558,12 +933,12 @@ def svd_approximation_route():
     Route để tính toán ma trận xấp xỉ bằng SVD.
     """
     try:
-        data = request.json
+        data = _request_data(('matrix_a',))
         matrix_a_str = data.get('matrix_a')
         method = data.get('method', 'rank-k')
         value = data.get('value')
 
-        if not matrix_a_str:
+        if is_blank(matrix_a_str):
             return jsonify({"error": "Vui lòng nhập ma trận A."}), 400
         if value is None:
             return jsonify({"error": "Vui lòng cung cấp giá trị cho phương pháp xấp xỉ."}), 400
@@ -578,13 +953,14 @@ def svd_approximation_route():
         elif method == 'error-bound':
             params['error_bound'] = float(value)
 
-        result = calculate_svd_approximation(A, method=method, **params)
+        trace = parse_trace_level(data.get('trace'))
+        algorithm = data.get('algorithm') or 'full'
+        result = calculate_svd_approximation(A, method=method, trace=trace, algorithm=algorithm, **params)
         
         if not result.get("success"):
             return jsonify({"error": result.get("error", "Lỗi không xác định")}), 400
 
-        formatted_result = format_svd_approximation_result(result)
-        return jsonify(formatted_result), 200
+        return _respond(result, ('approximated_matrix',), format_svd_approximation_result)
 
     except (ValueError, np.linalg.LinAlgError) as e:
         return jsonify({"error": str(e)}), 400
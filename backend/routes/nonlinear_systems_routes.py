@@ -4,6 +4,8 @@ from backend.numerical_methods.nonlinear_systems.newton import solve_newton_syst
 from backend.numerical_methods.nonlinear_systems.newton_modified import solve_newton_modified_system
 from backend.numerical_methods.nonlinear_systems.simple_iteration import solve_simple_iteration_system
 from backend.api_formatters.nonlinear_systems import format_nonlinear_system_result
+from backend.utils.helpers import parse_trace_level
+from backend.routes.trace_routes import page_trace
 import traceback
 
 nonlinear_systems_bp = Blueprint('nonlinear_systems', __name__, url_prefix='/api/nonlinear-systems')
@@ -36,6 +38,7 @@ def solve_system_route():
         if n != len(x0_list):
                 return jsonify({"error": "Số lượng phương trình và số lượng giá trị ban đầu phải bằng nhau."}), 400
 
+        trace = parse_trace_level(data.get('trace'))
         result = None
         method_name = ""
 
@@ -47,7 +50,9 @@ def solve_system_route():
                 x0_list=x0_list,
                 stop_option=data.get('stop_option'),
                 stop_value=stop_value,
-                norm_choice=data.get('norm_choice')
+                norm_choice=data.get('norm_choice'),
+                engine=data.get('engine', 'compiled'),
+                trace=trace
             )
         
         elif method == 'newton_modified':
@@ -58,7 +63,8 @@ def solve_system_route():
                 x0_list=x0_list,
                 stop_option=data.get('stop_option'),
                 stop_value=stop_value,
-                norm_choice=data.get('norm_choice')
+                norm_choice=data.get('norm_choice'),
+                trace=trace
             )
 
         elif method == 'simple_iteration':
@@ -80,7 +86,8 @@ def solve_system_route():
                 a0_list=a0_list,
                 b0_list=b0_list,
                 stop_option=data.get('stop_option'),
-                stop_value=stop_value
+                stop_value=stop_value,
+                trace=trace
             )
 
         else:
@@ -97,7 +104,7 @@ def solve_system_route():
         if 'error' in formatted_result and not formatted_result.get('status') == 'success':
             return jsonify({"error": formatted_result['error']}), 400
             
-        return jsonify(formatted_result)
+        return jsonify(page_trace(formatted_result))
 
     except (ValueError, TypeError) as e:
         return jsonify({"error": str(e)}), 400
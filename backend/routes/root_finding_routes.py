@@ -1,11 +1,15 @@
 # backend/routes/root_finding_routes.py
 from flask import Blueprint, request, jsonify
+import numpy as np
 from backend.utils.expression_parser import parse_expression
+from backend.utils.helpers import parse_trace_level
+from backend.routes.trace_routes import page_trace
 from backend.numerical_methods.root_finding.bisection import bisection_method
 from backend.numerical_methods.root_finding.secant import secant_method
 from backend.numerical_methods.root_finding.newton import newton_method
 from backend.numerical_methods.root_finding.simple_iteration import simple_iteration_method # <<< THÊM
-from backend.api_formatters.root_finding import format_root_finding_result
+from backend.numerical_methods.root_finding.batch import bisection_batch, secant_batch, newton_batch
+from backend.api_formatters.root_finding import format_root_finding_result, format_batch_root_finding_result
 
 root_finding_bp = Blueprint('root_finding', __name__, url_prefix='/api/root-finding')
 
@@ -20,6 +24,7 @@ def solve_root():
         b = float(data.get('b'))
         mode = data.get('stop_mode')
         value = data.get('stop_value')
+        trace = parse_trace_level(data.get('trace'))
         
         result = None
         method_name = ""
@@ -36,7 +41,7 @@ def solve_root():
             result = simple_iteration_method(
                 phi=parsed_phi["f"], 
                 phi_prime=parsed_phi["f_prime"],
-                a=a, b=b, x0=x0, mode=mode, value=value
+                a=a, b=b, x0=x0, mode=mode, value=value, trace=trace
             )
         else:
             expr_str = data.get('expression')
@@ -48,24 +53,100 @@ def solve_root():
 
             if method == 'bisection':
                 method_name = "Chia đôi"
-                result = bisection_method(f, a, b, mode, value)
+                result = bisection_method(f, a, b, mode, value, trace=trace)
             elif method == 'secant':
                 method_name = "Dây cung (Secant)"
                 stop_condition = data.get('adv_stop_condition', 'f_xn')
-                result = secant_method(f, f_prime, f_double_prime, a, b, mode, value, stop_condition)
+                result = secant_method(f, f_prime, f_double_prime, a, b, mode, value, stop_condition, trace=trace)
             elif method == 'newton':
                 method_name = "Newton (Tiếp tuyến)"
                 stop_condition = data.get('adv_stop_condition', 'f_xn')
                 x0 = float(data.get('x0'))
-                result = newton_method(f, f_prime, f_double_prime, a, b, x0, mode, value, stop_condition)
+                result = newton_method(f, f_prime, f_double_prime, a, b, x0, mode, value, stop_condition, trace=trace)
             else:
                 return jsonify({"error": "Phương pháp không được hỗ trợ."}), 400
             
         formatted_result = format_root_finding_result(f"{method_name}", result, mode, data.get('adv_stop_condition'))
+        return jsonify(page_trace(formatted_result))
+
+    except (ValueError, TypeError) as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        import traceback
+        return jsonify({"error": f"Lỗi không mong muốn: {str(e)}\n{traceback.format_exc()}"}), 500
+
+# Số bài toán tối đa trong một request giải theo lô
+MAX_BATCH_SIZE = 100000
+
+def _batch_array(values, name):
+    """
+    Chuyển danh sách số (hoặc một số) từ JSON thành mảng 1 chiều.
+    """
+    try:
+        arr = np.atleast_1d(np.array(values, dtype=float))
+    except (ValueError, TypeError):
+        raise ValueError(f"Trường '{name}' phải là một số hoặc danh sách các số.")
+    if arr.ndim != 1 or arr.size == 0:
+        raise ValueError(f"Trường '{name}' phải là một số hoặc danh sách các số.")
+    return arr
+
+@root_finding_bp.route('/solve-batch', methods=['POST'])
+def solve_root_batch():
+    """
+    Giải nhiều bài toán f(x) = y_i trên các khoảng [a_i, b_i] trong một request.
+    Biểu thức chỉ được biên dịch một lần cho cả lô.
+    """
+    try:
+        data = request.json
+        method = data.get('method')
+        mode = data.get('stop_mode')
+        value = data.get('stop_value')
+        stop_condition = data.get('adv_stop_condition', 'f_xn')
+
+        try:
+            intervals = np.array(data.get('intervals', []), dtype=float)
+        except (ValueError, TypeError):
+            return jsonify({"error": "Danh sách khoảng phải có dạng [[a, b], ...]."}), 400
+        if intervals.ndim != 2 or intervals.shape[0] == 0 or intervals.shape[1] != 2:
+            return jsonify({"error": "Danh sách khoảng phải có dạng [[a, b], ...]."}), 400
+
+        lane_inputs = [intervals[:, 0], intervals[:, 1]]
+        lane_inputs.append(_batch_array(data.get('targets', 0.0), 'targets'))
+        if method == 'newton':
+            if data.get('x0') is None:
+                return jsonify({"error": "Phương pháp Newton cần giá trị x0 cho từng bài toán."}), 400
+            lane_inputs.append(_batch_array(data.get('x0'), 'x0'))
+
+        try:
+            lane_inputs = [arr.copy() for arr in np.broadcast_arrays(*lane_inputs)]
+        except ValueError:
+            return jsonify({"error": "Số lượng khoảng, giá trị y và x0 phải bằng nhau (hoặc chỉ có một giá trị)."}), 400
+        if lane_inputs[0].size > MAX_BATCH_SIZE:
+            return jsonify({"error": f"Số bài toán trong một lô không được vượt quá {MAX_BATCH_SIZE}."}), 400
+
+        parsed_func = parse_expression(data.get('expression'))
+        if not parsed_func["success"]:
+            return jsonify({"error": parsed_func["error"]}), 400
+        f, f_prime, f_double_prime = parsed_func["f"], parsed_func["f_prime"], parsed_func["f_double_prime"]
+
+        a, b, targets = lane_inputs[:3]
+        if method == 'bisection':
+            method_name = "Chia đôi"
+            result = bisection_batch(f, a, b, mode, value, targets=targets)
+        elif method == 'secant':
+            method_name = "Dây cung (Secant)"
+            result = secant_batch(f, f_prime, f_double_prime, a, b, mode, value, stop_condition, targets=targets)
+        elif method == 'newton':
+            method_name = "Newton (Tiếp tuyến)"
+            result = newton_batch(f, f_prime, f_double_prime, a, b, lane_inputs[3], mode, value, stop_condition, targets=targets)
+        else:
+            return jsonify({"error": "Phương pháp không được hỗ trợ."}), 400
+
+        formatted_result = format_batch_root_finding_result(method_name, result, mode, stop_condition)
         return jsonify(formatted_result)
 
     except (ValueError, TypeError) as e:
         return jsonify({"error": str(e)}), 400
     except Exception as e:
         import traceback
-        return jsonify({"error": f"Lỗi không mong muốn: {str(e)}\n{traceback.format_exc()}"}), 500
\ No newline at end of file
+        return jsonify({"error": f"Lỗi không mong muốn: {str(e)}\n{traceback.format_exc()}"}), 500
@@ -0,0 +1,60 @@
+# backend/routes/trace_routes.py
+from flask import Blueprint, request, jsonify
+from backend.utils.helpers import parse_flag
+from backend.utils.trace_store import DEFAULT_TRACE_SECTIONS, store_trace, get_trace_page, delete_trace
+
+trace_bp = Blueprint('trace', __name__, url_prefix='/api/trace')
+
+def trace_paging_requested():
+    """
+    Client yêu cầu phân trang vết bằng tham số trace_paging (query string, form hoặc JSON).
+    """
+    if 'trace_paging' in request.args:
+        return parse_flag(request.args.get('trace_paging'))
+    if request.mimetype == 'multipart/form-data':
+        return parse_flag(request.form.get('trace_paging'))
+    data = request.get_json(silent=True)
+    return isinstance(data, dict) and parse_flag(data.get('trace_paging'))
+
+def page_trace(formatted, sections=DEFAULT_TRACE_SECTIONS):
+    """
+    Nếu client yêu cầu phân trang vết, chuyển các danh sách bước của kết quả vào bộ lưu vết
+    và chỉ trả về mã tra cứu cùng số bước; ngược lại trả về kết quả như cũ.
+    """
+    if trace_paging_requested():
+        return store_trace(formatted, sections)
+    return formatted
+
+def _int_arg(name, default):
+    value = request.args.get(name)
+    if value is None or not value.strip():
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"Tham số {name} phải là số nguyên.")
+
+@trace_bp.route('/<handle>', methods=['GET', 'DELETE'])
+def trace_route(handle):
+    """
+    GET /api/trace/<handle>?section=steps&from=0&to=20: lấy các bước from ≤ i < to của vết.
+    Với phần có tên trong "tables" (bảng lặp), mỗi phần tử là một hàng của bảng.
+    DELETE /api/trace/<handle>: xóa vết khi client không cần nữa.
+    """
+    try:
+        if request.method == 'DELETE':
+            if not delete_trace(handle):
+                return jsonify({"error": f"Vết '{handle}' không tồn tại hoặc đã hết hạn."}), 404
+            return jsonify({"status": "success", "message": "Đã xóa vết.", "handle": handle}), 200
+
+        section = request.args.get('section') or 'steps'
+        start = _int_arg('from', 0)
+        stop = _int_arg('to', None)
+        return jsonify(get_trace_page(handle, section, start, stop)), 200
+
+    except KeyError as e:
+        return jsonify({"error": e.args[0]}), 404
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": f"Đã xảy ra lỗi không mong muốn: {str(e)}"}), 500
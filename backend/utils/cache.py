@@ -0,0 +1,167 @@
+# backend/utils/cache.py
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    Bộ nhớ đệm LRU có giới hạn kích thước, an toàn khi dùng đa luồng.
+    Đếm số lần trúng (hit), trượt (miss) và số phần tử bị loại bỏ (eviction).
+    Nếu có max_bytes và sizeof, bộ nhớ đệm còn giới hạn tổng dung lượng (byte)
+    của các giá trị; sizeof(value) trả về dung lượng ước tính của một giá trị.
+    Nếu có ttl (giây), phần tử không được truy cập quá ttl giây sẽ hết hạn và bị loại bỏ
+    (đếm trong expirations).
+    """
+
+    def __init__(self, maxsize=128, max_bytes=None, sizeof=None, ttl=None, clock=time.monotonic):
+        if maxsize < 1:
+            raise ValueError("Kích thước bộ nhớ đệm phải lớn hơn 0.")
+        if max_bytes is not None and sizeof is None:
+            raise ValueError("Cần cung cấp hàm sizeof khi giới hạn dung lượng bộ nhớ đệm.")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("Thời gian sống (ttl) của bộ nhớ đệm phải lớn hơn 0.")
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._sizeof = sizeof
+        self._clock = clock
+        self._data = OrderedDict()
+        self._sizes = {}
+        self._touched = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _value_size(self, value):
+        return int(self._sizeof(value)) if self._sizeof is not None else 0
+
+    def _remove(self, key):
+        # Gọi khi đang giữ khóa
+        self._bytes -= self._sizes.pop(key)
+        self._touched.pop(key, None)
+        return self._data.pop(key)
+
+    def _expire(self):
+        # Gọi khi đang giữ khóa. Các phần tử được sắp theo thời điểm truy cập (cũ nhất ở đầu),
+        # nên chỉ cần loại từ đầu cho đến phần tử đầu tiên còn hạn.
+        if self.ttl is None:
+            return
+        deadline = self._clock() - self.ttl
+        while self._data:
+            oldest = next(iter(self._data))
+            if self._touched[oldest] > deadline:
+                break
+            self._remove(oldest)
+            self.expirations += 1
+
+    def _touch(self, key):
+        # Gọi khi đang giữ khóa
+        self._data.move_to_end(key)
+        if self.ttl is not None:
+            self._touched[key] = self._clock()
+
+    def _store(self, key, value, size):
+        # Gọi khi đang giữ khóa
+        if key in self._data:
+            self._bytes -= self._sizes.pop(key)
+        self._data[key] = value
+        self._touch(key)
+        self._sizes[key] = size
+        self._bytes += size
+        while len(self._data) > self.maxsize or (self.max_bytes is not None and self._bytes > self.max_bytes):
+            old_key = next(iter(self._data))
+            self._remove(old_key)
+            self.evictions += 1
+
+    def _fits(self, size):
+        return self.max_bytes is None or size <= self.max_bytes
+
+    def get(self, key, default=None):
+        with self._lock:
+            self._expire()
+            if key in self._data:
+                self._touch(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        """Lưu giá trị; trả về False nếu giá trị lớn hơn cả dung lượng cho phép nên không được lưu."""
+        size = self._value_size(value)
+        with self._lock:
+            if not self._fits(size):
+                return False
+            self._expire()
+            self._store(key, value, size)
+            return True
+
+    def get_or_create(self, key, factory):
+        """
+        Lấy giá trị theo khóa; nếu chưa có thì gọi factory() để tạo và lưu lại.
+        factory() chạy ngoài khóa để không chặn các luồng khác; nếu nó ném lỗi
+        thì không có gì được lưu.
+        """
+        with self._lock:
+            self._expire()
+            if key in self._data:
+                self._touch(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+
+        value = factory()
+        size = self._value_size(value)
+
+        with self._lock:
+            # Một luồng khác có thể đã tạo xong trước, ưu tiên giá trị đã có
+            if key in self._data:
+                self._touch(key)
+                return self._data[key]
+            if self._fits(size):
+                self._store(key, value, size)
+            return value
+
+    def pop(self, key, default=None):
+        with self._lock:
+            self._expire()
+            if key not in self._data:
+                return default
+            return self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self._touched.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def stats(self):
+        with self._lock:
+            self._expire()
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "ttl": self.ttl,
+                "expirations": self.expirations
+            }
+
+    def __len__(self):
+        with self._lock:
+            self._expire()
+            return len(self._data)
+
+    def __contains__(self, key):
+        with self._lock:
+            self._expire()
+            return key in self._data
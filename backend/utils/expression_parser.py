@@ -1,13 +1,85 @@
 # /utils/expression_parser.py
-from sympy import sympify, lambdify, symbols, SympifyError, diff
+from sympy import sympify, lambdify, symbols, SympifyError, diff, Matrix
 import numpy as np
+from backend.utils.cache import LRUCache
+
+# Bộ nhớ đệm dùng chung cho các biểu thức đã biên dịch (tìm nghiệm, bình phương
+# tối thiểu, hệ phi tuyến). Khóa là chuỗi biểu thức đã chuẩn hóa khoảng trắng.
+EXPRESSION_CACHE_SIZE = 256
+_expression_cache = LRUCache(maxsize=EXPRESSION_CACHE_SIZE)
+
+def _normalize_expression(expr_str):
+    """
+    Chuẩn hóa chuỗi biểu thức để làm khóa cho bộ nhớ đệm:
+    bỏ khoảng trắng đầu/cuối và gộp các khoảng trắng liên tiếp.
+    """
+    if expr_str is None:
+        return ""
+    return " ".join(str(expr_str).split())
+
+def sympify_expression(expr_str):
+    """
+    Chuyển chuỗi thành biểu thức SymPy, có dùng bộ nhớ đệm.
+    Ném ra SympifyError/TypeError/SyntaxError nếu biểu thức không hợp lệ.
+    """
+    key = _normalize_expression(expr_str)
+    return _expression_cache.get_or_create(("expr", key), lambda: sympify(key))
+
+def compile_expression(expr_str):
+    """
+    Biên dịch biểu thức một biến x thành các hàm NumPy f, f', f'' (có dùng bộ nhớ đệm).
+    Kết quả trả về được dùng chung giữa các request, nơi gọi không được sửa đổi nó.
+    """
+    key = _normalize_expression(expr_str)
+
+    def build():
+        x = symbols('x')
+        expr = sympify_expression(key)
+        first_derivative = expr.diff(x)
+        return {
+            "expr": expr,
+            "f": lambdify(x, expr, 'numpy'),
+            "f_prime": lambdify(x, first_derivative, 'numpy'),
+            "f_double_prime": lambdify(x, first_derivative.diff(x), 'numpy')
+        }
+
+    return _expression_cache.get_or_create(("univariate", key), build)
+
+def compile_system(expr_list, n):
+    """
+    Biên dịch hệ F(X) = [f_1, ..., f_n] theo các biến x1..xn thành hàm NumPy
+    cho F và ma trận Jacobi J (có dùng bộ nhớ đệm).
+    Trả về dict gồm các biến, F, J dạng symbolic và F_num, J_num đã lambdify.
+    """
+    keys = tuple(_normalize_expression(expr) for expr in expr_list)
+
+    def build():
+        variables = symbols(f'x1:{n+1}')
+        F = Matrix([sympify_expression(expr) for expr in keys])
+        J = F.jacobian(variables)
+        return {
+            "variables": variables,
+            "F": F,
+            "J": J,
+            "F_num": lambdify(variables, F, 'numpy'),
+            "J_num": lambdify(variables, J, 'numpy')
+        }
+
+    return _expression_cache.get_or_create(("system", n, keys), build)
+
+def get_expression_cache_stats():
+    """
+    Trả về thống kê của bộ nhớ đệm biểu thức (kích thước, hit, miss, eviction).
+    """
+    return _expression_cache.stats()
+
 def get_derivative(expr_str):
     """
     Tính đạo hàm của một biểu thức dạng chuỗi và trả về chuỗi biểu diễn đạo hàm.
     """
     try:
         x = symbols('x')
-        expr = sympify(expr_str)
+        expr = sympify_expression(expr_str)
         derivative_expr = diff(expr, x)
         return str(derivative_expr)
     except (SympifyError, TypeError, SyntaxError):
@@ -20,20 +92,14 @@ def parse_expression(expr_str):
     Trả về một dict chứa các hàm f, f' và f''.
     """
     try:
-        x = symbols('x')
-        expr = sympify(expr_str)
-        
-        # Tạo các hàm số có thể gọi
-        f = lambdify(x, expr, 'numpy')
-        f_prime = lambdify(x, expr.diff(x), 'numpy')
-        f_double_prime = lambdify(x, expr.diff(x).diff(x), 'numpy')
+        compiled = compile_expression(expr_str)
         
         return {
             "success": True,
-            "f": f,
-            "f_prime": f_prime,
-            "f_double_prime": f_double_prime,
-            "expr": expr
+            "f": compiled["f"],
+            "f_prime": compiled["f_prime"],
+            "f_double_prime": compiled["f_double_prime"],
+            "expr": compiled["expr"]
         }
     except (SympifyError, TypeError, SyntaxError) as e:
         return {
@@ -46,19 +112,15 @@ def parse_phi_expression(expr_str):
     Phân tích hàm lặp phi(x) cho phương pháp lặp đơn.
     """
     try:
-        x = symbols('x')
-        expr = sympify(expr_str)
-        
-        phi = lambdify(x, expr, 'numpy')
-        phi_prime = lambdify(x, expr.diff(x), 'numpy')
+        compiled = compile_expression(expr_str)
         
         return {
             "success": True,
-            "phi": phi,
-            "phi_prime": phi_prime
+            "phi": compiled["f"],
+            "phi_prime": compiled["f_prime"]
         }
     except (SympifyError, TypeError, SyntaxError) as e:
         return {
             "success": False,
             "error": f"Hàm lặp φ(x) không hợp lệ: {str(e)}"
-        }
\ No newline at end of file
+        }
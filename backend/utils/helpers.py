@@ -1,15 +1,31 @@
 # backend/utils/helpers.py
 import numpy as np
 import re
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
 
 def parse_matrix_from_string(matrix_str):
     """
     Chuyển đổi một chuỗi ma trận thành một mảng NumPy.
     Ném ra lỗi ValueError với thông báo tường minh nếu định dạng sai.
+    Nếu đầu vào đã là mảng NumPy (gửi dạng nhị phân) thì dùng trực tiếp,
+    vector 1 chiều được coi là vector cột như khi nhập dạng văn bản.
     """
+    if isinstance(matrix_str, np.ndarray):
+        matrix = np.asarray(matrix_str, dtype=float)
+        if matrix.size == 0:
+            raise ValueError("Lỗi: Dữ liệu đầu vào bị rỗng.")
+        return matrix.reshape(-1, 1) if matrix.ndim == 1 else matrix
+
     if not matrix_str.strip():
         raise ValueError("Lỗi: Dữ liệu đầu vào bị rỗng.")
 
+    # Đường nhanh: chuyển đổi cả chuỗi trong một lần. Nếu không được (dữ liệu sai định dạng
+    # hoặc cú pháp số đặc biệt) thì dùng vòng lặp từng hàng bên dưới để báo lỗi chi tiết.
+    matrix = _parse_matrix_fast(matrix_str.strip())
+    if matrix is not None:
+        return matrix
+
     # Tách chuỗi thành các hàng
     rows = matrix_str.strip().split('\n')
     matrix_list = []
@@ -37,6 +53,51 @@ def parse_matrix_from_string(matrix_str):
         
     return np.array(matrix_list)
 
+# Các ký tự điều khiển ASCII mà str.split() coi là khoảng trắng (ngoài dấu cách)
+_WHITESPACE_CONTROL_BYTES = np.array([ord(c) for c in '\t\n\r\x0b\x0c'], dtype=np.uint8)
+# Bảng thay '\r', '\x0b', '\x0c' bằng dấu cách: chúng chỉ là dấu phân cách trong một hàng,
+# nhưng np.loadtxt lại coi '\r' là xuống dòng
+_SPACE_TRANSLATION = bytes.maketrans(b'\r\x0b\x0c', b'   ')
+
+def _parse_matrix_fast(text):
+    """
+    Phân tích ma trận dạng văn bản trong một lần bằng np.loadtxt (bộ đọc viết bằng C),
+    số cột được kiểm tra trên toàn bộ mảng thay vì từng hàng.
+    Trả về None nếu không chắc kết quả giống hệt cách phân tích từng hàng
+    (ký tự không phải ASCII, ký tự điều khiển lạ, hàng trống, số cột không đồng nhất, token không hợp lệ...).
+    """
+    try:
+        raw = text.encode('ascii')
+    except UnicodeEncodeError:
+        return None
+
+    buf = np.frombuffer(raw, dtype=np.uint8)
+    if not np.all(np.isin(buf[buf < ord(' ')], _WHITESPACE_CONTROL_BYTES)):
+        return None
+
+    lines = raw.translate(_SPACE_TRANSLATION).decode('ascii').split('\n')
+    try:
+        values = np.loadtxt(lines, dtype=float, comments=None, ndmin=2)
+    except ValueError:
+        return None
+    # np.loadtxt bỏ qua các hàng trống, còn cách phân tích từng hàng coi đó là lỗi số cột
+    if values.shape[0] != len(lines) or values.shape[1] == 0:
+        return None
+    return values
+
+def is_blank(value):
+    """
+    Kiểm tra một trường đầu vào có bị bỏ trống không (None hoặc chuỗi rỗng).
+    Mảng NumPy (gửi dạng nhị phân) luôn được coi là đã nhập.
+    """
+    return value is None or (isinstance(value, str) and not value.strip())
+
+def parse_flag(value):
+    """
+    Đọc tham số bật/tắt từ request: JSON (true/false) hoặc query string / form ('true', '1').
+    """
+    return value is True or (isinstance(value, str) and value.strip().lower() in ('true', '1'))
+
 def zero_small(x, tol=1e-15):
     """
     Làm tròn các giá trị rất nhỏ trong một mảng NumPy về 0.
@@ -48,10 +109,55 @@ def zero_small(x, tol=1e-15):
     Returns:
         np.ndarray: Mảng mới với các giá trị nhỏ đã được làm tròn về 0.
     """
+    if sp.issparse(x):
+        # Ma trận thưa: làm tròn trên các phần tử khác 0 rồi loại bỏ chúng khỏi cấu trúc thưa
+        x_sparse = x.tocsr(copy=True)
+        x_sparse.data[np.abs(x_sparse.data) < tol] = 0.0
+        x_sparse.eliminate_zeros()
+        return x_sparse
     x_arr = np.array(x)
     x_arr[np.abs(x_arr) < tol] = 0.0
     return x_arr
 
+# Các hàm dưới đây dùng chung cho ma trận đặc (np.ndarray) và ma trận thưa (scipy.sparse):
+# với ma trận thưa mọi phép tính chỉ duyệt qua các phần tử khác 0, bộ nhớ tỉ lệ với nnz.
+
+def abs_row_sums(A):
+    """Tổng trị tuyệt đối các phần tử trên mỗi hàng của A (vector 1 chiều)."""
+    return np.asarray(abs(A).sum(axis=1)).ravel()
+
+def abs_col_sums(A):
+    """Tổng trị tuyệt đối các phần tử trên mỗi cột của A (vector 1 chiều)."""
+    return np.asarray(abs(A).sum(axis=0)).ravel()
+
+def matrix_norm(A, ord):
+    """Chuẩn ma trận (ord = 1 hoặc np.inf) cho cả ma trận đặc và ma trận thưa."""
+    if sp.issparse(A):
+        return float(spla.norm(A, ord))
+    return np.linalg.norm(A, ord)
+
+def estimate_norm2(A, max_iter=30, rtol=1e-6, seed=0):
+    """
+    Ước lượng ||A||₂ = σ_max(A) bằng lặp lũy thừa trên AᵀA (mỗi bước hai phép nhân ma trận-vector, O(n²)),
+    thay cho np.linalg.norm(A, 2) vốn phải tính toàn bộ SVD (O(n³)).
+    Giá trị ước lượng luôn không vượt quá σ_max. Trả về (ước lượng, số bước lặp).
+    """
+    v = np.random.default_rng(seed).standard_normal(A.shape[1])
+    v /= np.linalg.norm(v)
+    sigma = 0.0
+    for i in range(1, max_iter + 1):
+        w = A @ v
+        sigma_new = float(np.linalg.norm(w))
+        z = A.T @ w
+        z_norm = np.linalg.norm(z)
+        if z_norm == 0:
+            return sigma_new, i
+        v = z / z_norm
+        if abs(sigma_new - sigma) <= rtol * sigma_new:
+            return sigma_new, i
+        sigma = sigma_new
+    return sigma, max_iter
+
 def get_char_polynomial(A):
     """
     Lấy đa thức đặc trưng từ ma trận Frobenius (dạng đồng hành).
@@ -61,4 +167,32 @@ def get_char_polynomial(A):
     p[0] = 1.0
     if n > 0:
         p[1:] = -A[0, :].real
-    return p
\ No newline at end of file
+    return p
+
+# Mức lưu vết các bước trung gian của thuật toán:
+# - 'none':    không lưu bước nào, chỉ trả về kết quả cuối cùng.
+# - 'summary': chỉ lưu thông tin vô hướng của từng bước (loại bước, pivot, sai số...),
+#              không lưu bản sao ma trận/vector.
+# - 'full':    lưu đầy đủ bản sao ma trận/vector ở mỗi bước (mặc định, dùng cho giao diện).
+TRACE_LEVELS = ('none', 'summary', 'full')
+
+def parse_trace_level(value, default='full'):
+    """
+    Kiểm tra và chuẩn hóa mức lưu vết lấy từ request.
+    Ném ra lỗi ValueError nếu giá trị không hợp lệ.
+    """
+    if value is None or str(value).strip() == '':
+        return default
+    level = str(value).strip().lower()
+    if level not in TRACE_LEVELS:
+        raise ValueError(f"Mức lưu vết '{value}' không hợp lệ. Chỉ hỗ trợ: {', '.join(TRACE_LEVELS)}.")
+    return level
+
+def trace_snapshot(x, trace):
+    """
+    Trả về bản sao của x nếu mức lưu vết là 'full', ngược lại trả về None.
+    """
+    if trace != 'full' or x is None:
+        return None
+    return x.copy()
+
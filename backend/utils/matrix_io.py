@@ -0,0 +1,305 @@
+# backend/utils/matrix_io.py
+import io
+import json
+import numpy as np
+import scipy.io
+import scipy.sparse as sp
+from numpy.lib import format as npy_format
+from backend.utils.helpers import parse_matrix_from_string
+from backend.utils.serialization import decode_array
+
+# Số vế phải (hàng của B) được gom lại để giải trong một lần khi đọc dạng luồng
+DEFAULT_STREAM_CHUNK_ROWS = 1024
+
+# Kiểu nội dung nhị phân cho ma trận: một hoặc nhiều mảng .npy nối tiếp nhau,
+# hoặc dữ liệu float64 little-endian thô kèm header X-Matrix-Shape (ví dụ "3,3;3,1").
+BINARY_MIMETYPES = ('application/octet-stream', 'application/x-npy')
+NPY_MAGIC = b'\x93NUMPY'
+RAW_DTYPE = np.dtype('<f8')
+
+# Ma trận thưa có thể gửi dưới dạng: bộ ba COO qua JSON {"shape": [m, n], "row": [...], "col": [...], "data": [...]},
+# văn bản Matrix Market (.mtx), hoặc tệp .npz của scipy.sparse.save_npz (tải lên dạng multipart).
+MATRIX_MARKET_BANNER = '%%MatrixMarket'
+
+def read_exact(stream, nbytes):
+    """
+    Đọc đúng nbytes byte từ luồng (luồng có thể trả về ít hơn số byte yêu cầu mỗi lần).
+    Trả về ít hơn nbytes byte chỉ khi luồng đã hết dữ liệu.
+    """
+    chunks = []
+    remaining = nbytes
+    while remaining > 0:
+        data = stream.read(remaining)
+        if not data:
+            break
+        chunks.append(data)
+        remaining -= len(data)
+    return b"".join(chunks)
+
+def read_npy_header(stream):
+    """
+    Đọc phần đầu của tệp .npy từ luồng, trả về (shape, dtype).
+    Chỉ hỗ trợ mảng số thực/số nguyên lưu theo thứ tự hàng (C order).
+    """
+    try:
+        version = npy_format.read_magic(stream)
+        if version == (1, 0):
+            shape, fortran_order, dtype = npy_format.read_array_header_1_0(stream)
+        else:
+            shape, fortran_order, dtype = npy_format.read_array_header_2_0(stream)
+    except ValueError as e:
+        raise ValueError(f"Dữ liệu .npy không hợp lệ: {e}")
+    if fortran_order and len(shape) > 1:
+        raise ValueError("Không hỗ trợ mảng .npy lưu theo thứ tự cột (Fortran order).")
+    if dtype.kind not in "fiu" or dtype.hasobject:
+        raise ValueError(f"Kiểu dữ liệu .npy '{dtype}' không được hỗ trợ, cần mảng số thực.")
+    return shape, dtype
+
+def iter_npy_rows(stream, shape, dtype, chunk_rows=DEFAULT_STREAM_CHUNK_ROWS):
+    """
+    Đọc dần các hàng của mảng .npy (sau phần đầu) theo từng khối tối đa chunk_rows hàng.
+    Mỗi khối là mảng float (k, n). Mảng 1 chiều được coi là một hàng.
+    """
+    if len(shape) == 1:
+        shape = (1, shape[0])
+    if len(shape) != 2:
+        raise ValueError(f"Mảng .npy phải có 1 hoặc 2 chiều, nhận được {len(shape)} chiều.")
+    num_rows, num_cols = shape
+    row_bytes = num_cols * dtype.itemsize
+    read_rows = 0
+    while read_rows < num_rows:
+        k = min(chunk_rows, num_rows - read_rows)
+        buf = read_exact(stream, k * row_bytes)
+        if len(buf) != k * row_bytes:
+            raise ValueError(f"Dữ liệu .npy bị cắt cụt: mới đọc được {read_rows + len(buf) // max(row_bytes, 1)}/{num_rows} hàng.")
+        yield np.frombuffer(buf, dtype=dtype).reshape(k, num_cols).astype(float, copy=False)
+        read_rows += k
+
+def parse_ndjson_rows(line, line_number):
+    """
+    Phân tích một dòng NDJSON chứa một vector (danh sách số) hoặc một khối vector (danh sách các danh sách).
+    Trả về mảng float 2 chiều (k, n), hoặc None nếu dòng rỗng.
+    """
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        rows = np.array(json.loads(line), dtype=float)
+    except (ValueError, TypeError):
+        raise ValueError(f"Dòng {line_number}: dữ liệu không phải là vector/ma trận số hợp lệ.")
+    if rows.ndim == 1:
+        rows = rows.reshape(1, -1)
+    if rows.ndim != 2:
+        raise ValueError(f"Dòng {line_number}: mỗi dòng phải là một vector hoặc một danh sách các vector.")
+    return rows
+
+def iter_ndjson_rows(lines, num_cols=None, first_line_number=2, chunk_rows=DEFAULT_STREAM_CHUNK_ROWS):
+    """
+    Gom các vector từ các dòng NDJSON thành từng khối khoảng chunk_rows hàng.
+    Nếu có num_cols, mỗi vector phải có đúng num_cols phần tử.
+    """
+    pending = []
+    pending_rows = 0
+    for line_number, line in enumerate(lines, start=first_line_number):
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        rows = parse_ndjson_rows(line, line_number)
+        if rows is None:
+            continue
+        if num_cols is not None and rows.shape[1] != num_cols:
+            raise ValueError(f"Dòng {line_number}: mỗi vector phải có đúng {num_cols} phần tử, nhận được {rows.shape[1]}.")
+        pending.append(rows)
+        pending_rows += rows.shape[0]
+        if pending_rows >= chunk_rows:
+            yield np.vstack(pending)
+            pending, pending_rows = [], 0
+    if pending:
+        yield np.vstack(pending)
+
+def parse_shape_header(shape_header):
+    """
+    Phân tích header kích thước dạng "m,n;k" thành danh sách các tuple kích thước.
+    """
+    shapes = []
+    for part in str(shape_header).split(';'):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            shape = tuple(int(dim) for dim in part.replace('x', ',').split(','))
+        except ValueError:
+            raise ValueError(f"Header X-Matrix-Shape không hợp lệ: '{shape_header}'.")
+        if not 1 <= len(shape) <= 2 or any(dim < 0 for dim in shape):
+            raise ValueError(f"Kích thước '{part}' không hợp lệ, chỉ hỗ trợ vector hoặc ma trận 2 chiều.")
+        shapes.append(shape)
+    if not shapes:
+        raise ValueError("Header X-Matrix-Shape không chứa kích thước nào.")
+    return shapes
+
+def parse_binary_matrices(buffer, shape_header=None):
+    """
+    Đọc các ma trận từ dữ liệu nhị phân mà không sao chép (np.frombuffer):
+    - nếu dữ liệu bắt đầu bằng chữ ký .npy: một hoặc nhiều mảng .npy nối tiếp nhau;
+    - ngược lại: float64 little-endian thô, kích thước lấy từ shape_header.
+    Các mảng trả về chỉ đọc và dùng chung bộ nhớ với buffer.
+    """
+    buffer = memoryview(buffer)
+    arrays = []
+    if bytes(buffer[:len(NPY_MAGIC)]) == NPY_MAGIC:
+        stream = io.BytesIO(buffer)
+        offset = 0
+        while offset < len(buffer):
+            stream.seek(offset)
+            shape, dtype = read_npy_header(stream)
+            if len(shape) > 2:
+                raise ValueError(f"Mảng .npy thứ {len(arrays) + 1} có {len(shape)} chiều, chỉ hỗ trợ vector hoặc ma trận.")
+            count = int(np.prod(shape))
+            start = stream.tell()
+            end = start + count * dtype.itemsize
+            if end > len(buffer):
+                raise ValueError(f"Mảng .npy thứ {len(arrays) + 1} bị cắt cụt.")
+            arrays.append(np.frombuffer(buffer, dtype=dtype, count=count, offset=start).reshape(shape))
+            offset = end
+        return arrays
+
+    if shape_header is None:
+        raise ValueError("Dữ liệu nhị phân thô cần header X-Matrix-Shape (ví dụ '3,3;3,1'), hoặc hãy gửi tệp .npy.")
+    shapes = parse_shape_header(shape_header)
+    expected = sum(int(np.prod(shape)) for shape in shapes) * RAW_DTYPE.itemsize
+    if len(buffer) != expected:
+        raise ValueError(f"Kích thước dữ liệu ({len(buffer)} byte) không khớp với X-Matrix-Shape ({expected} byte).")
+    offset = 0
+    for shape in shapes:
+        count = int(np.prod(shape))
+        arrays.append(np.frombuffer(buffer, dtype=RAW_DTYPE, count=count, offset=offset).reshape(shape))
+        offset += count * RAW_DTYPE.itemsize
+    return arrays
+
+def encode_npy(arrays):
+    """
+    Ghi danh sách mảng thành các tệp .npy nối tiếp nhau.
+    """
+    out = io.BytesIO()
+    for array in arrays:
+        npy_format.write_array(out, np.ascontiguousarray(array), allow_pickle=False)
+    return out.getvalue()
+
+def format_shape_header(arrays):
+    return ';'.join(','.join(str(dim) for dim in np.shape(array)) for array in arrays)
+
+def is_sparse_input(value):
+    """
+    Kiểm tra dữ liệu đầu vào có phải ma trận thưa không (bộ ba COO, văn bản Matrix Market hoặc scipy.sparse).
+    """
+    if sp.issparse(value) or isinstance(value, dict):
+        return True
+    return isinstance(value, str) and value.lstrip().startswith(MATRIX_MARKET_BANNER)
+
+def parse_sparse_matrix(value):
+    """
+    Chuyển dữ liệu ma trận thưa về dạng CSR (float).
+    Văn bản Matrix Market dạng 'array' (ma trận đặc) được trả về dưới dạng mảng NumPy.
+    """
+    if sp.issparse(value):
+        return value.tocsr().astype(float)
+
+    if isinstance(value, str):
+        try:
+            matrix = scipy.io.mmread(io.StringIO(value))
+        except ValueError as e:
+            raise ValueError(f"Dữ liệu Matrix Market không hợp lệ: {e}")
+        if sp.issparse(matrix):
+            return matrix.tocsr().astype(float)
+        return np.asarray(matrix, dtype=float)
+
+    missing = [key for key in ('shape', 'row', 'col', 'data') if key not in value]
+    if missing:
+        raise ValueError(f"Ma trận thưa dạng COO thiếu trường: {', '.join(missing)}.")
+    try:
+        shape = tuple(int(dim) for dim in value['shape'])
+        row = np.asarray(decode_array(value['row']), dtype=np.int64).ravel()
+        col = np.asarray(decode_array(value['col']), dtype=np.int64).ravel()
+        data = np.asarray(decode_array(value['data']), dtype=float).ravel()
+    except (TypeError, ValueError):
+        raise ValueError("Ma trận thưa dạng COO không hợp lệ: shape, row, col, data phải là các dãy số.")
+    if len(shape) != 2 or min(shape) <= 0:
+        raise ValueError(f"Kích thước ma trận thưa {list(shape)} không hợp lệ.")
+    if not (row.size == col.size == data.size):
+        raise ValueError(f"Các trường row, col, data phải có cùng độ dài (nhận được {row.size}, {col.size}, {data.size}).")
+    if row.size and (row.min() < 0 or row.max() >= shape[0] or col.min() < 0 or col.max() >= shape[1]):
+        raise ValueError(f"Chỉ số hàng/cột nằm ngoài kích thước ma trận {shape[0]}x{shape[1]}.")
+    # Các phần tử trùng vị trí được cộng dồn (quy ước của định dạng COO)
+    return sp.coo_matrix((data, (row, col)), shape=shape).tocsr()
+
+def parse_matrix_input(value):
+    """
+    Phân tích ma trận đầu vào có thể là ma trận thưa (xem is_sparse_input) hoặc ma trận đặc (văn bản / mảng NumPy).
+    """
+    if is_sparse_input(value):
+        return parse_sparse_matrix(value)
+    return parse_matrix_from_string(value)
+
+def read_uploaded_matrix(file_storage):
+    """
+    Đọc một ma trận được tải lên dạng multipart:
+    .npz (scipy.sparse.save_npz) -> ma trận thưa, .npy -> mảng NumPy,
+    các tệp khác (.mtx, .txt...) -> chuỗi văn bản để phân tích tiếp.
+    """
+    filename = (file_storage.filename or '').lower()
+    content = file_storage.read()
+    if filename.endswith('.npz'):
+        try:
+            return sp.load_npz(io.BytesIO(content))
+        except (ValueError, OSError) as e:
+            raise ValueError(f"Tệp '{file_storage.filename}' không phải ma trận thưa .npz hợp lệ: {e}")
+    if filename.endswith('.npy'):
+        return parse_binary_matrices(content)[0]
+    try:
+        return content.decode('utf-8')
+    except UnicodeDecodeError:
+        raise ValueError(f"Tệp '{file_storage.filename}' không phải tệp văn bản hợp lệ.")
+
+# Lưu trữ dạng gói (packed) cho ma trận đối xứng: chỉ gồm n(n+1)/2 phần tử tam giác trên, lần lượt theo hàng
+# (a₀₀ a₀₁ ... a₀,ₙ₋₁ a₁₁ ... aₙ₋₁,ₙ₋₁). Thứ tự này trùng với định dạng gói 'L' (tam giác dưới theo cột)
+# của LAPACK nên được truyền thẳng cho dpptrf/dpptrs/dpptri mà không cần chuyển đổi.
+
+def packed_order(size):
+    """Cấp n của ma trận đối xứng có size = n(n+1)/2 phần tử dạng gói."""
+    n = int(round((np.sqrt(8 * size + 1) - 1) / 2))
+    if size == 0 or n * (n + 1) // 2 != size:
+        raise ValueError(f"Số phần tử {size} không có dạng n(n+1)/2 của tam giác trên một ma trận đối xứng.")
+    return n
+
+def packed_diagonal_indices(n):
+    """Vị trí các phần tử đường chéo trong mảng dạng gói."""
+    i = np.arange(n)
+    return i * n - i * (i - 1) // 2
+
+def parse_packed_matrix(value):
+    """
+    Phân tích ma trận đối xứng dạng gói (danh sách / mảng / văn bản gồm n(n+1)/2 số).
+    Trả về (mảng 1 chiều float, n).
+    """
+    if isinstance(value, str):
+        try:
+            packed = np.array(value.replace(',', ' ').split(), dtype=float)
+        except ValueError:
+            raise ValueError("Ma trận dạng gói chỉ được chứa các số (tam giác trên, lần lượt theo hàng).")
+    else:
+        try:
+            packed = np.asarray(value, dtype=float).ravel()
+        except (TypeError, ValueError):
+            raise ValueError("Ma trận dạng gói chỉ được chứa các số (tam giác trên, lần lượt theo hàng).")
+    if not np.all(np.isfinite(packed)):
+        raise ValueError("Ma trận dạng gói chứa giá trị không hữu hạn (NaN hoặc vô cùng).")
+    return packed, packed_order(packed.size)
+
+def pack_upper(M):
+    """Lấy tam giác trên của M dưới dạng gói."""
+    return np.asarray(M, dtype=float)[np.triu_indices(M.shape[0])]
+
+def unpack_upper(packed, n):
+    """Dựng lại ma trận đối xứng n×n từ dạng gói."""
+    M = np.zeros((n, n), dtype=float)
+    M[np.triu_indices(n)] = packed
+    return M + np.triu(M, 1).T
@@ -0,0 +1,141 @@
+# backend/utils/serialization.py
+import base64
+import json
+from contextvars import ContextVar
+
+import numpy as np
+import scipy.sparse as sp
+from flask import request, g
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # orjson là tùy chọn, không có thì dùng thư viện json chuẩn
+    orjson = None
+
+# Cách mã hóa các mảng NumPy trong kết quả JSON:
+# - 'list'  : danh sách lồng nhau như trước (mảng được giữ nguyên đến lúc mã hóa JSON,
+#             nên khi có orjson sẽ được ghi trực tiếp từ bộ nhớ mà không qua .tolist());
+# - 'base64': {"dtype": "<f8", "shape": [...], "data": "<base64>"} - bộ đệm nhị phân của mảng,
+#             gọn hơn và nhanh hơn nhiều với ma trận lớn.
+# Client chọn 'base64' bằng header Accept: application/vnd.numcalc.b64+json.
+ARRAY_ENCODINGS = ('list', 'base64')
+B64_JSON_MIMETYPE = 'application/vnd.numcalc.b64+json'
+
+_array_encoding = ContextVar('array_encoding', default='list')
+
+def get_array_encoding():
+    return _array_encoding.get()
+
+def set_array_encoding(encoding):
+    """
+    Đặt cách mã hóa mảng cho ngữ cảnh hiện tại, trả về token để khôi phục bằng reset_array_encoding.
+    """
+    if encoding not in ARRAY_ENCODINGS:
+        raise ValueError(f"Cách mã hóa mảng '{encoding}' không hợp lệ. Chỉ hỗ trợ: {', '.join(ARRAY_ENCODINGS)}.")
+    return _array_encoding.set(encoding)
+
+def reset_array_encoding(token):
+    _array_encoding.reset(token)
+
+def encode_array(x):
+    """
+    Chuẩn bị một mảng (hoặc None) để đưa vào kết quả JSON theo cách mã hóa hiện tại.
+    Các formatter dùng hàm này thay cho .tolist().
+    Ma trận thưa (scipy.sparse) được trả về dạng bộ ba COO {"shape", "row", "col", "data"}.
+    """
+    if x is None:
+        return None
+    if sp.issparse(x):
+        coo = x.tocoo()
+        return {
+            "shape": list(coo.shape),
+            "row": encode_array(coo.row),
+            "col": encode_array(coo.col),
+            "data": encode_array(coo.data)
+        }
+    arr = np.asarray(x)
+    if arr.dtype.kind not in 'biufc':
+        return arr.tolist()
+    if _array_encoding.get() == 'base64':
+        arr = np.ascontiguousarray(arr, dtype=arr.dtype.newbyteorder('<'))
+        return {
+            "dtype": arr.dtype.str,
+            "shape": list(arr.shape),
+            "data": base64.b64encode(arr.data).decode('ascii')
+        }
+    return arr
+
+def decode_array(obj):
+    """
+    Chuyển ngược một giá trị đã mã hóa bởi encode_array (danh sách, dict base64 hoặc bộ ba COO) về mảng NumPy / ma trận thưa.
+    """
+    if obj is None:
+        return None
+    if isinstance(obj, dict) and 'row' in obj and 'col' in obj:
+        return sp.coo_matrix((decode_array(obj['data']), (decode_array(obj['row']), decode_array(obj['col']))), shape=tuple(obj['shape']))
+    if isinstance(obj, dict) and 'data' in obj and 'dtype' in obj:
+        return np.frombuffer(base64.b64decode(obj['data']), dtype=np.dtype(obj['dtype'])).reshape(obj['shape'])
+    return np.asarray(obj)
+
+def _numpy_default(o):
+    if isinstance(o, np.ndarray):
+        return o.tolist()
+    if isinstance(o, np.generic):
+        return o.item()
+    return DefaultJSONProvider.default(o)
+
+class NumpyJSONProvider(DefaultJSONProvider):
+    """
+    Bộ mã hóa JSON của ứng dụng: hiểu mảng và số NumPy.
+    Dùng orjson (ghi mảng NumPy trực tiếp) nếu đã cài, ngược lại dùng json chuẩn.
+    """
+    default = staticmethod(_numpy_default)
+
+    def _orjson_option(self, kwargs):
+        # Chuyển các tham số mà Flask truyền khi tạo phản hồi (separators gọn hoặc indent=2)
+        # sang tùy chọn của orjson; trả về None nếu có tham số orjson không hỗ trợ.
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        for key, value in kwargs.items():
+            if key == 'separators' and tuple(value) == (',', ':'):
+                continue  # orjson luôn ghi dạng gọn
+            if key == 'indent' and value == 2:
+                option |= orjson.OPT_INDENT_2
+                continue
+            return None
+        return option
+
+    def dumps(self, obj, **kwargs):
+        # orjson không hỗ trợ các tùy chọn như indent tùy ý, khi đó dùng json chuẩn
+        option = self._orjson_option(kwargs) if orjson is not None else None
+        if option is not None:
+            return orjson.dumps(obj, default=_numpy_default, option=option).decode('utf-8')
+        kwargs.setdefault("default", self.default)
+        kwargs.setdefault("ensure_ascii", self.ensure_ascii)
+        kwargs.setdefault("sort_keys", self.sort_keys)
+        return json.dumps(obj, **kwargs)
+
+    def response(self, *args, **kwargs):
+        response = super().response(*args, **kwargs)
+        if _array_encoding.get() == 'base64':
+            response.mimetype = B64_JSON_MIMETYPE
+        return response
+
+def _negotiate_array_encoding():
+    best = request.accept_mimetypes.best_match(['application/json', B64_JSON_MIMETYPE])
+    g.array_encoding_token = set_array_encoding('base64' if best == B64_JSON_MIMETYPE else 'list')
+
+def _restore_array_encoding(exc=None):
+    token = g.pop('array_encoding_token', None)
+    if token is not None:
+        reset_array_encoding(token)
+
+def init_serialization(app):
+    """
+    Gắn bộ mã hóa JSON hiểu NumPy vào ứng dụng và chọn cách mã hóa mảng theo header Accept của mỗi request.
+    """
+    app.json = NumpyJSONProvider(app)
+    app.before_request(_negotiate_array_encoding)
+    app.teardown_request(_restore_array_encoding)
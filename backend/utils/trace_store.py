@@ -0,0 +1,106 @@
+# backend/utils/trace_store.py
+# Chức năng: Lưu các bước trung gian (vết) của kết quả ở phía máy chủ, sau một mã tra cứu (handle).
+# Phản hồi ban đầu chỉ chứa kết quả và độ dài vết; client lấy dần từng trang bước qua /api/trace/<handle>.
+import sys
+import uuid
+import numpy as np
+from backend.utils.cache import LRUCache
+
+# Các khóa chứa danh sách bước trong kết quả đã định dạng
+DEFAULT_TRACE_SECTIONS = ('steps', 'backward_steps')
+TRACE_STORE_SIZE = 64
+TRACE_STORE_BYTES = 256 * 1024 * 1024
+TRACE_STORE_TTL = 15 * 60
+DEFAULT_TRACE_PAGE_SIZE = 20
+MAX_TRACE_PAGE_SIZE = 500
+
+def _approx_nbytes(value):
+    # Ước lượng dung lượng của kết quả đã định dạng (dict/list lồng nhau, mảng NumPy, số, chuỗi)
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sum(_approx_nbytes(k) + _approx_nbytes(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return 8 * len(value) + sum(_approx_nbytes(v) for v in value)
+    if isinstance(value, str):
+        return len(value)
+    return sys.getsizeof(value) if value is not None else 0
+
+_traces = LRUCache(
+    maxsize=TRACE_STORE_SIZE,
+    max_bytes=TRACE_STORE_BYTES,
+    sizeof=_approx_nbytes,
+    ttl=TRACE_STORE_TTL
+)
+
+def get_trace_store_stats():
+    return _traces.stats()
+
+def _is_single_table(items):
+    # Các phương pháp lặp trả về steps = [{"table": [...]}]: một bước duy nhất chứa cả bảng lặp
+    return len(items) == 1 and isinstance(items[0], dict) and set(items[0]) == {"table"} \
+        and isinstance(items[0]["table"], list)
+
+def store_trace(formatted, sections=DEFAULT_TRACE_SECTIONS):
+    """
+    Chuyển các danh sách bước (theo sections) của kết quả đã định dạng vào bộ lưu vết.
+    Kết quả được thay bằng khóa "trace": {"handle", "sections": {tên: số bước}, "tables": [...], "ttl"}.
+    Phần có dạng [{"table": [...]}] (bảng lặp) được phân trang theo từng hàng của bảng và có tên trong "tables".
+    Nếu kết quả không có danh sách bước nào, hoặc vết lớn hơn dung lượng của bộ lưu vết,
+    thì các bước được giữ nguyên trong kết quả.
+    """
+    if not isinstance(formatted, dict):
+        return formatted
+    original = {name: formatted.pop(name) for name in sections if isinstance(formatted.get(name), list)}
+    if not original:
+        return formatted
+    tables = [name for name, items in original.items() if _is_single_table(items)]
+    stored = {name: items[0]["table"] if name in tables else items for name, items in original.items()}
+    handle = uuid.uuid4().hex
+    if not _traces.put(handle, stored):
+        # Không cấp mã tra cứu cho vết không lưu được: trả các bước về kết quả
+        formatted.update(original)
+        return formatted
+    formatted['trace'] = {
+        "handle": handle,
+        "sections": {name: len(items) for name, items in stored.items()},
+        "tables": tables,
+        "ttl": TRACE_STORE_TTL
+    }
+    return formatted
+
+def get_trace_page(handle, section='steps', start=0, stop=None):
+    """
+    Lấy các bước start ≤ i < stop (đánh số từ 0) của một phần vết đã lưu.
+    Mặc định lấy DEFAULT_TRACE_PAGE_SIZE bước, mỗi trang không quá MAX_TRACE_PAGE_SIZE bước.
+    """
+    stored = _traces.get(handle)
+    if stored is None:
+        raise KeyError(f"Vết '{handle}' không tồn tại hoặc đã hết hạn. Hãy chạy lại phép tính.")
+    if section not in stored:
+        raise ValueError(f"Vết không có phần '{section}'. Các phần hiện có: {', '.join(stored)}.")
+    items = stored[section]
+    total = len(items)
+    if start < 0:
+        raise ValueError("Tham số from phải là số nguyên không âm.")
+    if stop is None:
+        stop = start + DEFAULT_TRACE_PAGE_SIZE
+    if stop < start:
+        raise ValueError("Tham số to phải lớn hơn hoặc bằng from.")
+    if stop - start > MAX_TRACE_PAGE_SIZE:
+        raise ValueError(f"Mỗi trang chỉ lấy tối đa {MAX_TRACE_PAGE_SIZE} bước.")
+    stop = min(stop, total)
+    start = min(start, stop)
+    return {
+        "status": "success",
+        "handle": handle,
+        "section": section,
+        "from": start,
+        "to": stop,
+        "total": total,
+        "items": items[start:stop]
+    }
+
+def delete_trace(handle):
+    """Xóa vết đã lưu; trả về False nếu vết không tồn tại (hoặc đã hết hạn)."""
+    return _traces.pop(handle) is not None
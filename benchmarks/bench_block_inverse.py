@@ -0,0 +1,74 @@
+# benchmarks/bench_block_inverse.py
+"""
+So sánh thời gian tính A⁻¹ bằng lặp Jacobi / Gauss-Seidel giữa engine 'standard'
+(lặp trên toàn bộ n cột đến khi cả ma trận hội tụ) và engine 'block'
+(theo dõi hội tụ từng cột, cố định các cột đã hội tụ).
+
+Ma trận thử có hai khối: khối đầu chéo trội mạnh (các cột tương ứng hội tụ nhanh),
+khối sau chéo trội yếu; hai khối liên kết yếu với nhau.
+
+Chạy từ thư mục gốc của dự án:
+    python benchmarks/bench_block_inverse.py
+    python benchmarks/bench_block_inverse.py --sizes 500 1000 2000 --repeat 3
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.numerical_methods.linear_algebra.inverse.block_iterative import block_jacobi, block_gauss_seidel
+from backend.numerical_methods.linear_algebra.iterative.jacobi import jacobi
+from backend.numerical_methods.linear_algebra.iterative.gauss_seidel import gauss_seidel
+
+
+def make_matrix(n, rng, fast_fraction):
+    A = rng.random((n, n)) / n
+    k = int(n * fast_fraction)
+    A[:k, k:] *= 1e-3
+    A[k:, :k] *= 1e-3
+    row_sums = np.abs(A).sum(axis=1)
+    dominance = np.where(np.arange(n) < k, 50.0, 1.05)
+    A[np.diag_indices(n)] = dominance * row_sums
+    return A
+
+
+def best_time(func, repeat):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark nghịch đảo lặp theo khối.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[200, 500, 1000])
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--tol', type=float, default=1e-8)
+    parser.add_argument('--max-iter', type=int, default=1000)
+    parser.add_argument('--fast-fraction', type=float, default=0.8,
+                        help="Tỉ lệ số cột thuộc khối hội tụ nhanh.")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    methods = (("Jacobi", jacobi, block_jacobi), ("Gauss-Seidel", gauss_seidel, block_gauss_seidel))
+    print(f"{'n':>6} | {'Phương pháp':>12} | {'standard (s)':>12} | {'block (s)':>10} | {'x':>7} | {'lặp':>5} | {'cột-lặp TB':>10}")
+    print('-' * 84)
+    for n in args.sizes:
+        A = make_matrix(n, rng, args.fast_fraction)
+        I = np.eye(n)
+        X0 = np.zeros((n, n))
+        for name, standard, block in methods:
+            t_std, _ = best_time(lambda: standard(A, I, X0, args.tol, args.max_iter, trace='none'), args.repeat)
+            t_blk, res = best_time(lambda: block(A, I, X0, args.tol, args.max_iter, trace='none'), args.repeat)
+            mean_iters = float(np.mean(res['column_iterations']))
+            print(f"{n:>6} | {name:>12} | {t_std:>12.4f} | {t_blk:>10.4f} | {t_std / t_blk:>6.1f}x | {res['iterations']:>5} | {mean_iters:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
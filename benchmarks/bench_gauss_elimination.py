@@ -0,0 +1,134 @@
+# benchmarks/bench_gauss_elimination.py
+"""
+So sánh thời gian chạy của khử Gauss / Gauss-Jordan (cập nhật hạng 1 tại chỗ)
+với cài đặt cũ (khử từng hàng bằng vòng lặp Python và zero_small toàn bộ ma trận sau mỗi pivot).
+
+Chạy từ thư mục gốc của dự án:
+    python benchmarks/bench_gauss_elimination.py
+    python benchmarks/bench_gauss_elimination.py --sizes 100 500 1000 --repeat 3
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.utils.helpers import zero_small
+from backend.numerical_methods.linear_algebra.direct.gauss_elimination import gauss_elimination
+from backend.numerical_methods.linear_algebra.direct.gauss_jordan import gauss_jordan
+
+
+def reference_gauss_forward(A, b, tol):
+    """
+    Khử xuôi theo cài đặt cũ: từng hàng một, làm tròn toàn bộ ma trận sau mỗi pivot.
+    """
+    augmented_matrix = np.hstack([A.astype(float), b.reshape(-1, 1).astype(float)])
+    num_rows = augmented_matrix.shape[0]
+    num_vars = A.shape[1]
+    pivot_row, col_index = 0, 0
+    while pivot_row < num_rows and col_index < num_vars:
+        if abs(augmented_matrix[pivot_row, col_index]) < tol:
+            for k in range(pivot_row + 1, num_rows):
+                if abs(augmented_matrix[k, col_index]) > tol:
+                    augmented_matrix[[pivot_row, k]] = augmented_matrix[[k, pivot_row]]
+                    break
+        pivot_element = augmented_matrix[pivot_row, col_index]
+        if abs(pivot_element) < tol:
+            col_index += 1
+            continue
+        for i in range(pivot_row + 1, num_rows):
+            factor = augmented_matrix[i, col_index] / pivot_element
+            if abs(factor) > tol:
+                augmented_matrix[i, :] -= factor * augmented_matrix[pivot_row, :]
+        augmented_matrix = zero_small(augmented_matrix, tol=tol)
+        pivot_row += 1
+        col_index += 1
+    return augmented_matrix
+
+
+def reference_gauss_jordan(A, b, tol):
+    """
+    Gauss-Jordan theo cài đặt cũ: tìm pivot bằng vòng lặp lồng nhau, khử từng hàng.
+    """
+    augmented_matrix = np.hstack([A.astype(float), b.reshape(-1, 1).astype(float)])
+    num_rows = augmented_matrix.shape[0]
+    num_vars = A.shape[1]
+    pivoted_rows, pivoted_cols = [], []
+    for _ in range(min(num_rows, num_vars)):
+        pivot_r, pivot_c = -1, -1
+        found_one = False
+        for r in range(num_rows):
+            if r in pivoted_rows: continue
+            for c in range(num_vars):
+                if c in pivoted_cols: continue
+                if float(augmented_matrix[r, c]) in (1.0, -1.0):
+                    pivot_r, pivot_c = r, c
+                    found_one = True
+                    break
+            if found_one: break
+        if not found_one:
+            max_val = tol
+            for r in range(num_rows):
+                if r in pivoted_rows: continue
+                for c in range(num_vars):
+                    if c in pivoted_cols: continue
+                    if abs(augmented_matrix[r, c]) > max_val:
+                        max_val = abs(augmented_matrix[r, c])
+                        pivot_r, pivot_c = r, c
+        if pivot_r == -1:
+            break
+        pivoted_rows.append(pivot_r)
+        pivoted_cols.append(pivot_c)
+        augmented_matrix[pivot_r, :] /= augmented_matrix[pivot_r, pivot_c]
+        for i in range(num_rows):
+            if i != pivot_r:
+                factor = augmented_matrix[i, pivot_c]
+                if abs(factor) > tol:
+                    augmented_matrix[i, :] -= factor * augmented_matrix[pivot_r, :]
+        augmented_matrix = zero_small(augmented_matrix, tol=tol)
+    return augmented_matrix
+
+
+def best_time(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark khử Gauss / Gauss-Jordan.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 200, 500, 1000, 2000])
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--tol', type=float, default=1e-15)
+    parser.add_argument('--max-gj-reference', type=int, default=200,
+                        help="Kích thước lớn nhất chạy Gauss-Jordan cũ (tìm pivot O(n^2) bằng Python mỗi bước).")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'n':>6} | {'Gauss cũ (s)':>13} | {'Gauss mới (s)':>13} | {'x':>7} | {'GJ cũ (s)':>11} | {'GJ mới (s)':>11} | {'x':>7}")
+    print('-' * 88)
+    for n in args.sizes:
+        A = rng.standard_normal((n, n)) + n * np.eye(n)
+        b = rng.standard_normal(n)
+
+        t_old = best_time(lambda: reference_gauss_forward(A, b, args.tol), args.repeat)
+        t_new = best_time(lambda: gauss_elimination(A, b, args.tol, trace='none'), args.repeat)
+
+        t_new_gj = best_time(lambda: gauss_jordan(A, b, args.tol, trace='none'), args.repeat)
+        if n <= args.max_gj_reference:
+            t_old_gj = best_time(lambda: reference_gauss_jordan(A, b, args.tol), args.repeat)
+            gj_cols = f"{t_old_gj:>11.4f} | {t_new_gj:>11.4f} | {t_old_gj / t_new_gj:>6.1f}x"
+        else:
+            gj_cols = f"{'-':>11} | {t_new_gj:>11.4f} | {'-':>7}"
+
+        print(f"{n:>6} | {t_old:>13.4f} | {t_new:>13.4f} | {t_old / t_new:>6.1f}x | {gj_cols}")
+
+
+if __name__ == '__main__':
+    main()
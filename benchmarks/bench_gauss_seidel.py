@@ -0,0 +1,102 @@
+# benchmarks/bench_gauss_seidel.py
+"""
+So sánh chi phí của phương pháp lặp Gauss-Seidel trước và sau khi vector hóa:
+- tính hệ số q, s: vòng lặp Python theo từng hàng/cột (cũ) và tổng có mặt nạ (mới);
+- một bước lặp: cập nhật từng phần tử bằng vòng lặp Python (cũ) và giải hệ tam giác
+  (D + L)x_k+1 = b - Ux_k bằng solve_triangular (mới, ma trận đặc) / spsolve_triangular (ma trận thưa 5 đường chéo).
+
+Chạy từ thư mục gốc của dự án:
+    python benchmarks/bench_gauss_seidel.py
+    python benchmarks/bench_gauss_seidel.py --sizes 500 2000 --iterations 20
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import scipy.linalg
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.numerical_methods.linear_algebra.iterative.gauss_seidel import _coefficients, _strict_upper_product
+from backend.utils.helpers import abs_row_sums, abs_col_sums
+
+
+def reference_coefficients(A):
+    """
+    Hệ số q (ma trận chéo trội hàng) theo cài đặt cũ: vòng lặp Python qua từng hàng.
+    """
+    n = A.shape[0]
+    q_num = np.zeros(n)
+    q_den = np.zeros(n)
+    for i in range(n):
+        q_num[i] = np.sum(np.abs(A[i, :i]))
+        q_den[i] = np.abs(A[i, i]) - np.sum(np.abs(A[i, i+1:]))
+    q_den[np.isclose(q_den, 0)] = 1e-15
+    return np.max(q_num / q_den)
+
+
+def reference_sweep(A, b, x_k):
+    """
+    Một bước lặp Gauss-Seidel theo cài đặt cũ: cập nhật lần lượt từng ẩn.
+    """
+    n = A.shape[0]
+    x_prev = x_k.copy()
+    for j in range(n):
+        sum1 = np.dot(A[j, :j], x_k[:j, :])
+        sum2 = np.dot(A[j, j+1:], x_prev[j+1:, :])
+        x_k[j, :] = (b[j, :] - sum1 - sum2) / A[j, j]
+    return x_k
+
+
+def dense_sweep(A, b, x_k):
+    return scipy.linalg.solve_triangular(A, b - _strict_upper_product(A, x_k), lower=True, check_finite=False)
+
+
+def per_call(func, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark một bước lặp Gauss-Seidel.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 500, 1000, 2000, 5000])
+    parser.add_argument('--iterations', type=int, default=5, help="Số bước lặp để lấy thời gian trung bình.")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'n':>6} | {'q,s cũ (ms)':>12} | {'q,s mới (ms)':>12} | {'bước cũ (ms)':>13} | {'bước mới (ms)':>14} | {'x':>7} | {'thưa (ms)':>10}")
+    print('-' * 94)
+    for n in args.sizes:
+        A = rng.standard_normal((n, n))
+        A += np.diag(np.abs(A).sum(axis=1) + 1.0)
+        b = rng.standard_normal((n, 1))
+        x = np.zeros((n, 1))
+
+        diag_abs = np.abs(np.diag(A))
+        row_off, col_off = abs_row_sums(A) - diag_abs, abs_col_sums(A) - diag_abs
+        t_coef_old = per_call(lambda: reference_coefficients(A), 1)
+        t_coef_new = per_call(lambda: _coefficients(A, diag_abs, row_off, col_off, True), 1)
+
+        assert np.allclose(reference_sweep(A, b, x.copy()), dense_sweep(A, b, x))
+        t_old = per_call(lambda: reference_sweep(A, b, x.copy()), args.iterations)
+        t_new = per_call(lambda: dense_sweep(A, b, x), args.iterations)
+
+        # Ma trận thưa 5 đường chéo cùng kích thước (tương tự lưới sai phân 2 chiều)
+        m = max(int(np.sqrt(n)), 1)
+        offsets = [0] + [k for k in (-1, 1, -m, m) if abs(k) < n]
+        S = sp.diags([4.5 * np.ones(n)] + [-np.ones(n - abs(k)) for k in offsets[1:]], offsets, format='csr')
+        lower, upper_strict = sp.tril(S, format='csr'), sp.triu(S, k=1, format='csr')
+        t_sparse = per_call(lambda: spla.spsolve_triangular(lower, b - upper_strict @ x, lower=True), args.iterations)
+
+        print(f"{n:>6} | {t_coef_old * 1e3:>12.2f} | {t_coef_new * 1e3:>12.2f} | {t_old * 1e3:>13.2f} | "
+              f"{t_new * 1e3:>14.2f} | {t_old / t_new:>6.1f}x | {t_sparse * 1e3:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+# benchmarks/bench_matrix_parser.py
+"""
+So sánh thời gian phân tích ma trận dạng văn bản của parse_matrix_from_string
+(chuyển đổi cả chuỗi trong một lần bằng np.loadtxt) với cài đặt cũ (vòng lặp float() từng token, từng hàng).
+Đo với hai kiểu dữ liệu: số thực đầy đủ 17 chữ số (repr) và số thập phân ngắn (như khi nhập tay).
+
+Chạy từ thư mục gốc của dự án:
+    python benchmarks/bench_matrix_parser.py
+    python benchmarks/bench_matrix_parser.py --counts 10000 1000000 --cols 100 --repeat 3
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.utils.helpers import parse_matrix_from_string
+
+
+def reference_parse(matrix_str):
+    """
+    Phân tích theo cài đặt cũ: tách từng hàng, float() từng token, kiểm tra số cột từng hàng.
+    """
+    rows = matrix_str.strip().split('\n')
+    matrix_list = []
+    num_cols = -1
+    for i, row_str in enumerate(rows):
+        row_list = [float(num) for num in row_str.split()]
+        if i == 0:
+            num_cols = len(row_list)
+        elif len(row_list) != num_cols:
+            raise ValueError(f"Lỗi định dạng ở hàng {i + 1}.")
+        if row_list:
+            matrix_list.append(row_list)
+    return np.array(matrix_list)
+
+
+def best_time(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark phân tích ma trận dạng văn bản.")
+    parser.add_argument('--counts', type=int, nargs='+', default=[10**4, 10**5, 10**6, 10**7],
+                        help="Tổng số phần tử của ma trận.")
+    parser.add_argument('--cols', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--formats', nargs='+', choices=['full', 'short'], default=['full', 'short'])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'dạng số':>8} | {'số phần tử':>12} | {'kích thước':>12} | {'MB':>7} | {'cũ (s)':>9} | {'mới (s)':>9} | {'x':>7}")
+    print('-' * 83)
+    for number_format in args.formats:
+        for count in args.counts:
+            cols = min(args.cols, count)
+            rows = max(count // cols, 1)
+            values = rng.standard_normal((rows, cols))
+            if number_format == 'short':
+                values = np.round(values, 3)
+            text = '\n'.join(' '.join(repr(v) for v in row) for row in values.tolist())
+
+            t_old = best_time(lambda: reference_parse(text), args.repeat)
+            t_new = best_time(lambda: parse_matrix_from_string(text), args.repeat)
+            assert np.array_equal(parse_matrix_from_string(text), values)
+
+            print(f"{number_format:>8} | {rows * cols:>12} | {f'{rows}x{cols}':>12} | {len(text) / 2**20:>7.1f} | "
+                  f"{t_old:>9.4f} | {t_new:>9.4f} | {t_old / t_new:>6.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+# benchmarks/bench_newton_inverse.py
+"""
+So sánh các chế độ của newton_inverse: 'classic' (det(A), chuẩn 2 bằng SVD), 'hyperpower' bậc 2/3/4
+và Newton-Schulz co giãn ('scaled'): số lần lặp, thời gian và số flops ước lượng.
+
+Ma trận thử A = U·diag(σ)·Vᵀ với số điều kiện cho trước, σ phân bố đều theo thang log ('log')
+hoặc co cụm thành hai nhóm σ = 1 và σ = 1/cond ('cluster', nhóm lớn chiếm tỉ lệ --cluster-frac);
+det(A) được đưa về khoảng 1 để chế độ 'classic' không từ chối ma trận.
+
+Chạy từ thư mục gốc của dự án:
+    python benchmarks/bench_newton_inverse.py
+    python benchmarks/bench_newton_inverse.py --sizes 200 500 --cond 1e2 1e4 --spectrum cluster
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.numerical_methods.linear_algebra.inverse.newton_inverse import newton_inverse
+
+MODES = (
+    ("classic", dict(mode='classic')),
+    ("hyperpower-2", dict(mode='hyperpower', order=2)),
+    ("hyperpower-3", dict(mode='hyperpower', order=3)),
+    ("hyperpower-4", dict(mode='hyperpower', order=4)),
+    ("scaled", dict(mode='scaled')),
+)
+
+
+SPECTRA = ('log', 'cluster')
+
+
+def make_matrix(n, cond, rng, spectrum='log', cluster_frac=0.1):
+    U, _ = np.linalg.qr(rng.standard_normal((n, n)))
+    V, _ = np.linalg.qr(rng.standard_normal((n, n)))
+    if spectrum == 'cluster':
+        sigma = np.where(np.arange(n) < max(1, int(cluster_frac * n)), 1.0, 1.0 / cond)
+    else:
+        sigma = np.logspace(0, -np.log10(cond), n)
+    sigma /= np.exp(np.mean(np.log(sigma)))  # |det(A)| = 1
+    return U @ np.diag(sigma) @ V.T
+
+
+def best_time(func, repeat):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark các chế độ lặp Newton tìm ma trận nghịch đảo.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[200, 500, 1000])
+    parser.add_argument('--cond', type=float, nargs='+', default=[1e2, 1e4])
+    parser.add_argument('--spectrum', choices=SPECTRA, nargs='+', default=list(SPECTRA))
+    parser.add_argument('--cluster-frac', type=float, default=0.1)
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--tol', type=float, default=1e-6)
+    parser.add_argument('--max-iter', type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'n':>6} | {'cond':>7} | {'Phổ':>7} | {'Chế độ':>13} | {'lặp':>4} | {'Thời gian (s)':>13} | {'GFlop':>8} | {'Sai số max':>10}")
+    print('-' * 90)
+    for n in args.sizes:
+        for cond in args.cond:
+            for spectrum in args.spectrum:
+                A = make_matrix(n, cond, rng, spectrum, args.cluster_frac)
+                A_inv = np.linalg.inv(A)
+                for name, kwargs in MODES:
+                    try:
+                        t, res = best_time(lambda: newton_inverse(A, tol=args.tol, max_iter=args.max_iter, trace='none', **kwargs), args.repeat)
+                    except ValueError as e:
+                        print(f"{n:>6} | {cond:>7.0e} | {spectrum:>7} | {name:>13} | lỗi: {e}")
+                        continue
+                    err = np.max(np.abs(res['inverse'] - A_inv))
+                    print(f"{n:>6} | {cond:>7.0e} | {spectrum:>7} | {name:>13} | {res['iterations']:>4} | {t:>13.4f} | {res['flops']['total'] / 1e9:>8.2f} | {err:>10.1e}")
+
+
+if __name__ == '__main__':
+    main()
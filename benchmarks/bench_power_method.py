@@ -0,0 +1,75 @@
+# benchmarks/bench_power_method.py
+"""
+So sánh các kiểu tăng tốc của power_method_single: lặp lũy thừa thường ('none'), lặp thương Rayleigh,
+nghịch đảo dịch chuyển (phân rã LU của A - σI được lưu trong bộ nhớ đệm) và ngoại suy Aitken / Wynn
+của dãy λ: số lần lặp, thời gian và sai số của trị riêng trội.
+
+Ma trận thử đối xứng A = Q·diag(λ)·Qᵀ với λ₁ = 1 và tỉ số λ₂/λ₁ cho trước (các trị riêng còn lại
+phân bố đều trong [-λ₂, λ₂]); lặp lũy thừa thường hội tụ với tốc độ |λ₂/λ₁|.
+Nghịch đảo dịch chuyển dùng σ = SHIFT_FACTOR·λ₁ (giả sử đã có ước lượng thô của λ₁).
+Với --repeat > 1 các lần chạy sau của 'shift_invert' dùng lại phân rã LU đã lưu.
+
+Chạy từ thư mục gốc của dự án:
+    python benchmarks/bench_power_method.py
+    python benchmarks/bench_power_method.py --sizes 200 1000 --ratio 0.9 0.999
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.numerical_methods.linear_algebra.eigen.power_method import power_method_single
+
+SHIFT_FACTOR = 1.05
+
+MODES = ('none', 'rayleigh', 'shift_invert', 'aitken', 'wynn')
+
+
+def make_matrix(n, ratio, rng):
+    Q, _ = np.linalg.qr(rng.standard_normal((n, n)))
+    lam = np.concatenate(([1.0, ratio], rng.uniform(-ratio, ratio, n - 2)))
+    return (Q * lam) @ Q.T
+
+
+def best_time(func, repeat):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark các kiểu tăng tốc của phương pháp lũy thừa.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[200, 500, 1000])
+    parser.add_argument('--ratio', type=float, nargs='+', default=[0.9, 0.99])
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--tol', type=float, default=1e-10)
+    parser.add_argument('--max-iter', type=int, default=5000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'n':>6} | {'λ₂/λ₁':>6} | {'Kiểu tăng tốc':>13} | {'lặp':>5} | {'Thời gian (s)':>13} | {'Sai số λ':>9}")
+    print('-' * 70)
+    for n in args.sizes:
+        for ratio in args.ratio:
+            A = make_matrix(n, ratio, rng)
+            for mode in MODES:
+                shift = SHIFT_FACTOR if mode == 'shift_invert' else None
+                try:
+                    t, res = best_time(lambda: power_method_single(A, tol=args.tol, max_iter=args.max_iter, trace='none',
+                                                                   acceleration=mode, shift=shift), args.repeat)
+                except ValueError as e:
+                    print(f"{n:>6} | {ratio:>6} | {mode:>13} | lỗi: {e}")
+                    continue
+                err = abs(res['eigenvalue'] - 1.0)
+                print(f"{n:>6} | {ratio:>6} | {mode:>13} | {res['iterations']:>5} | {t:>13.4f} | {err:>9.1e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+# benchmarks/bench_randomized_svd.py
+"""
+So sánh cách lấy k thành phần kỳ dị lớn nhất: SVD đầy đủ (svd_numpy), lũy thừa + xuống thang trên AᵀA
+(svd_power_deflation) và SVD ngẫu nhiên Halko–Martinsson–Tropp (svd_randomized):
+thời gian, bộ nhớ đỉnh (tracemalloc, gồm các mảng NumPy) và sai số tương đối của σ₁..σ_k.
+
+Ma trận thử m×n có các giá trị kỳ dị suy giảm σᵢ = i^(-decay) (A = U·diag(σ)·Vᵀ).
+
+Chạy từ thư mục gốc của dự án:
+    python benchmarks/bench_randomized_svd.py
+    python benchmarks/bench_randomized_svd.py --shape 2000 500 --k 5 20 --skip-power
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.numerical_methods.linear_algebra.eigen.svd import svd_numpy, svd_power_deflation, svd_randomized
+
+
+def make_matrix(m, n, decay, rng):
+    U, _ = np.linalg.qr(rng.standard_normal((m, n)))
+    V, _ = np.linalg.qr(rng.standard_normal((n, n)))
+    sigma = np.arange(1, n + 1, dtype=float) ** (-decay)
+    return (U * sigma) @ V.T, sigma
+
+
+def best_time(func, repeat):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def peak_memory(func):
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SVD rút gọn: đầy đủ, lũy thừa + xuống thang, ngẫu nhiên.")
+    parser.add_argument('--shape', type=int, nargs=2, default=[10000, 1000], metavar=('M', 'N'))
+    parser.add_argument('--k', type=int, nargs='+', default=[5, 20, 50])
+    parser.add_argument('--decay', type=float, default=1.0)
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--skip-power', action='store_true', help="Bỏ qua svd_power_deflation (chậm với n lớn).")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    m, n = args.shape
+    A, sigma = make_matrix(m, n, args.decay, rng)
+
+    methods = [("numpy", lambda k: svd_numpy(A))]
+    if not args.skip_power:
+        methods.append(("power", lambda k: svd_power_deflation(A, num_singular=k, trace='none')))
+    methods.append(("randomized", lambda k: svd_randomized(A, num_singular=k, trace='none')))
+
+    print(f"Ma trận {m}×{n}, σᵢ = i^(-{args.decay:g})")
+    print(f"{'k':>5} | {'Cách tính':>10} | {'Thời gian (s)':>13} | {'Bộ nhớ (MB)':>11} | {'Sai số σ':>9}")
+    print('-' * 62)
+    for k in args.k:
+        for name, run in methods:
+            t, res = best_time(lambda: run(k), args.repeat)
+            mem = peak_memory(lambda: run(k)) / 2 ** 20
+            s = res['Sigma_diag'][:k]
+            err = np.max(np.abs(s - sigma[:len(s)]) / sigma[:len(s)])
+            print(f"{k:>5} | {name:>10} | {t:>13.4f} | {mem:>11.1f} | {err:>9.1e}")
+
+
+if __name__ == '__main__':
+    main()
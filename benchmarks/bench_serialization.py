@@ -0,0 +1,89 @@
+# benchmarks/bench_serialization.py
+"""
+So sánh kích thước và thời gian phản hồi của route nghịch đảo Gauss-Jordan
+giữa hai cách mã hóa mảng - danh sách lồng nhau ('list') và bộ đệm base64 ('base64') -
+và giữa hai bộ mã hóa JSON (orjson nếu đã cài, json chuẩn).
+Mỗi phép đo là một request thật qua app.test_client() (ma trận gửi dạng .npy), nên gồm cả
+thời gian tính; cột "Tính (s)" cho biết riêng thời gian gauss_jordan_inverse để so sánh.
+
+Chạy từ thư mục gốc của dự án:
+    python benchmarks/bench_serialization.py
+    python benchmarks/bench_serialization.py --sizes 200 500 --trace full
+"""
+import argparse
+import io
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import app
+from backend.utils import serialization
+from backend.numerical_methods.linear_algebra.inverse.gauss_jordan_inverse import gauss_jordan_inverse
+
+URL = '/api/linear-algebra/inverse/gauss-jordan'
+ACCEPT = {'list': 'application/json', 'base64': serialization.B64_JSON_MIMETYPE}
+
+
+def npy_bytes(A):
+    buf = io.BytesIO()
+    np.save(buf, A)
+    return buf.getvalue()
+
+
+def post(client, body, trace, encoding, use_orjson):
+    saved = serialization.orjson
+    if not use_orjson:
+        serialization.orjson = None
+    try:
+        response = client.post(URL, query_string={'trace': trace}, data=body,
+                               content_type='application/x-npy', headers={'Accept': ACCEPT[encoding]})
+    finally:
+        serialization.orjson = saved
+    if response.status_code != 200:
+        raise RuntimeError(response.get_data(as_text=True)[:200])
+    return response
+
+
+def best_time(func, repeat):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark mã hóa JSON phản hồi ma trận qua test client.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 300, 1000])
+    parser.add_argument('--trace', choices=['none', 'summary', 'full'], default='summary')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    backends = [('json', False)]
+    if serialization.orjson is not None:
+        backends.insert(0, ('orjson', True))
+    else:
+        print("orjson: không có, chỉ đo json chuẩn")
+
+    client = app.test_client()
+    rng = np.random.default_rng(0)
+    print(f"{'n':>6} | {'Mã hóa':>7} | {'JSON':>7} | {'Kích thước (MB)':>15} | {'Request (s)':>11} | {'Tính (s)':>9}")
+    print('-' * 72)
+    for n in args.sizes:
+        A = rng.standard_normal((n, n)) + n * np.eye(n)
+        body = npy_bytes(A)
+        t_compute, _ = best_time(lambda: gauss_jordan_inverse(A, 1e-15, trace=args.trace), args.repeat)
+        for encoding in serialization.ARRAY_ENCODINGS:
+            for name, use_orjson in backends:
+                t, response = best_time(lambda: post(client, body, args.trace, encoding, use_orjson), args.repeat)
+                size = len(response.get_data()) / 2 ** 20
+                print(f"{n:>6} | {encoding:>7} | {name:>7} | {size:>15.2f} | {t:>11.4f} | {t_compute:>9.4f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -117,8 +117,16 @@ export function renderMatrixSolution(container, data) {
             html += `<div class="mb-4 p-3 bg-gray-50 rounded-lg shadow-sm">`;
             html += `<p class="text-sm text-gray-800 mb-2">${step.message}</p>`;
             html += `<div class="flex flex-wrap items-center justify-center gap-4">`;
-            html += `<div class="matrix-display">${formatMatrix(step.L, 'L')}</div>`;
-            html += `<div class="matrix-display">${formatMatrix(step.U, 'U')}</div>`;
+            if (step.L) {
+                html += `<div class="matrix-display">${formatMatrix(step.L, 'L')}</div>`;
+                html += `<div class="matrix-display">${formatMatrix(step.U, 'U')}</div>`;
+            } else if (step.u_row) {
+                // Ma trận lớn: chỉ hiển thị hàng U và cột L mới tính ở bước này
+                html += `<div class="matrix-display">${formatMatrix([step.u_row], `U<sub>${step.row + 1},${step.row + 1}:</sub>`)}</div>`;
+                if (step.l_col.length > 0) {
+                    html += `<div class="matrix-display">${formatMatrix(step.l_col.map(v => [v]), `L<sub>${step.row + 2}:,${step.row + 1}</sub>`)}</div>`;
+                }
+            }
             html += `</div></div>`;
         });
     } else if ((data.method === "Khử Gauss" || data.method === "Gauss-Jordan") && data.steps && data.steps.length > 0) {
@@ -571,14 +579,14 @@ export function renderEigenSolution(container, data) {
                     </div>
                 </details>`;
             });
-        } else if (data.method.includes("Power Method (GTR Trội)")) { // Xử lý riêng cho GTR Trội
+        } else if (data.method.startsWith("Power Method") && data.steps && !data.method.includes("Deflation")) { // Xử lý riêng cho một GTR (kể cả các kiểu tăng tốc)
             html += `<div class="mb-6 p-4 bg-gray-50 rounded-lg shadow-sm border">
                 <h4 class="text-lg font-semibold text-blue-700 mb-3">Bảng quá trình lặp</h4>
                 <div class="overflow-x-auto mt-2"><table class="w-full text-sm">
                     <thead class="bg-gray-200"><tr><th class="p-2">k</th><th class="p-2">Vector xₖ</th><th class="p-2">Vector Axₖ</th><th class="p-2">λₖ</th></tr></thead>
                     <tbody>`;
             data.steps.forEach(detail => {
-                html += `<tr class="border-b"><td class="p-2">${detail.k}</td><td class="p-2 font-mono">${formatMatrix(detail.x_k)}</td><td class="p-2 font-mono">${formatMatrix(detail.Ax_k)}</td><td class="p-2 font-mono">${detail.lambda_k.toFixed(6)}</td></tr>`;
+                html += `<tr class="border-b"><td class="p-2">${detail.k}</td><td class="p-2 font-mono">${formatMatrix(detail.x_k)}</td><td class="p-2 font-mono">${formatMatrix(detail.Ax_k)}</td><td class="p-2 font-mono">${detail.lambda_k == null ? '—' : detail.lambda_k.toFixed(6)}</td></tr>`;
             });
             html += `</tbody></table></div></div>`;
         } else if (data.method.includes("Power Method & Deflation")) { // Xử lý cho Xuống thang